@@ -46,5 +46,10 @@ setup(
         'vaderSentiment>=3.3.2',
         'pyspellchecker>=0.7.0',
         'language-tool-python>=2.7.0'
-    ]
+    ],
+    extras_require={
+        'archive': ['zstandard>=0.15'],
+        'numpy': ['numpy>=1.17'],
+        'parquet': ['pyarrow>=8.0']
+    }
 )
@@ -1,26 +1,141 @@
 import argparse
-from .input import ProcessInputYaml
-from .gen_logo import Logo
-from .twitter_shill_hunter import TwitterShillHunter
+import sys
+from .plugin_registry import PROCESSOR_GROUP, get_registry
+from .sinks import OUTPUT_FORMATS
+from .profiler import PROFILE_MODES
+
+# The YAML parser, the X client and the plugins are
+# imported on first use, so a run only pays for what
+# it needs
 
 def main():
     """
     Function to kick off the show.
     """
 
-    logo = Logo()
-    logo.generate_logo()
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "yaml",
+        nargs="?",
         help=" a YAML configuration file")
     parser.add_argument(
         "plugins",
+        nargs="?",
         help="list of plugins to be used in output")
+    parser.add_argument(
+        "--list-plugins",
+        action="store_true",
+        help="list the installed plugins and exit")
+    parser.add_argument(
+        "--target-file",
+        help="file listing one target per line to screen as a batch")
+    parser.add_argument(
+        "--archive",
+        action="append",
+        help="read posts from a local JSON, JSONL or tweets.js archive "
+             "instead of the X API, may be repeated")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="ignore the timeline cache and fetch every post again")
+    parser.add_argument(
+        "--output",
+        choices=OUTPUT_FORMATS,
+        help="how results are written: a per target summary (the default), "
+             "JSON lines, CSV, or nothing")
+    parser.add_argument(
+        "--output-path",
+        help="file to write results to instead of standard output")
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="print the time spent in each stage and plugin, and the "
+             "run's counters, when the run ends")
+    parser.add_argument(
+        "--metrics-json",
+        help="file to write the run's metrics to as JSON")
+    parser.add_argument(
+        "--metrics-prometheus",
+        help="file to write the run's metrics to for the node exporter "
+             "textfile collector")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="profile each plugin's process_data and write its profile "
+             "and collapsed stacks to --profile-dir")
+    parser.add_argument(
+        "--profile-mode",
+        choices=PROFILE_MODES,
+        help="cprofile records every call (the default), sample records "
+             "stacks at an interval with little overhead")
+    parser.add_argument(
+        "--profile-dir",
+        help="directory to write profiles to (default: profiles)")
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        help="seconds between samples in sample mode (default: 0.005)")
+    parser.add_argument(
+        "--quiet", "--no-banner",
+        dest="quiet",
+        action="store_true",
+        help="do not print the banner")
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="run with import timing and report the slowest modules to load")
 
     args = parser.parse_args()
-    plugins = plugin_processor('twitter_shill_hunter.processors', args.plugins)
-    process_input(args.yaml, plugins)
+    if args.startup_profile:
+        from .startup_profile import StartupProfile
+        child_args = [a for a in sys.argv[1:] if a != '--startup-profile']
+        sys.exit(StartupProfile().run(child_args))
+    if args.list_plugins:
+        list_plugins(PROCESSOR_GROUP)
+        return
+    if not args.yaml or not args.plugins:
+        parser.error("the yaml and plugins arguments are required")
+    if not args.quiet:
+        from .gen_logo import Logo
+        Logo().generate_logo()
+    plugins = plugin_processor(PROCESSOR_GROUP, args.plugins)
+    process_input(args.yaml, plugins, target_file=args.target_file,
+                  archives=args.archive, refresh=args.refresh,
+                  output=args.output, output_path=args.output_path,
+                  metrics=metrics_options(args), profile=profile_options(args))
+
+
+def metrics_options(args):
+    """
+    Return the metrics options
+    given on the command line
+    """
+    options = {}
+    if args.metrics:
+        options['table'] = True
+    if args.metrics_json:
+        options['json'] = args.metrics_json
+    if args.metrics_prometheus:
+        options['prometheus'] = args.metrics_prometheus
+    return options
+
+
+def profile_options(args):
+    """
+    Return the profile options given
+    on the command line, None if the
+    run is not profiled
+    """
+    if not args.profile:
+        return None
+    options = {}
+    if args.profile_mode:
+        options['mode'] = args.profile_mode
+    if args.profile_dir:
+        options['path'] = args.profile_dir
+    if args.profile_interval:
+        options['interval'] = args.profile_interval
+    return options
 
 
 def plugin_processor(cat, plugins):
@@ -33,14 +148,53 @@ def plugin_processor(cat, plugins):
     return plugins_to_use
 
 
-def process_input(yaml_file, plugins):
+def list_plugins(cat):
+    """
+    Print the installed plugins
+    without importing them
+    """
+    installed = get_registry(cat).describe()
+    if not installed:
+        print("No plugins installed")
+    for name, target in installed:
+        print("%s = %s" % (name, target))
+
+
+def process_input(yaml_file, plugins, target_file=None, archives=None,
+                  refresh=False, output=None, output_path=None, metrics=None,
+                  profile=None):
     """
     Create a new YAML parsing object
     and dump the content out as a dict
     """
+    from .input import ProcessInputYaml
+    from .twitter_shill_hunter import TwitterShillHunter
+
     print("Processing input YAML")
     yaml_to_dict = ProcessInputYaml()
     yaml_to_dict = yaml_to_dict.yaml_processor(yaml_file)
+    if target_file:
+        yaml_to_dict['config']['target_file'] = target_file
+    if archives:
+        yaml_to_dict['config']['archive'] = archives
+    if refresh:
+        yaml_to_dict['config']['refresh'] = True
+    if output or output_path:
+        output_options = dict(yaml_to_dict['config'].get('output') or {})
+        if output:
+            output_options['format'] = output
+        if output_path:
+            output_options['path'] = output_path
+        yaml_to_dict['config']['output'] = output_options
+    if metrics:
+        metrics_config = dict(yaml_to_dict['config'].get('metrics') or {})
+        metrics_config.update(metrics)
+        yaml_to_dict['config']['metrics'] = metrics_config
+    if profile is not None:
+        profile_config = yaml_to_dict['config'].get('profile')
+        profile_config = dict(profile_config) if isinstance(profile_config, dict) else {}
+        profile_config.update(profile)
+        yaml_to_dict['config']['profile'] = profile_config
     shill_hunter = TwitterShillHunter(yaml_to_dict, plugins)
 
 
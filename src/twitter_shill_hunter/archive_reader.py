@@ -0,0 +1,163 @@
+import gzip
+import io
+import json
+import os
+
+
+class ArchiveReader():
+    """
+    Class to stream posts from local
+    archives instead of the X API.
+    Reads JSON arrays, JSONL files
+    (optionally gzip or zstd compressed)
+    and the X data export tweets.js.
+    """
+
+    chunk_size = 1 << 16
+
+    def __init__(self, path, page_size=200):
+        """
+        Store the archive path
+        and page size
+        """
+        self.path = path
+        self.page_size = page_size
+        self.posts_read = 0
+
+    def open_file(self):
+        """
+        Open the archive as text,
+        decompressing if needed
+        """
+        if self.path.endswith('.gz'):
+            return gzip.open(self.path, 'rt', encoding='utf-8')
+
+        if self.path.endswith('.zst'):
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError(
+                    "Reading .zst archives requires the 'zstandard' package, "
+                    "install it with: pip install zstandard")
+            raw = open(self.path, 'rb')
+            reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+            return io.TextIOWrapper(reader, encoding='utf-8')
+
+        return open(self.path, 'r', encoding='utf-8')
+
+    def archive_format(self):
+        """
+        Work out the archive layout
+        from the file name
+        """
+        name = os.path.basename(self.path)
+        for ext in ('.gz', '.zst'):
+            if name.endswith(ext):
+                name = name[:-len(ext)]
+
+        if name.endswith('.js'):
+            return 'tweets_js'
+        if name.endswith('.json'):
+            return 'json'
+        return 'jsonl'
+
+    def posts(self):
+        """
+        Generator yielding one raw
+        post dict at a time
+        """
+        archive_format = self.archive_format()
+        with self.open_file() as archive:
+            if archive_format == 'jsonl':
+                items = self.read_lines(archive)
+            else:
+                items = self.read_array(archive, archive_format == 'tweets_js')
+
+            for item in items:
+                # The X data export wraps each post in {"tweet": {...}}
+                if isinstance(item, dict) and isinstance(item.get('tweet'), dict):
+                    item = item['tweet']
+                self.posts_read += 1
+                yield item
+
+    def pages(self):
+        """
+        Generator yielding lists of at
+        most page_size posts
+        """
+        page = []
+        for post in self.posts():
+            page.append(post)
+            if len(page) >= self.page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def read_lines(self, archive):
+        """
+        Parse one JSON document per
+        line, skipping blank lines
+        """
+        for line in archive:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+    def read_array(self, archive, assignment=False):
+        """
+        Incrementally parse the elements of
+        a top level JSON array so the whole
+        file is never held in memory. For
+        tweets.js the leading JavaScript
+        assignment is skipped.
+        """
+        decoder = json.JSONDecoder()
+        buffer = ''
+        pos = 0
+        started = False
+        eof = False
+
+        while True:
+            # Skip whitespace, separators and the array brackets
+            while pos < len(buffer):
+                char = buffer[pos]
+                if not started:
+                    if char == '[':
+                        started = True
+                    elif not assignment and not char.isspace():
+                        raise ValueError(
+                            "%s does not contain a JSON array" % self.path)
+                    pos += 1
+                elif char.isspace() or char == ',':
+                    pos += 1
+                elif char == ']':
+                    return
+                else:
+                    break
+
+            if pos < len(buffer):
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    item = None
+                else:
+                    yield item
+                    pos = end
+                    continue
+
+            if eof:
+                if started:
+                    raise ValueError("Unterminated JSON array in %s" % self.path)
+                return
+
+            # Keep only the undecoded tail before reading more
+            buffer = buffer[pos:]
+            pos = 0
+            chunk = archive.read(self.chunk_size)
+            if chunk:
+                buffer += chunk
+            else:
+                eof = True
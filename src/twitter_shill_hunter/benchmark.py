@@ -0,0 +1,365 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from .plugin_registry import PROCESSOR_GROUP, get_registry
+from .run_context import RunContext, context_fields
+from .synthetic_corpus import SyntheticCorpus
+from .tweet_text_extractor import TweetTextExtractor
+from .lazy_import import lazy_import
+
+# Only imported when cases run in their own process
+concurrent_futures = lazy_import('concurrent.futures')
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+# Timeline sizes each case is run at by default
+SIZES = (1000, 100000, 1000000)
+
+# Name of the case running the whole load_processors pipeline
+PIPELINE = 'pipeline'
+
+# Settings cases run with when no config is given. Spelling
+# uses the dictionary mode, which needs no LanguageTool server.
+DEFAULT_CONFIG = {
+    'dialect': 'en-US',
+    'search_options': {},
+    'sentiment': {},
+    'spelling': {'mode': 'spelling'},
+}
+
+
+def peak_rss_mb():
+    """
+    Return the largest resident set of this
+    process or its finished children in MB,
+    or None where it cannot be read
+    """
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Bytes on macOS, kilobytes elsewhere
+    if sys.platform == 'darwin':
+        return peak / (1024.0 * 1024.0)
+    return peak / 1024.0
+
+
+def compare(results, baseline, tolerance=0.1):
+    """
+    Return a line for each case slower, or
+    using more memory, than the same case
+    in the baseline by more than tolerance
+    """
+    saved = dict(((c['name'], c['size']), c) for c in baseline.get('cases', []))
+    regressions = []
+    for case in results.get('cases', []):
+        before = saved.get((case['name'], case['size']))
+        if before is None or case.get('error') or before.get('error'):
+            continue
+        if before.get('tweets_per_second') and case.get('tweets_per_second') is not None:
+            change = case['tweets_per_second'] / before['tweets_per_second'] - 1
+            if change < -tolerance:
+                regressions.append("%s at %d: %.0f tweets/sec, %.0f in baseline (%+.1f%%)" % (
+                    case['name'], case['size'], case['tweets_per_second'],
+                    before['tweets_per_second'], change * 100))
+        if before.get('peak_rss_mb') and case.get('peak_rss_mb') is not None:
+            change = case['peak_rss_mb'] / before['peak_rss_mb'] - 1
+            if change > tolerance:
+                regressions.append("%s at %d: %.1f MB peak RSS, %.1f MB in baseline (%+.1f%%)" % (
+                    case['name'], case['size'], case['peak_rss_mb'],
+                    before['peak_rss_mb'], change * 100))
+    return regressions
+
+
+class Benchmark():
+    """
+    Class to time each processor, and the
+    full load_processors pipeline, over
+    synthetic timelines of each size.
+
+    A processor case feeds extracted pages
+    straight to process_data, timing only
+    the processor. The pipeline case writes
+    the timeline to a JSONL archive and times
+    a whole run reading it. Each case runs in
+    its own process unless isolate is False,
+    so its peak RSS is its own.
+    """
+
+    def __init__(self, plugins, sizes=SIZES, seed=0, page_size=200, config=None,
+                 isolate=True, pipeline=True):
+        self.plugins = list(plugins)
+        self.sizes = list(sizes)
+        self.seed = seed
+        self.page_size = page_size
+        self.config = dict(DEFAULT_CONFIG)
+        self.config.update(config or {})
+        self.isolate = isolate
+        self.pipeline = pipeline
+        self.results = None
+
+    def corpus(self):
+        """
+        Return the seeded corpus, searched
+        for the configured terms
+        """
+        search_terms = self.config.get('search_terms')
+        if search_terms:
+            return SyntheticCorpus(seed=self.seed, search_terms=search_terms)
+        return SyntheticCorpus(seed=self.seed)
+
+    def context(self, corpus):
+        """
+        Return the run context
+        processors draw from
+        """
+        return RunContext(
+            target='benchmark',
+            search_terms=corpus.search_terms,
+            search_options=self.config.get('search_options') or {},
+            sentiment_options=self.config.get('sentiment') or {},
+            spelling_options=self.config.get('spelling') or {},
+            dialect=self.config['dialect'],
+            page_size=self.page_size,
+            history_limit=None)
+
+    def cases(self):
+        """
+        Return (name, size) for
+        every case to run
+        """
+        names = self.plugins + ([PIPELINE] if self.pipeline else [])
+        return [(name, size) for size in self.sizes for name in names]
+
+    def run(self):
+        """
+        Run every case and return
+        the results
+        """
+        cases = []
+        for name, size in self.cases():
+            print("Running %s at %d tweets" % (name, size))
+            if self.isolate:
+                # A forked worker must not print our buffered output again
+                sys.stdout.flush()
+                with concurrent_futures.ProcessPoolExecutor(max_workers=1) as executor:
+                    case = executor.submit(self.run_case, name, size).result()
+            else:
+                case = self.run_case(name, size)
+            cases.append(case)
+
+        self.results = {
+            'seed': self.seed,
+            'page_size': self.page_size,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'config': self.config,
+            'cases': cases,
+        }
+        return self.results
+
+    def run_case(self, name, size):
+        """
+        Run one case, returning its timing,
+        or its error if it failed
+        """
+        case = {'name': name, 'size': size, 'tweets': 0, 'seconds': None,
+                'setup_seconds': None, 'tweets_per_second': None,
+                'peak_rss_mb': None, 'error': None}
+        # Processors report as they go, which is not timed here
+        output = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(output):
+                if name == PIPELINE:
+                    self.time_pipeline(size, case)
+                else:
+                    self.time_processor(name, size, case)
+        except Exception as e:
+            case['error'] = '%s: %s' % (type(e).__name__, e)
+        if case['seconds']:
+            case['tweets_per_second'] = case['tweets'] / case['seconds']
+        case['peak_rss_mb'] = peak_rss_mb()
+        return case
+
+    def time_processor(self, name, size, case):
+        """
+        Feed a timeline to one processor
+        a page at a time, timing process_data
+        and the summary
+        """
+        corpus = self.corpus()
+        context = self.context(corpus)
+        started = time.perf_counter()
+        processor_class = get_registry(PROCESSOR_GROUP).load(name)
+        processor = processor_class()
+        warm_up = getattr(processor, 'warm_up', None)
+        if callable(warm_up):
+            warm_up(*context.values(context_fields(processor_class, 'warm_up')))
+        case['setup_seconds'] = time.perf_counter() - started
+
+        fields = context.values(context_fields(processor_class))
+        seconds = 0.0
+        try:
+            for page in corpus.pages(size, self.page_size):
+                tweets = TweetTextExtractor(page).extract_text()
+                started = time.perf_counter()
+                processor.process_data(tweets, *fields)
+                seconds += time.perf_counter() - started
+                case['tweets'] += len(tweets)
+
+            summary = getattr(processor, 'summary', None)
+            if callable(summary):
+                started = time.perf_counter()
+                summary()
+                seconds += time.perf_counter() - started
+        finally:
+            close = getattr(processor, 'close', None)
+            if callable(close):
+                close()
+        case['seconds'] = seconds
+
+    def time_pipeline(self, size, case):
+        """
+        Time a whole run over the timeline
+        read from an archive, with every
+        plugin and quiet output
+        """
+        # Imported here as it pulls in the X client
+        from .twitter_shill_hunter import TwitterShillHunter
+
+        corpus = self.corpus()
+        with tempfile.TemporaryDirectory() as directory:
+            archive = corpus.write_jsonl(os.path.join(directory, 'timeline.jsonl'), size)
+            config = dict(self.config)
+            config.update({
+                'search_terms': corpus.search_terms,
+                'archive': [archive],
+                'page_size': self.page_size,
+                'output': {'format': 'quiet'},
+            })
+            config.pop('cache', None)
+            started = time.perf_counter()
+            run = TwitterShillHunter({'config': config}, {PROCESSOR_GROUP: self.plugins})
+            case['seconds'] = time.perf_counter() - started
+
+        summary = run.target_summaries[0]
+        if summary['error']:
+            raise RuntimeError(summary['error'])
+        case['tweets'] = summary['posts']
+        # Everything before the first page: loading and warming plugins
+        case['setup_seconds'] = case['seconds'] - summary['seconds']
+
+    def report(self):
+        """
+        Print a line
+        for each case
+        """
+        print("%-20s %9s %9s %9s %12s %9s  %s" % (
+            'case', 'tweets', 'setup', 'seconds', 'tweets/sec', 'peak MB', 'status'))
+        for case in self.results['cases']:
+            print("%-20s %9d %9s %9s %12s %9s  %s" % (
+                case['name'], case['size'],
+                '%.2f' % case['setup_seconds'] if case['setup_seconds'] is not None else '-',
+                '%.2f' % case['seconds'] if case['seconds'] is not None else '-',
+                '%.0f' % case['tweets_per_second'] if case['tweets_per_second'] else '-',
+                '%.1f' % case['peak_rss_mb'] if case['peak_rss_mb'] is not None else '-',
+                'error: %s' % case['error'] if case['error'] else 'ok'))
+
+
+def main(argv=None):
+    """
+    Run the benchmarks from
+    the command line
+    """
+    parser = argparse.ArgumentParser(
+        prog='python -m twitter_shill_hunter.benchmark',
+        description="Benchmark processors over synthetic timelines")
+    parser.add_argument(
+        "plugins",
+        help="comma separated list of plugins to benchmark")
+    parser.add_argument(
+        "--sizes",
+        default=','.join(str(s) for s in SIZES),
+        help="comma separated timeline sizes (default: %(default)s)")
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the synthetic timelines")
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=200,
+        help="posts per page")
+    parser.add_argument(
+        "--config",
+        help="YAML config whose search terms, dialect and plugin "
+             "options the cases run with")
+    parser.add_argument(
+        "--no-pipeline",
+        dest="pipeline",
+        action="store_false",
+        help="only benchmark the processors on their own")
+    parser.add_argument(
+        "--no-isolate",
+        dest="isolate",
+        action="store_false",
+        help="run every case in this process")
+    parser.add_argument(
+        "--output",
+        help="file to write the JSON results to")
+    parser.add_argument(
+        "--baseline",
+        help="JSON results to compare against, exiting with 1 on a regression")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="change from the baseline allowed before it is a regression "
+             "(default: %(default)s)")
+
+    args = parser.parse_args(argv)
+    config = None
+    if args.config:
+        from .input import ProcessInputYaml
+        config = ProcessInputYaml().yaml_processor(args.config)['config']
+        config = dict((k, config[k]) for k in
+                      ('search_terms', 'search_options', 'sentiment', 'spelling',
+                       'dialect', 'processor_execution') if k in config)
+
+    benchmark = Benchmark(
+        args.plugins.split(','), sizes=[int(s) for s in args.sizes.split(',')],
+        seed=args.seed, page_size=args.page_size, config=config,
+        isolate=args.isolate, pipeline=args.pipeline)
+    results = benchmark.run()
+    benchmark.report()
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+        print("Results written to %s" % args.output)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as baseline:
+            regressions = compare(results, json.load(baseline), args.tolerance)
+        if regressions:
+            print("Regressions against %s:" % args.baseline)
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print("No regressions against %s" % args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+import json
+import math
+import os
+from .sinks import ResultSink, PARQUET, ARROW
+from .tweet_record import parse_timestamp
+
+# The extension each format's tables are written with
+EXTENSIONS = {PARQUET: 'parquet', ARROW: 'arrow'}
+
+
+def import_pyarrow():
+    """
+    Return the pyarrow module, explaining
+    how to install it if it is missing
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "Parquet and Arrow output requires the 'pyarrow' package, "
+            "install it with: pip install pyarrow")
+    return pyarrow
+
+
+def tweet_schema(pa):
+    """
+    Return the schema of the
+    per tweet table
+    """
+    return pa.schema([
+        ('target', pa.string()),
+        ('id', pa.string()),
+        ('created_at', pa.string()),
+        ('timestamp', pa.timestamp('ms', tz='UTC')),
+        ('source', pa.string()),
+        ('longitude', pa.float64()),
+        ('latitude', pa.float64()),
+        ('search_terms', pa.list_(pa.string())),
+        ('neg', pa.float64()),
+        ('neu', pa.float64()),
+        ('pos', pa.float64()),
+        ('compound', pa.float64()),
+        ('dialect_hits', pa.list_(pa.struct([
+            ('dialect', pa.string()), ('word', pa.string()), ('hits', pa.int32())]))),
+        ('spelling_rules', pa.list_(pa.string())),
+    ])
+
+
+def target_schema(pa):
+    """
+    Return the schema of the
+    per target table
+    """
+    return pa.schema([
+        ('target', pa.string()),
+        ('posts', pa.int64()),
+        ('pages', pa.int32()),
+        ('seconds', pa.float64()),
+        ('error', pa.string()),
+        ('tweets_matched', pa.int64()),
+        ('compound', pa.float64()),
+        ('dialect_words', pa.int64()),
+        ('spelling_issues', pa.int64()),
+        ('summaries', pa.string()),
+    ])
+
+
+def point(coordinates):
+    """
+    Return (longitude, latitude) from
+    a GeoJSON point, or (None, None)
+    """
+    try:
+        longitude, latitude = coordinates['coordinates'][:2]
+        return float(longitude), float(latitude)
+    except (KeyError, TypeError, ValueError):
+        return None, None
+
+
+def epoch_millis(tweet):
+    """
+    Return a tweet's creation time in
+    milliseconds, or None if unknown
+    """
+    timestamp = tweet.get('timestamp')
+    if timestamp is None:
+        timestamp = parse_timestamp(tweet.get('created_at') or tweet.get('date'))
+    if timestamp is None or math.isnan(timestamp):
+        return None
+    return int(timestamp * 1000)
+
+
+class TableWriter():
+    """
+    Class to collect rows of one table by
+    column and write them a row group at
+    a time
+    """
+
+    def __init__(self, pa, path, schema, file_format, row_group_size):
+        self.pa = pa
+        self.path = path
+        self.schema = schema
+        self.file_format = file_format
+        self.row_group_size = row_group_size
+        self.columns = dict((name, []) for name in schema.names)
+        self.rows = 0
+        self.writer = None
+        self.closed = False
+
+    def append(self, row):
+        """
+        Add a row, writing a row group
+        once enough rows are held
+        """
+        for name, values in self.columns.items():
+            values.append(row.get(name))
+        self.rows += 1
+        if self.rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the rows held
+        as a row group
+        """
+        if self.rows == 0:
+            return
+        table = self.pa.Table.from_pydict(self.columns, schema=self.schema)
+        writer = self.get_writer()
+        if self.file_format == PARQUET:
+            writer.write_table(table, row_group_size=self.rows)
+        else:
+            writer.write_table(table, max_chunksize=self.rows)
+        for values in self.columns.values():
+            del values[:]
+        self.rows = 0
+
+    def get_writer(self):
+        """
+        Return the file writer,
+        opening it on first use
+        """
+        if self.writer is None:
+            if self.file_format == PARQUET:
+                self.writer = self.pa.parquet.ParquetWriter(self.path, self.schema)
+            else:
+                self.writer = self.pa.ipc.new_file(self.path, self.schema)
+        return self.writer
+
+    def close(self):
+        """
+        Write the remaining rows and close,
+        leaving an empty table if nothing
+        was written
+        """
+        if self.closed:
+            return
+        self.flush()
+        self.get_writer().close()
+        self.writer = None
+        self.closed = True
+
+
+class ColumnarSink(ResultSink):
+    """
+    Class to write per tweet features and per
+    target aggregates to Parquet or Arrow IPC
+    files in a directory. Each page's plugin
+    records are joined onto its tweets by post
+    id (or date when there is no id) into one
+    row per tweet, and rows are written a row
+    group at a time as the run streams, so
+    the tables never need to fit in memory.
+
+    tweets.<ext>  - one row per tweet
+    targets.<ext> - one row per target
+    """
+
+    def __init__(self, path, file_format=PARQUET, row_group_size=65536):
+        super().__init__(path)
+        if file_format not in EXTENSIONS:
+            raise ValueError("columnar format must be one of %s, not '%s'" % (
+                ', '.join(EXTENSIONS), file_format))
+        if not path or path == '-':
+            raise ValueError("%s output needs a directory path" % file_format)
+        pa = import_pyarrow()
+        os.makedirs(path, exist_ok=True)
+        extension = EXTENSIONS[file_format]
+        row_group_size = max(1, int(row_group_size))
+        self.tweets = TableWriter(pa, os.path.join(path, 'tweets.' + extension),
+                                  tweet_schema(pa), file_format, row_group_size)
+        self.targets = TableWriter(pa, os.path.join(path, 'targets.' + extension),
+                                   target_schema(pa), file_format, row_group_size)
+        self.summaries = {}
+
+    def write_page(self, target, tweets, results):
+        rows = []
+        positions = {}
+        for tweet in tweets:
+            longitude, latitude = point(tweet.get('coordinates'))
+            rows.append({
+                'target': target,
+                'id': tweet.get('id'),
+                'created_at': tweet.get('created_at') or tweet.get('date'),
+                'timestamp': epoch_millis(tweet),
+                'source': tweet.get('source'),
+                'longitude': longitude,
+                'latitude': latitude,
+            })
+            key = tweet.get('id') or rows[-1]['created_at']
+            positions.setdefault(key, []).append(len(rows) - 1)
+
+        for plugin in results:
+            records = results[plugin]
+            if not records or not isinstance(records, list):
+                continue
+            # Each plugin reports its tweets in page order
+            unclaimed = dict((key, list(p)) for key, p in positions.items())
+            for record in records:
+                waiting = unclaimed.get(record.get('id') or record.get('date'))
+                if waiting:
+                    self.add_features(rows[waiting.pop(0)], record)
+
+        for row in rows:
+            self.tweets.append(row)
+
+    def add_features(self, row, record):
+        """
+        Copy the features a plugin
+        reported onto a tweet's row
+        """
+        for name in ('neg', 'neu', 'pos', 'compound'):
+            if name in record:
+                row[name] = record[name]
+        if 'search_terms' in record:
+            row['search_terms'] = list(record['search_terms'])
+        if 'dialect_hits' in record:
+            row['dialect_hits'] = [
+                {'dialect': dialect, 'word': word, 'hits': hits}
+                for dialect, words in record['dialect_hits'].items()
+                for word, hits in words.items()]
+        if 'matches' in record:
+            row['spelling_rules'] = [m.get('rule_id') for m in record['matches']]
+
+    def write_summary(self, target, plugin, summary):
+        self.summaries[plugin] = summary
+
+    def end_target(self, target, run_summary=None):
+        run_summary = run_summary or {}
+        summaries = self.summaries
+        row = {
+            'target': target,
+            'posts': run_summary.get('posts'),
+            'pages': run_summary.get('pages'),
+            'seconds': run_summary.get('seconds'),
+            'error': run_summary.get('error'),
+            'summaries': json.dumps(summaries, default=str),
+        }
+        for summary in summaries.values():
+            if 'compound_search_results' in summary:
+                row['tweets_matched'] = summary.get('tweets_analyzed')
+                row['compound'] = summary['compound_search_results']
+            if 'dialect_hits' in summary:
+                row['dialect_words'] = sum(
+                    sum(words.values()) for words in summary['dialect_hits'].values())
+            if 'rules' in summary:
+                row['spelling_issues'] = summary.get('issues')
+        self.targets.append(row)
+        self.summaries = {}
+
+    def close(self):
+        self.tweets.close()
+        self.targets.close()
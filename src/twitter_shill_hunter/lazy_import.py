@@ -0,0 +1,49 @@
+import importlib
+import threading
+
+# One stand-in per module name, so patching or importing
+# through any of them affects every module that uses it
+_lazy_modules = {}
+_lazy_lock = threading.Lock()
+
+
+class LazyModule():
+    """
+    Class standing in for a module that is
+    only imported the first time one of its
+    attributes is read, so dependencies a run
+    never touches are never imported
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def load(self):
+        """
+        Import the module if needed
+        and return it
+        """
+        module = self._module
+        if module is None:
+            module = self.__dict__['_module'] = importlib.import_module(self._name)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return '<lazy module %r (%s)>' % (self._name, state)
+
+
+def lazy_import(name):
+    """
+    Return the shared stand-in
+    for a module
+    """
+    with _lazy_lock:
+        module = _lazy_modules.get(name)
+        if module is None:
+            module = _lazy_modules[name] = LazyModule(name)
+        return module
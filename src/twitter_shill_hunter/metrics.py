@@ -0,0 +1,260 @@
+import collections
+import contextlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+# Prefix of every exported Prometheus metric
+PROMETHEUS_PREFIX = 'twitter_shill_hunter_'
+
+# Seconds tweepy reports sleeping for, in the v1.1 API's
+# "Sleeping for: 900" and the v2 client's "Sleeping for 900 seconds."
+SLEEP_RE = re.compile(r'Sleeping for:? (\d+(?:\.\d+)?)')
+
+
+class Metrics():
+    """
+    Class to collect the timings and counters
+    of a run. Stages are timed in wall clock
+    and CPU time of the thread running them,
+    counters are added to as the run goes.
+    Both can be kept per plugin. Safe to use
+    from the fetcher and processor threads.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.clock = time.perf_counter()
+        # (stage, plugin) -> [calls, wall seconds, cpu seconds]
+        self.timings = collections.OrderedDict()
+        # (name, plugin) -> value
+        self.counters = collections.OrderedDict()
+
+    @contextlib.contextmanager
+    def timer(self, stage, plugin=None):
+        """
+        Time the block as a stage. CPU time
+        spent elsewhere on its behalf, such as
+        in a worker process, can be added to
+        the cpu key of the yielded dict.
+        """
+        timing = {'cpu': 0.0}
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield timing
+        finally:
+            self.record(stage, time.perf_counter() - wall,
+                        time.thread_time() - cpu + timing['cpu'], plugin)
+
+    def record(self, stage, wall, cpu, plugin=None):
+        """
+        Add one call of a stage
+        """
+        with self.lock:
+            timing = self.timings.setdefault((stage, plugin), [0, 0.0, 0.0])
+            timing[0] += 1
+            timing[1] += wall
+            timing[2] += cpu
+
+    def add(self, name, value=1, plugin=None):
+        """
+        Add to a counter
+        """
+        with self.lock:
+            self.counters[(name, plugin)] = self.counters.get((name, plugin), 0) + value
+
+    def set(self, name, value, plugin=None):
+        """
+        Set a counter kept elsewhere,
+        such as by a plugin
+        """
+        with self.lock:
+            self.counters[(name, plugin)] = value
+
+    def get(self, name, plugin=None):
+        """
+        Return a counter, 0
+        if never counted
+        """
+        with self.lock:
+            return self.counters.get((name, plugin), 0)
+
+    def seconds(self):
+        """
+        Return the seconds since
+        the run started
+        """
+        return time.perf_counter() - self.clock
+
+    def to_dict(self):
+        """
+        Return the metrics as
+        a JSON ready dict
+        """
+        with self.lock:
+            stages = [{'stage': stage, 'plugin': plugin, 'calls': t[0],
+                       'wall_seconds': t[1], 'cpu_seconds': t[2]}
+                      for (stage, plugin), t in self.timings.items()]
+            counters = [{'name': name, 'plugin': plugin, 'value': value}
+                        for (name, plugin), value in self.counters.items()]
+        return {'started': self.started, 'seconds': self.seconds(),
+                'stages': stages, 'counters': counters}
+
+    def report(self):
+        """
+        Print the stage timings
+        and counters
+        """
+        metrics = self.to_dict()
+        print("-------------------------")
+        print("Run metrics (%.2f seconds)" % metrics['seconds'])
+        print("%-32s %8s %10s %10s" % ('stage', 'calls', 'wall (s)', 'cpu (s)'))
+        for s in metrics['stages']:
+            print("%-32s %8d %10.3f %10.3f" % (
+                self.label(s['stage'], s['plugin']), s['calls'],
+                s['wall_seconds'], s['cpu_seconds']))
+        print("%-32s %8s" % ('counter', 'value'))
+        for c in metrics['counters']:
+            value = c['value']
+            print("%-32s %8s" % (self.label(c['name'], c['plugin']),
+                                 '%.2f' % value if isinstance(value, float) else value))
+
+    def label(self, name, plugin):
+        """
+        Return a stage or counter
+        name as printed
+        """
+        return '%s: %s' % (name, plugin) if plugin else name
+
+    def write_json(self, path):
+        """
+        Write the metrics
+        to a JSON file
+        """
+        with open(path, 'w') as output:
+            json.dump(self.to_dict(), output, indent=2)
+
+    def prometheus(self):
+        """
+        Return the metrics in the Prometheus
+        text format, one family per stage
+        measure and per counter
+        """
+        metrics = self.to_dict()
+        families = collections.OrderedDict()
+
+        def sample(family, help_text, labels, value, metric_type='counter'):
+            samples = families.setdefault(family, (help_text, metric_type, []))[2]
+            samples.append((labels, value))
+
+        sample('run_timestamp_seconds', 'When the run started', {},
+               metrics['started'], 'gauge')
+        sample('run_duration_seconds', 'How long the run took', {},
+               metrics['seconds'], 'gauge')
+        for s in metrics['stages']:
+            labels = collections.OrderedDict([('stage', s['stage'])])
+            if s['plugin']:
+                labels['plugin'] = s['plugin']
+            sample('stage_calls_total', 'Times each stage ran', labels, s['calls'])
+            sample('stage_wall_seconds_total', 'Wall clock time spent in each stage',
+                   labels, s['wall_seconds'])
+            sample('stage_cpu_seconds_total', 'CPU time spent in each stage',
+                   labels, s['cpu_seconds'])
+        for c in metrics['counters']:
+            labels = {'plugin': c['plugin']} if c['plugin'] else {}
+            sample(metric_name(c['name']) + '_total', 'Run counter %s' % c['name'],
+                   labels, c['value'])
+
+        lines = []
+        for family, (help_text, metric_type, samples) in families.items():
+            name = PROMETHEUS_PREFIX + family
+            lines.append('# HELP %s %s' % (name, help_text))
+            lines.append('# TYPE %s %s' % (name, metric_type))
+            for labels, value in samples:
+                lines.append('%s%s %s' % (name, format_labels(labels), repr(float(value))))
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """
+        Write the metrics for the node exporter
+        textfile collector. The file is written
+        under a temporary name and renamed, so
+        the collector never reads half of it.
+        """
+        temporary = '%s.%d.tmp' % (path, os.getpid())
+        with open(temporary, 'w') as output:
+            output.write(self.prometheus())
+        os.replace(temporary, path)
+
+    def export(self, options):
+        """
+        Print, and write out, the metrics
+        as the metrics options ask
+        """
+        if options.get('table'):
+            self.report()
+        if options.get('json'):
+            self.write_json(options['json'])
+        if options.get('prometheus'):
+            self.write_prometheus(options['prometheus'])
+
+
+def metric_name(name):
+    """
+    Return a name made safe
+    for Prometheus
+    """
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def format_labels(labels):
+    """
+    Return Prometheus labels,
+    escaping their values
+    """
+    if not labels:
+        return ''
+    return '{%s}' % ','.join(
+        '%s="%s"' % (key, str(value).replace('\\', '\\\\').replace('"', '\\"')
+                     .replace('\n', '\\n'))
+        for key, value in labels.items())
+
+
+class RateLimitHandler(logging.Handler):
+    """
+    Class to count the sleeps tweepy logs
+    when it waits out a rate limit, and
+    the seconds it sleeps for. The warning
+    still reaches standard error when
+    logging is not set up.
+    """
+
+    def __init__(self, metrics):
+        super().__init__(logging.WARNING)
+        self.metrics = metrics
+
+    def emit(self, record):
+        m = SLEEP_RE.search(record.getMessage())
+        if m:
+            self.metrics.add('rate_limit_waits')
+            self.metrics.add('rate_limit_wait_seconds', float(m.group(1)))
+        if not logging.getLogger().handlers and logging.lastResort is not None:
+            logging.lastResort.handle(record)
+
+    @contextlib.contextmanager
+    def installed(self, logger_name='tweepy'):
+        """
+        Listen to tweepy's log
+        inside the block
+        """
+        logger = logging.getLogger(logger_name)
+        logger.addHandler(self)
+        try:
+            yield self
+        finally:
+            logger.removeHandler(self)
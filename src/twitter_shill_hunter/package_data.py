@@ -0,0 +1,16 @@
+import importlib
+import os
+
+
+def resource_path(package, *parts):
+    """
+    Return the path of a file or directory
+    shipped inside a package
+    """
+    try:
+        from importlib.resources import files
+    except ImportError:
+        # Python 3.8
+        module = importlib.import_module(package)
+        return os.path.join(os.path.dirname(module.__file__), *parts)
+    return str(files(package).joinpath(*parts))
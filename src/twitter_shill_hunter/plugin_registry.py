@@ -0,0 +1,85 @@
+import importlib.metadata
+
+# Entry point group processors are registered under
+PROCESSOR_GROUP = 'twitter_shill_hunter.processors'
+
+
+def group_entry_points(group):
+    """
+    Return the installed entry
+    points of a group
+    """
+    entry_points = importlib.metadata.entry_points()
+    if hasattr(entry_points, 'select'):
+        return entry_points.select(group=group)
+    # Python 3.8 and 3.9 return a dict of groups
+    return entry_points.get(group, ())
+
+
+class PluginRegistry():
+    """
+    Class to find the plugins installed under
+    an entry point group. Entry points are read
+    from package metadata the first time they
+    are needed, and a plugin's module is only
+    imported when that plugin is loaded, so
+    listing plugins imports none of them.
+    """
+
+    def __init__(self, group=PROCESSOR_GROUP):
+        self.group = group
+        self.entry_points = None
+        self.loaded = {}
+
+    def get_entry_points(self):
+        """
+        Return the group's entry
+        points by plugin name
+        """
+        if self.entry_points is None:
+            self.entry_points = dict(
+                (ep.name, ep) for ep in group_entry_points(self.group))
+        return self.entry_points
+
+    def names(self):
+        """
+        Return the names of the
+        installed plugins
+        """
+        return sorted(self.get_entry_points())
+
+    def describe(self):
+        """
+        Return (name, target) pairs for the
+        installed plugins without importing them
+        """
+        entry_points = self.get_entry_points()
+        return [(name, entry_points[name].value) for name in self.names()]
+
+    def load(self, name):
+        """
+        Import a plugin and return
+        the object it names
+        """
+        plugin = self.loaded.get(name)
+        if plugin is None:
+            entry_point = self.get_entry_points().get(name)
+            if entry_point is None:
+                raise ValueError("Unknown plugin %s, installed plugins: %s" % (
+                    name, ', '.join(self.names()) or 'none'))
+            plugin = self.loaded[name] = entry_point.load()
+        return plugin
+
+
+_registries = {}
+
+
+def get_registry(group=PROCESSOR_GROUP):
+    """
+    Return the shared registry
+    of an entry point group
+    """
+    registry = _registries.get(group)
+    if registry is None:
+        registry = _registries[group] = PluginRegistry(group)
+    return registry
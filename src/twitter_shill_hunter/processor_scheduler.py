@@ -0,0 +1,334 @@
+import concurrent.futures
+import contextlib
+import io
+import sys
+import threading
+import time
+from .lazy_import import lazy_import
+from .tokenizer import vocabulary
+
+# Only imported once a processor asks for a worker process
+multiprocessing = lazy_import('multiprocessing')
+
+# How a processor asks to be run, set as a class attribute
+# named execution. Undeclared processors run serially, and
+# process is only honoured when the run opts into it.
+SERIAL = 'serial'
+THREAD = 'thread'
+PROCESS = 'process'
+EXECUTION_MODES = [SERIAL, THREAD, PROCESS]
+
+# The processor living in a worker process
+_worker_processor = None
+
+
+def execution_mode(processor):
+    """
+    Return the execution mode declared
+    by a processor class or instance
+    """
+    mode = getattr(processor, 'execution', SERIAL)
+    return mode if mode in EXECUTION_MODES else SERIAL
+
+
+def _start_worker(processor_class, profiler=None, name=None, vocabulary_size=None):
+    """
+    Create the processor instance
+    in a new worker process, profiled
+    there if the run is profiled
+    """
+    global _worker_processor
+    vocabulary.max_size = vocabulary_size
+    _worker_processor = processor_class()
+    if profiler is not None:
+        _worker_processor = profiler.wrap(name, _worker_processor)
+
+
+def _call_worker(method, args):
+    """
+    Call a method of the worker's processor,
+    returning its result, printed output
+    and the CPU time it took
+    """
+    output = io.StringIO()
+    cpu = time.process_time()
+    if method == 'process_data':
+        # The previous page is done with, in this process
+        vocabulary.trim()
+    with contextlib.redirect_stdout(output):
+        result = getattr(_worker_processor, method)(*args)
+    return result, output.getvalue(), time.process_time() - cpu
+
+
+class ThreadOutput():
+    """
+    Class to stand in for sys.stdout while
+    processors run concurrently. Threads that
+    are capturing write to their own buffer,
+    everything else reaches the real stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def capture(self):
+        """
+        Start capturing output of
+        the calling thread
+        """
+        self.local.buffer = io.StringIO()
+
+    def release(self):
+        """
+        Stop capturing and return what the
+        calling thread printed
+        """
+        buffer = getattr(self.local, 'buffer', None)
+        self.local.buffer = None
+        return buffer.getvalue() if buffer is not None else ''
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is not None:
+            return buffer.write(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class RemoteProcessor():
+    """
+    Class to run a CPU bound processor in
+    its own worker process. The instance
+    lives in the worker for the whole run so
+    state kept between pages and targets
+    behaves as it does in process.
+    """
+
+    execution = PROCESS
+
+    def __init__(self, processor_class, profiler=None, name=None, vocabulary_size=None):
+        self.processor_class = processor_class
+        self.profiler = profiler
+        self.name = name
+        self.vocabulary_size = vocabulary_size
+        self.executor = None
+        self.last_cpu = 0.0
+
+    def call(self, method, args=()):
+        """
+        Call a method of the remote processor
+        and return its result and output. The
+        worker's CPU time is kept in last_cpu.
+        """
+        if self.executor is None:
+            # Workers are spawned so they never inherit fetcher threads
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_start_worker,
+                initargs=(self.processor_class, self.profiler, self.name,
+                          self.vocabulary_size))
+        try:
+            result, output, self.last_cpu = self.executor.submit(
+                _call_worker, method, args).result()
+        except concurrent.futures.process.BrokenProcessPool:
+            # The worker died, so this call fails but the
+            # next one starts a new worker rather than failing too
+            self.executor.shutdown(wait=False)
+            self.executor = None
+            raise
+        return result, output
+
+    def process_data(self, *args):
+        result, output = self.call('process_data', args)
+        sys.stdout.write(output)
+        return result
+
+    def reset(self):
+        """
+        Reset the remote processor, if
+        it has been started
+        """
+        if self.executor is not None and callable(
+                getattr(self.processor_class, 'reset', None)):
+            sys.stdout.write(self.call('reset')[1])
+
+    def summary(self):
+        """
+        Return the remote processor's summary
+        of the target, if it gives one
+        """
+        if self.executor is None or not callable(
+                getattr(self.processor_class, 'summary', None)):
+            return None
+        result, output = self.call('summary')
+        sys.stdout.write(output)
+        return result
+
+    def counters(self):
+        """
+        Return the remote processor's
+        counters, if it keeps any
+        """
+        if self.executor is None or not callable(
+                getattr(self.processor_class, 'counters', None)):
+            return None
+        result, output = self.call('counters')
+        sys.stdout.write(output)
+        return result
+
+    def close(self):
+        """
+        Close the remote processor and
+        stop its worker process
+        """
+        if self.executor is None:
+            return
+        try:
+            # A profiled worker writes its profile as it closes
+            if self.profiler is not None or callable(
+                    getattr(self.processor_class, 'close', None)):
+                sys.stdout.write(self.call('close')[1])
+        finally:
+            self.executor.shutdown()
+            self.executor = None
+
+
+class ProcessorScheduler():
+    """
+    Class to run the processors for one page
+    concurrently. Thread processors, and
+    process ones kept in process, share a
+    pool, remote processors each have a
+    worker process, and serial ones run in
+    the calling thread. Output and results
+    are collected in processor order, so a
+    page takes as long as its slowest
+    processor rather than the sum of them.
+    """
+
+    def __init__(self, metrics=None):
+        self.threads = None
+        self.metrics = metrics
+
+    def run(self, calls):
+        """
+        Run each (name, processor, args) call and
+        return the results by name, in the order
+        the calls were given. Printed output is
+        replayed in the same order. The first
+        error is raised once every call is done.
+        """
+        results = {}
+        concurrent_calls = [c for c in calls if execution_mode(c[1]) != SERIAL]
+        if len(concurrent_calls) == 0 or len(calls) == 1:
+            for name, processor, args in calls:
+                results[name] = self.call(name, processor, args)
+            return results
+
+        if self.threads is None:
+            self.threads = concurrent.futures.ThreadPoolExecutor(
+                thread_name_prefix='processor')
+
+        stdout = sys.stdout
+        output = ThreadOutput(stdout)
+        sys.stdout = output
+        try:
+            futures = {}
+            for name, processor, args in concurrent_calls:
+                if isinstance(processor, RemoteProcessor):
+                    futures[name] = self.threads.submit(self.remote, name, processor, args)
+                else:
+                    futures[name] = self.threads.submit(
+                        self.captured, output, name, processor, args)
+
+            outcomes = []
+            for name, processor, args in calls:
+                if name in futures:
+                    outcomes.append((name, futures[name]))
+                else:
+                    outcomes.append((name, self.run_serial(output, name, processor, args)))
+
+            error = None
+            for name, outcome in outcomes:
+                try:
+                    result, printed = outcome.result()
+                except Exception as e:
+                    error = error or e
+                    continue
+                stdout.write(printed)
+                results[name] = result
+        finally:
+            sys.stdout = stdout
+
+        if error is not None:
+            raise error
+        return results
+
+    def call(self, name, processor, args):
+        """
+        Call a processor's process_data, timing
+        it under its name when the run keeps
+        metrics. A remote processor's CPU time
+        is its worker's.
+        """
+        if self.metrics is None:
+            return processor.process_data(*args)
+        with self.metrics.timer('process', name) as timing:
+            result = processor.process_data(*args)
+            if isinstance(processor, RemoteProcessor):
+                timing['cpu'] += processor.last_cpu
+        self.metrics.add('tweets', len(args[0]), name)
+        return result
+
+    def remote(self, name, processor, args):
+        """
+        Call a remote processor, returning
+        its result and what it printed
+        """
+        if self.metrics is None:
+            return processor.call('process_data', args)
+        with self.metrics.timer('process', name) as timing:
+            outcome = processor.call('process_data', args)
+            timing['cpu'] += processor.last_cpu
+        self.metrics.add('tweets', len(args[0]), name)
+        return outcome
+
+    def captured(self, output, name, processor, args):
+        """
+        Call a processor in this thread, returning
+        its result and what it printed
+        """
+        output.capture()
+        try:
+            result = self.call(name, processor, args)
+        finally:
+            printed = output.release()
+        return result, printed
+
+    def run_serial(self, output, name, processor, args):
+        """
+        Run a serial processor in the calling
+        thread and wrap the outcome so it is
+        collected like the concurrent ones
+        """
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(self.captured(output, name, processor, args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def close(self):
+        """
+        Stop the thread pool
+        """
+        if self.threads is not None:
+            self.threads.shutdown()
+            self.threads = None
@@ -1,16 +1,22 @@
-
 class GeoAnalysis():
     """
     Class to derive geo data
     from tweets
     """
 
+    execution = 'thread'
+    context_fields = ()
+
     def process_data(self, tweets_and_date):
         """
-        Data processing function
+        Data processing function,
+        returning the time, location
+        and client of each tweet with
+        coordinates
         """
 
-        for tweet in tweets_and_date:
-            print(tweet['created_at'])
-            print(tweet['coordinates'])
-            print(tweet['source'])
+        return [{'date': tweet['created_at'],
+                 'id': tweet.get('id'),
+                 'coordinates': tweet['coordinates'],
+                 'source': tweet.get('source')}
+                for tweet in tweets_and_date if tweet.get('coordinates')]
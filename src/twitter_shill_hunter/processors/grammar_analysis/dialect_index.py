@@ -0,0 +1,225 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+# magic, byte order, fingerprint length, dialect count, word count
+HEADER = struct.Struct('<8s1sxxxIII')
+MAGIC = b'TSHDIX02'
+BYTE_ORDER = b'L' if sys.byteorder == 'little' else b'B'
+
+# Indexes already opened by this process, keyed by fingerprint
+_indexes = {}
+
+
+class DialectIndex():
+    """
+    Class to look words up in a compiled,
+    read only dialect index. The index is
+    a sorted word table with a bitmask of
+    the dialects using each word, laid out
+    so it can be memory mapped and shared
+    between processes.
+    """
+
+    def __init__(self, buffer):
+        """
+        Parse the header of a compiled
+        index held in buffer (bytes
+        or an mmap)
+        """
+        self.buffer = buffer
+        magic, byte_order, fp_len, n_dialects, n_words = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or byte_order != BYTE_ORDER:
+            raise ValueError("Not a dialect index for this platform")
+
+        pos = HEADER.size
+        self.fingerprint = bytes(buffer[pos:pos + fp_len]).decode('ascii')
+        pos += fp_len
+
+        self.dialects = []
+        for i in range(n_dialects):
+            (name_len,) = struct.unpack_from('<H', buffer, pos)
+            pos += 2
+            self.dialects.append(bytes(buffer[pos:pos + name_len]).decode('utf-8'))
+            pos += name_len
+
+        # Align the integer tables
+        pos += -pos % 4
+        self.view = memoryview(buffer)
+        self.offsets = self.view[pos:pos + 4 * (n_words + 1)].cast('I')
+        pos += 4 * (n_words + 1)
+        self.masks = self.view[pos:pos + 4 * n_words].cast('I')
+        pos += 4 * n_words
+        self.words_start = pos
+        self.size = n_words
+
+    @classmethod
+    def compile(cls, dialect_words, fingerprint=''):
+        """
+        Build the binary index from a list
+        of (dialect name, word list) pairs
+        and return it as bytes
+        """
+        if len(dialect_words) > 32:
+            raise ValueError("A dialect index holds at most 32 dialects")
+
+        masks = {}
+        for dialect_id, (name, words) in enumerate(dialect_words):
+            for word in words:
+                key = str(word).strip().casefold().encode('utf-8')
+                if key:
+                    masks[key] = masks.get(key, 0) | (1 << dialect_id)
+
+        words = sorted(masks)
+        offsets = array('I', [0])
+        for word in words:
+            offsets.append(offsets[-1] + len(word))
+
+        fp = fingerprint.encode('ascii')
+        out = bytearray(HEADER.pack(MAGIC, BYTE_ORDER, len(fp),
+                                    len(dialect_words), len(words)))
+        out += fp
+        for name, _ in dialect_words:
+            encoded = name.encode('utf-8')
+            out += struct.pack('<H', len(encoded)) + encoded
+        out += b'\0' * (-len(out) % 4)
+        out += offsets.tobytes()
+        out += array('I', [masks[w] for w in words]).tobytes()
+        out += b''.join(words)
+        return bytes(out)
+
+    @classmethod
+    def open(cls, path, fingerprint=None):
+        """
+        Memory map a compiled index. Returns
+        None when the file is missing, stale
+        or unreadable.
+        """
+        try:
+            with open(path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            index = cls(buffer)
+        except (ValueError, struct.error):
+            buffer.close()
+            return None
+
+        if fingerprint is not None and index.fingerprint != fingerprint:
+            # Unmap the stale file so it can be replaced
+            index.close()
+            return None
+        return index
+
+    def close(self):
+        """
+        Release the tables and unmap
+        the file, if it was mapped
+        """
+        for view in (self.offsets, self.masks, self.view):
+            view.release()
+        # An index compiled in memory holds bytes
+        if hasattr(self.buffer, 'close'):
+            self.buffer.close()
+
+    def word(self, i):
+        """
+        Return the i-th word of
+        the table as bytes
+        """
+        start = self.words_start + self.offsets[i]
+        end = self.words_start + self.offsets[i + 1]
+        return self.buffer[start:end]
+
+    def lookup(self, word):
+        """
+        Return the bitmask of dialects
+        using word, or 0 if none do
+        """
+        key = word.encode('utf-8')
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.word(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.size and self.word(lo) == key:
+            return self.masks[lo]
+        return 0
+
+
+def default_cache_dir():
+    """
+    Directory compiled indexes
+    are written to
+    """
+    return os.path.join(
+        os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+        'twitter_shill_hunter', 'dialects')
+
+
+def source_fingerprint(sources):
+    """
+    Hash the names, sizes and modification
+    times of the source word lists. Returns
+    None if any source cannot be read.
+    """
+    digest = hashlib.sha1(MAGIC)
+    for name, path in sources:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        digest.update(('%s\0%s\0%d\0%d\0' % (
+            name, os.path.abspath(path), st.st_size, st.st_mtime_ns)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_dialect_index(sources, loader, cache_dir=None):
+    """
+    Return the compiled index for a list of
+    (dialect name, YAML path) sources. The
+    index is compiled on first use, written
+    to the cache directory and memory mapped,
+    then reused by this and later processes
+    until a source file changes. loader
+    parses one source into {'words': [...]}.
+    """
+    fingerprint = source_fingerprint(sources)
+    if fingerprint is None:
+        # Sources that are not files cannot be cached
+        return DialectIndex(DialectIndex.compile(
+            [(name, loader(path)['words']) for name, path in sources]))
+
+    if fingerprint in _indexes:
+        return _indexes[fingerprint]
+
+    cache_dir = cache_dir or default_cache_dir()
+    path = os.path.join(cache_dir, 'dialects-%s.idx' % fingerprint[:20])
+    index = DialectIndex.open(path, fingerprint)
+
+    if index is None:
+        data = DialectIndex.compile(
+            [(name, loader(p)['words']) for name, p in sources], fingerprint)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            index = DialectIndex.open(path, fingerprint)
+        except OSError:
+            index = None
+        if index is None:
+            # Read only cache, keep the index in memory
+            index = DialectIndex(data)
+
+    _indexes[fingerprint] = index
+    return index
@@ -0,0 +1,136 @@
+import re
+from ...text_normalizer import TextNormalizer
+from ...tokenizer import tweet_tokens, vocabulary
+
+# Runs of letters, allowing inner apostrophes (e.g. "don't")
+WORD_RE = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)*")
+
+
+class DialectMatcher():
+    """
+    Class to find dialect words in text.
+    Every dialect word list is compiled
+    into one hash index so each tweet is
+    scanned once for all dialects, and
+    only whole words match.
+    """
+
+    def __init__(self, index=None):
+        """
+        Match against an in memory word
+        index, or a compiled DialectIndex
+        when one is given
+        """
+        self.index = index
+        self.normalizer = TextNormalizer()
+        self.words = {}
+        self.dialects = list(index.dialects) if index is not None else []
+        self.dialect_mask = (1 << len(self.dialects)) - 1
+        # Dialect bitmask of each token id seen so far
+        self.id_masks = {}
+        self.generation = vocabulary.generation
+
+    @classmethod
+    def from_index(cls, index, dialects=None):
+        """
+        Build a matcher over a compiled index,
+        optionally limited to some of its
+        dialects
+        """
+        matcher = cls(index)
+        if dialects is not None:
+            matcher.dialect_mask = 0
+            for i, name in enumerate(matcher.dialects):
+                if name in dialects:
+                    matcher.dialect_mask |= 1 << i
+        return matcher
+
+    def add_dialect(self, name, words):
+        """
+        Add a dialect's word list
+        to the in memory index
+        """
+        bit = 1 << len(self.dialects)
+        self.id_masks = {}
+        self.dialects.append(name)
+        self.dialect_mask |= bit
+        for word in words:
+            key = str(word).strip().casefold()
+            if key:
+                self.words[key] = self.words.get(key, 0) | bit
+
+    def lookup(self, word):
+        """
+        Return the bitmask of
+        dialects using word
+        """
+        if self.index is not None:
+            return self.index.lookup(word) & self.dialect_mask
+        return self.words.get(word, 0) & self.dialect_mask
+
+    def tokenize(self, text):
+        """
+        Split text into normalised,
+        case folded words
+        """
+        return WORD_RE.findall(self.normalizer.normalize(text).casefold())
+
+    def match(self, text):
+        """
+        Return a list of (dialect, word)
+        pairs for every dialect word
+        found in the text
+        """
+        return self.match_tokens(self.tokenize(text))
+
+    def match_tokens(self, tokens):
+        """
+        Return the (dialect, word) pairs
+        for the dialect words in tokens
+        """
+        hits = []
+        for token in tokens:
+            mask = self.lookup(token)
+            dialect_id = 0
+            while mask:
+                if mask & 1:
+                    hits.append((self.dialects[dialect_id], token))
+                mask >>= 1
+                dialect_id += 1
+        return hits
+
+    def count(self, tweets_and_date, tweet_hits=None):
+        """
+        Count dialect words across tweets,
+        returning {dialect: {word: hits}}.
+        If a tweet_hits list is given the
+        counts of each tweet are added to it.
+        """
+        counts = {}
+        if self.generation != vocabulary.generation:
+            # Ids from a cleared vocabulary mean other words now
+            self.id_masks = {}
+            self.generation = vocabulary.generation
+        id_masks = self.id_masks
+        for tweet in tweets_and_date:
+            found = {} if tweet_hits is not None else None
+            for token_id in tweet_tokens(tweet).ids:
+                mask = id_masks.get(token_id)
+                if mask is None:
+                    mask = id_masks[token_id] = self.lookup(vocabulary.word(token_id))
+                if not mask:
+                    continue
+                word = vocabulary.word(token_id)
+                dialect_id = 0
+                while mask:
+                    if mask & 1:
+                        words = counts.setdefault(self.dialects[dialect_id], {})
+                        words[word] = words.get(word, 0) + 1
+                        if found is not None:
+                            words = found.setdefault(self.dialects[dialect_id], {})
+                            words[word] = words.get(word, 0) + 1
+                    mask >>= 1
+                    dialect_id += 1
+            if tweet_hits is not None:
+                tweet_hits.append(found)
+        return counts
@@ -1,6 +1,8 @@
-import pkg_resources
 import os 
 from ...input import ProcessInputYaml
+from ...package_data import resource_path
+from .dialect_matcher import DialectMatcher
+from .dialect_index import load_dialect_index
 
  
 class GrammarAnalysis():
@@ -9,20 +11,54 @@ class GrammarAnalysis():
     grammar from tweets
     """
 
+    # CPU bound, run in a worker process when execution is process
+    execution = 'process'
+    context_fields = ('dialect',)
+
     def __init__(self):
         self.dialect = ""
         self.valid_dialects = []
+        self.matcher = None
+        self.matcher_dialects = None
+        self.dialect_hits = {}
+
+    def reset(self):
+        """
+        Clear hit counts before
+        the next target
+        """
+        self.dialect_hits = {}
 
     def process_data(self, tweets_and_date, dialect):
         """
-        Data processing function
+        Data processing function, returning
+        the dialect words found in each tweet
         """
-        self.dialect = str(dialect) 
         self.tweets_and_date = tweets_and_date
-     
-        print("Chosen language/dialect: " + self.dialect)
-        self.get_lang_dialects()
-        self.analyze_dialect()
+
+        # Dialect files are only listed when the dialect changes
+        if str(dialect) != self.dialect:
+            self.dialect = str(dialect)
+            print("Chosen language/dialect: " + self.dialect)
+            self.get_lang_dialects()
+
+        tweet_hits = []
+        page_hits = self.analyze_dialect(tweet_hits)
+
+        for d in page_hits:
+            words = self.dialect_hits.setdefault(d, {})
+            for word in page_hits[d]:
+                words[word] = words.get(word, 0) + page_hits[d][word]
+
+        return [{'date': tweet['date'], 'id': tweet.get('id'), 'dialect_hits': hits}
+                for tweet, hits in zip(self.tweets_and_date, tweet_hits) if hits]
+
+    def summary(self):
+        """
+        Return the dialect words found
+        across the target's tweets
+        """
+        return {'dialect': self.dialect, 'dialect_hits': self.dialect_hits}
 
     def get_lang_dialects(self):
         """
@@ -30,32 +66,40 @@ class GrammarAnalysis():
         with the language.
         """
         language = self.dialect.split('-')[0]
+        self.valid_dialects = []
  
-        resource_path = '/dialect_mappings/'+str(language)
-        resource_path = pkg_resources.resource_filename(__name__, resource_path)
-        for file in os.listdir(resource_path):
+        mappings = resource_path(__package__, 'dialect_mappings', str(language))
+        for file in sorted(os.listdir(mappings)):
             if file.endswith(".yaml") and file != self.dialect+".yaml":
-                self.valid_dialects.append('/'.join((resource_path,file)))
+                self.valid_dialects.append('/'.join((mappings,file)))
 
          
 
-    def analyze_dialect(self):
+    def analyze_dialect(self, tweet_hits=None):
         """
-        Review the tweets 
-        to see if spellings
-        match dialect
+        Review the tweets to see if
+        spellings match dialect. Returns
+        {dialect: {word: hits}}, adding
+        each tweet's hits to tweet_hits
+        if given.
         """
+        matcher = self.get_matcher()
+        return matcher.count(self.tweets_and_date, tweet_hits)
 
-        for dialect in self.valid_dialects:
-            dialect_words = self.process_input(dialect)
-
-            for tweet in self.tweets_and_date:
-                for word in dialect_words['words']:
-                    if word in tweet['text']:
-                        print("Dialect is: " + str(dialect.split('/')[-1]))
-                        print("Word found is: " + word)
-                
-
+    def get_matcher(self):
+        """
+        Load the compiled index of the valid
+        dialect word lists, reusing it while
+        the dialect files are unchanged
+        """
+        if self.matcher is None or self.matcher_dialects != self.valid_dialects:
+            sources = [
+                (dialect.split('/')[-1].rsplit('.yaml', 1)[0], dialect)
+                for dialect in self.valid_dialects]
+            index = load_dialect_index(sources, self.process_input)
+            self.matcher = DialectMatcher.from_index(index)
+            self.matcher_dialects = list(self.valid_dialects)
+        return self.matcher
 
     def process_input(self, yaml_file):
         """
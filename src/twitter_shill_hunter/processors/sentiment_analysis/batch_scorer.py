@@ -0,0 +1,318 @@
+import math
+import string
+import numpy as np
+from vaderSentiment.vaderSentiment import (
+    BOOSTER_DICT, NEGATE, SPECIAL_CASES, C_INCR, N_SCALAR,
+    SentimentIntensityAnalyzer)
+
+# Words whose VADER rules depend on the whole sentence. Texts
+# containing them are scored by the reference analyzer instead.
+FALLBACK_WORDS = frozenset(["but", "no", "least"])
+
+# Multi word phrases that replace or adjust a valence
+FALLBACK_PHRASES = frozenset(
+    [k for k in SPECIAL_CASES if ' ' in k] +
+    [k for k in BOOSTER_DICT if ' ' in k])
+PHRASE_STARTS = frozenset(p.split()[0] for p in FALLBACK_PHRASES)
+
+SO_THIS = frozenset(["so", "this"])
+
+# Per word feature flags
+IN_LEXICON = 1
+NEGATION = 2
+SO_OR_THIS = 4
+NEVER = 8
+WITHOUT = 16
+DOUBT = 32
+UPPER = 64
+FALLBACK = 128
+PHRASE_START = 256
+
+
+class BatchVader():
+    """
+    Class to score batches of texts with
+    VADER using NumPy. Texts are tokenized
+    into vocabulary ids once and the valence,
+    booster and negation rules are applied to
+    every word of the batch as array operations.
+    """
+
+    def __init__(self, analyzer=None, max_vocabulary=1000000):
+        """
+        Share the lexicon of analyzer, or
+        of a new reference analyzer
+        """
+        self.reference = analyzer or SentimentIntensityAnalyzer()
+        self.lexicon = self.reference.lexicon
+        self.emoji_chars = frozenset(e for e in self.reference.emojis if len(e) == 1)
+        self.max_vocabulary = max_vocabulary
+        self.fallbacks = 0
+        self.clear_vocabulary()
+
+    def clear_vocabulary(self):
+        """
+        Forget every token seen so far.
+        Id 0 is padding before the first word.
+        """
+        self.vocabulary = {}
+        self.words = ['']
+        self.valences = [0.0]
+        self.boosters = [0.0]
+        self.flags = [0]
+        self.arrays = None
+
+    def token_id(self, token):
+        """
+        Return the vocabulary id of a raw
+        token, adding it if new. Tokens keep
+        their case and punctuation so each
+        distinct token is only inspected once.
+        """
+        i = self.vocabulary.get(token)
+        if i is not None:
+            return i
+
+        # Strip punctuation unless that leaves an emoticon
+        stripped = token.strip(string.punctuation)
+        word = token if len(stripped) <= 2 else stripped
+        lower = word.lower()
+
+        flags = 0
+        if lower in self.lexicon:
+            flags |= IN_LEXICON
+        if lower in NEGATE or "n't" in lower:
+            flags |= NEGATION
+        if lower in SO_THIS:
+            flags |= SO_OR_THIS
+        if lower == "never":
+            flags |= NEVER
+        if lower == "without":
+            flags |= WITHOUT
+        if lower == "doubt":
+            flags |= DOUBT
+        if word.isupper():
+            flags |= UPPER
+        if lower in FALLBACK_WORDS:
+            flags |= FALLBACK
+        if lower in PHRASE_STARTS:
+            flags |= PHRASE_START
+
+        i = len(self.words)
+        self.vocabulary[token] = i
+        self.words.append(lower)
+        self.valences.append(self.lexicon.get(lower, 0.0))
+        self.boosters.append(BOOSTER_DICT.get(lower, 0.0))
+        self.flags.append(flags)
+        self.arrays = None
+        return i
+
+    def vocabulary_arrays(self):
+        """
+        Return the per token feature tables,
+        rebuilt only when the vocabulary grew
+        """
+        if self.arrays is None:
+            self.arrays = (np.array(self.valences, dtype=np.float64),
+                           np.array(self.boosters, dtype=np.float64),
+                           np.array(self.flags, dtype=np.int32))
+        return self.arrays
+
+    def prepare(self, text):
+        """
+        Replace emojis with their descriptions
+        and strip the text, as VADER does
+        """
+        text = str(text)
+        emojis = self.reference.emojis
+        if self.emoji_chars.isdisjoint(text):
+            return text.strip()
+
+        parts = []
+        prev_space = True
+        for ch in text:
+            if ch in emojis:
+                if not prev_space:
+                    parts.append(' ')
+                parts.append(emojis[ch])
+                prev_space = False
+            else:
+                parts.append(ch)
+                prev_space = ch == ' '
+        return ''.join(parts).strip()
+
+    def has_phrase(self, ids):
+        """
+        True if the words contain a phrase
+        that replaces or adjusts a valence
+        """
+        lowered = [self.words[i] for i in ids]
+        for n in (2, 3):
+            for i in range(len(lowered) - n + 1):
+                if ' '.join(lowered[i:i + n]) in FALLBACK_PHRASES:
+                    return True
+        return False
+
+    def polarity_scores(self, text):
+        """
+        Score a single text
+        """
+        return self.score_batch([text])[0]
+
+    def score_batch(self, texts):
+        """
+        Return VADER scores for each of
+        texts, in the same order
+        """
+        if not texts:
+            return []
+        # Ids must stay valid for the whole batch, so only clear between batches
+        if len(self.words) > self.max_vocabulary:
+            self.clear_vocabulary()
+
+        prepared = [self.prepare(text) for text in texts]
+        vocabulary = self.vocabulary
+        token_id = self.token_id
+        ids = []
+        lengths = []
+        for text in prepared:
+            tokens = text.split()
+            ids.extend([vocabulary.get(t) or token_id(t) for t in tokens])
+            lengths.append(len(tokens))
+
+        ids = np.array(ids, dtype=np.int64)
+        lengths = np.array(lengths, dtype=np.int64)
+        doc = np.repeat(np.arange(len(texts)), lengths)
+        flags = self.vocabulary_arrays()[2][ids]
+
+        # Sentence wide rules are left to the reference analyzer
+        fallback = np.bincount(doc, weights=(flags & FALLBACK) != 0, minlength=len(texts)) > 0
+        phrases = np.bincount(doc, weights=(flags & PHRASE_START) != 0, minlength=len(texts)) > 0
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        for d in np.flatnonzero(phrases & ~fallback):
+            if self.has_phrase(ids[starts[d]:starts[d] + lengths[d]]):
+                fallback[d] = True
+
+        results = self.score_words(prepared, ids, doc)
+        for d in np.flatnonzero(fallback):
+            self.fallbacks += 1
+            results[d] = self.reference.polarity_scores(texts[d])
+        return results
+
+    def score_words(self, texts, ids, doc):
+        """
+        Apply the VADER word rules to the
+        flattened words of a batch
+        """
+        n_docs = len(texts)
+        valences, boosters, flags = self.vocabulary_arrays()
+        n_words = np.bincount(doc, minlength=n_docs)
+        starts = np.concatenate(([0], np.cumsum(n_words)[:-1]))
+        position = np.arange(len(ids)) - starts[doc]
+
+        # Some but not all words in capitals
+        word_flags = flags[ids]
+        upper = (word_flags & UPPER) != 0
+        n_upper = np.bincount(doc, weights=upper, minlength=n_docs)
+        cap_diff = ((n_words - n_upper) > 0) & ((n_words - n_upper) < n_words)
+        shouting = upper & cap_diff[doc]
+
+        is_booster = boosters[ids] != 0.0
+        scored = ((word_flags & IN_LEXICON) != 0) & ~is_booster
+
+        v = valences[ids].copy()
+        v = np.where(scored & shouting, np.where(v > 0, v + C_INCR, v - C_INCR), v)
+
+        def previous(values, k, fill):
+            # Value of the word k places before, or fill at the document start
+            shifted = np.full_like(values, fill)
+            shifted[k:] = values[:-k]
+            shifted[position < k] = fill
+            return shifted
+
+        prev_flags = [None] + [previous(word_flags, k, 0) for k in (1, 2, 3)]
+        prev_ids = [None] + [previous(ids, k, 0) for k in (1, 2, 3)]
+        prev_upper = [None] + [previous(shouting, k, False) for k in (1, 2, 3)]
+
+        def flagged(k, flag):
+            return (prev_flags[k] & flag) != 0
+
+        for k, decay in ((1, 1.0), (2, 0.95), (3, 0.9)):
+            active = scored & (position >= k) & ~flagged(k, IN_LEXICON)
+
+            # Booster and dampener words before the lexicon word
+            b = boosters[prev_ids[k]]
+            s = np.where(v < 0, -b, b)
+            s = np.where((b != 0) & prev_upper[k], np.where(v > 0, s + C_INCR, s - C_INCR), s)
+            v = np.where(active, v + s * decay, v)
+
+            if k == 1:
+                negate = flagged(1, NEGATION)
+                boost = np.zeros_like(negate)
+                keep = np.zeros_like(negate)
+            elif k == 2:
+                boost = flagged(2, NEVER) & flagged(1, SO_OR_THIS)
+                keep = flagged(2, WITHOUT) & flagged(1, DOUBT)
+                negate = flagged(2, NEGATION)
+            else:
+                boost = (flagged(3, NEVER) & flagged(2, SO_OR_THIS)) | flagged(1, SO_OR_THIS)
+                keep = flagged(3, WITHOUT) & (flagged(2, DOUBT) | flagged(1, DOUBT))
+                negate = flagged(3, NEGATION)
+
+            v = np.where(active & boost, v * 1.25, v)
+            v = np.where(active & ~boost & ~keep & negate, v * N_SCALAR, v)
+
+        sentiments = np.where(scored, v, 0.0)
+        sums = np.bincount(doc, weights=sentiments, minlength=n_docs)
+        pos_sums = np.bincount(doc, weights=np.where(sentiments > 0, sentiments + 1, 0.0),
+                               minlength=n_docs)
+        neg_sums = np.bincount(doc, weights=np.where(sentiments < 0, sentiments - 1, 0.0),
+                               minlength=n_docs)
+        neu_counts = np.bincount(doc, weights=sentiments == 0, minlength=n_docs)
+
+        return [
+            self.summarise(texts[d], n_words[d], sums[d], pos_sums[d], neg_sums[d], neu_counts[d])
+            for d in range(n_docs)]
+
+    def summarise(self, text, n_words, sum_s, pos_sum, neg_sum, neu_count):
+        """
+        Turn the sums for one text into the
+        dictionary polarity_scores returns
+        """
+        if not n_words:
+            return {"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": 0.0}
+
+        sum_s = float(sum_s)
+        pos_sum = float(pos_sum)
+        neg_sum = float(neg_sum)
+        emphasis = self.reference._punctuation_emphasis(text)
+        if sum_s > 0:
+            sum_s += emphasis
+        elif sum_s < 0:
+            sum_s -= emphasis
+        compound = max(-1.0, min(1.0, sum_s / math.sqrt(sum_s * sum_s + 15)))
+
+        if pos_sum > math.fabs(neg_sum):
+            pos_sum += emphasis
+        elif pos_sum < math.fabs(neg_sum):
+            neg_sum -= emphasis
+        total = pos_sum + math.fabs(neg_sum) + neu_count
+
+        return {"neg": round(math.fabs(neg_sum / total), 3),
+                "neu": round(math.fabs(neu_count / total), 3),
+                "pos": round(math.fabs(pos_sum / total), 3),
+                "compound": round(compound, 4)}
+
+    def validate(self, texts, tolerance=1e-3):
+        """
+        Compare batch scores against the
+        reference analyzer, returning the
+        texts that differ by more than
+        tolerance with both sets of scores
+        """
+        mismatches = []
+        for text, scores in zip(texts, self.score_batch(texts)):
+            expected = self.reference.polarity_scores(text)
+            if any(abs(scores[k] - expected[k]) > tolerance for k in expected):
+                mismatches.append((text, scores, expected))
+        return mismatches
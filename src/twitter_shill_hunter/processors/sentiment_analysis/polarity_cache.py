@@ -0,0 +1,188 @@
+import collections
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+
+class PolarityCache():
+    """
+    Class to memoize sentiment scores.
+    Scores are kept in a bounded LRU keyed
+    by a hash of the whitespace normalised
+    text, and optionally in a SQLite file so
+    later runs can reuse them.
+    """
+
+    def __init__(self, maxsize=100000, path=None, namespace=''):
+        """
+        Keep at most maxsize scores in memory,
+        persisting them to path if given.
+        Scores from different backends are
+        kept apart by namespace.
+        """
+        self.maxsize = maxsize
+        self.namespace = namespace
+        self.path = os.path.expanduser(path) if path else None
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.db = None
+        self.pending = 0
+
+        if self.path:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS polarity ("
+                "key BLOB PRIMARY KEY, scores TEXT NOT NULL)")
+            self.db.commit()
+
+    def key(self, text):
+        """
+        Hash of the text with runs of whitespace
+        collapsed, which VADER ignores anyway.
+        Case is kept as it changes the score.
+        """
+        normalised = ' '.join(text.split())
+        if self.namespace:
+            normalised = self.namespace + '\0' + normalised
+        return hashlib.blake2b(normalised.encode('utf-8'), digest_size=16).digest()
+
+    def get(self, text, score):
+        """
+        Return the scores for text, calling
+        score(text) only on a cache miss
+        """
+        key = self.key(text)
+        with self.lock:
+            scores = self.lookup(key)
+            if scores is not None:
+                self.hits += 1
+                return scores
+            self.misses += 1
+
+        scores = score(text)
+
+        with self.lock:
+            self.store(key, scores)
+        return scores
+
+    def get_many(self, texts, score_batch):
+        """
+        Return the scores for each of texts,
+        scoring all cache misses with one
+        call to score_batch(texts)
+        """
+        keys = [self.key(text) for text in texts]
+        results = [None] * len(texts)
+        missing = collections.OrderedDict()
+
+        with self.lock:
+            for n, key in enumerate(keys):
+                scores = self.lookup(key)
+                if scores is not None:
+                    self.hits += 1
+                    results[n] = scores
+                elif key in missing:
+                    # Repeated within the batch, scored once below
+                    self.hits += 1
+                    missing[key].append(n)
+                else:
+                    self.misses += 1
+                    missing[key] = [n]
+
+        if not missing:
+            return results
+
+        scored = score_batch([texts[positions[0]] for positions in missing.values()])
+
+        with self.lock:
+            for (key, positions), scores in zip(missing.items(), scored):
+                self.store(key, scores)
+                for n in positions:
+                    results[n] = scores
+        return results
+
+    def lookup(self, key):
+        """
+        Return cached scores for key from
+        memory or disk, or None. The lock
+        must be held.
+        """
+        scores = self.entries.get(key)
+        if scores is not None:
+            self.entries.move_to_end(key)
+            return scores
+
+        if self.db is not None:
+            row = self.db.execute(
+                "SELECT scores FROM polarity WHERE key = ?", (key,)).fetchone()
+            if row:
+                scores = json.loads(row[0])
+                self.remember(key, scores)
+                return scores
+        return None
+
+    def store(self, key, scores):
+        """
+        Remember newly computed scores,
+        queueing them for disk. The lock
+        must be held.
+        """
+        self.remember(key, scores)
+        if self.db is not None:
+            self.db.execute(
+                "INSERT OR REPLACE INTO polarity (key, scores) VALUES (?, ?)",
+                (key, json.dumps(scores)))
+            self.pending += 1
+            if self.pending >= 1000:
+                self.db.commit()
+                self.pending = 0
+
+    def remember(self, key, scores):
+        """
+        Add scores to the in memory LRU,
+        evicting the least recently used
+        """
+        self.entries[key] = scores
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        """
+        Return hit and miss
+        counters
+        """
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self.entries)
+            }
+
+    def flush(self):
+        """
+        Commit scores waiting to
+        be written to disk
+        """
+        with self.lock:
+            if self.db is not None and self.pending:
+                self.db.commit()
+                self.pending = 0
+
+    def close(self):
+        """
+        Flush and close the
+        persistent store
+        """
+        self.flush()
+        with self.lock:
+            if self.db is not None:
+                self.db.close()
+                self.db = None
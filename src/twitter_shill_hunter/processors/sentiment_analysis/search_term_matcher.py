@@ -0,0 +1,233 @@
+import re
+from ...text_normalizer import TextNormalizer, tweet_view
+from ...tokenizer import tweet_tokens, vocabulary
+
+# Words, allowing inner apostrophes (e.g. "don't")
+TOKEN_RE = re.compile(r"\w+(?:['’]\w+)*")
+
+
+class SearchTermMatcher():
+    """
+    Class to find search terms in text.
+    The term list is compiled once and each
+    tweet is scanned in a single pass
+    however many terms are watched.
+    """
+
+    def __init__(self, search_terms, case_sensitive=False, whole_word=True):
+        """
+        Compile the search terms. With
+        whole_word, terms and phrases only
+        match on word boundaries, otherwise
+        any substring matches.
+        """
+        self.search_terms = list(search_terms)
+        self.case_sensitive = case_sensitive
+        self.whole_word = whole_word
+        self.normalizer = TextNormalizer()
+        # The view of each tweet terms are matched against
+        self.view = 'normalized' if case_sensitive else 'folded'
+
+        # first token -> [(phrase tokens, term number)]
+        self.phrases = {}
+        substring_terms = []
+        # term number -> key matched as written
+        symbol_terms = {}
+        # Keys of phrases matched by regex, as tweets are not tokenized into numbers
+        self.number_keys = set()
+
+        for i, term in enumerate(self.search_terms):
+            tokens = tuple(self.tokenize(str(term)))
+            if whole_word and tokens:
+                key = ' '.join(self.fold(str(term)).split())
+                if key != ' '.join(tokens):
+                    # Symbols such as C++ or $TSLA would be lost as words
+                    symbol_terms[i] = key
+                elif any(t.isdigit() for t in tokens):
+                    symbol_terms[i] = key
+                    self.number_keys.add(key)
+                else:
+                    self.phrases.setdefault(tokens[0], []).append((tokens, i))
+            else:
+                # Terms without any word characters can only match as substrings
+                substring_terms.append(i)
+
+        # The same phrases as token ids, to match shared tweet tokens
+        self.id_phrases = {}
+        self.generation = None
+        if not case_sensitive:
+            self.intern_phrases()
+
+        self.substring_re = None
+        self.substring_terms = {}
+        self.prefix_terms = {}
+        if substring_terms:
+            self.compile_substrings(substring_terms)
+        self.symbol_re = None
+        self.symbol_terms = {}
+        self.symbol_prefixes = {}
+        if symbol_terms:
+            self.compile_symbols(symbol_terms)
+
+    def intern_phrases(self):
+        """
+        Build the phrases as token ids in
+        the vocabulary's current generation
+        """
+        self.generation = vocabulary.generation
+        self.id_phrases = {}
+        for first, candidates in self.phrases.items():
+            self.id_phrases[vocabulary.intern(first)] = [
+                (tuple(map(vocabulary.intern, tokens)), i) for tokens, i in candidates]
+
+    def fold(self, text):
+        """
+        Apply the normalisation and
+        case folding of the view
+        """
+        text = self.normalizer.normalize(text)
+        return text if self.case_sensitive else text.casefold()
+
+    def tokenize(self, text):
+        """
+        Split text into case
+        folded words
+        """
+        return TOKEN_RE.findall(self.fold(text))
+
+    def compile_substrings(self, term_numbers):
+        """
+        Build one regex for the substring
+        terms. A lookahead finds the longest
+        term at every position, and shorter
+        terms sharing that start are added
+        from a prefix table.
+        """
+        folded = {}
+        for i in term_numbers:
+            key = self.fold(str(self.search_terms[i]))
+            if key:
+                folded.setdefault(key, []).append(i)
+
+        keys = sorted(folded, key=len, reverse=True)
+        if not keys:
+            return
+
+        self.substring_terms = folded
+        self.prefix_terms = {
+            k: [p for p in keys if p != k and k.startswith(p)] for k in keys}
+        self.substring_re = re.compile(
+            '(?=(%s))' % '|'.join(re.escape(k) for k in keys))
+
+    def symbol_pattern(self, key):
+        """
+        Return the pattern of a symbol term,
+        on a word boundary wherever it starts
+        or ends with a word character. Words
+        of a phrase with numbers may be split
+        by anything other than word characters.
+        """
+        separator = r'\W+' if key in self.number_keys else r'\s+'
+        pattern = separator.join(re.escape(part) for part in key.split())
+        if re.match(r'\w', key[0]):
+            pattern = r'(?<!\w)' + pattern
+        if re.match(r'\w', key[-1]):
+            pattern += r'(?!\w)'
+        return pattern
+
+    def compile_symbols(self, symbol_terms):
+        """
+        Build one regex for the whole word
+        terms containing symbols or numbers,
+        matched as written. As with substrings
+        the longest term at every position is
+        found, and shorter terms sharing that
+        start are checked from a prefix table.
+        """
+        folded = {}
+        for i, key in sorted(symbol_terms.items()):
+            folded.setdefault(key, []).append(i)
+
+        keys = sorted(folded, key=len, reverse=True)
+        self.symbol_terms = folded
+        self.symbol_prefixes = {}
+        for k in keys:
+            prefixes = [p for p in keys if p != k and k.startswith(p)]
+            if prefixes:
+                self.symbol_prefixes[k] = [
+                    (re.compile(self.symbol_pattern(p)), p) for p in prefixes]
+        self.symbol_re = re.compile(
+            '(?=(%s))' % '|'.join(self.symbol_pattern(k) for k in keys))
+
+    def match(self, text):
+        """
+        Return the search terms found in
+        text, in the configured order
+        """
+        return self.match_folded(self.fold(text))
+
+    def match_tweet(self, tweet):
+        """
+        Return the search terms found in a
+        tweet, using its shared tokens and
+        normalised view
+        """
+        if self.case_sensitive:
+            return self.match_folded(tweet_view(tweet, self.view))
+
+        found = set()
+        if self.phrases:
+            tokens = tweet_tokens(tweet)
+            if self.generation != tokens.generation:
+                self.intern_phrases()
+            self.match_phrases(self.id_phrases, tokens.ids, found)
+        if self.substring_re is not None or self.symbol_re is not None:
+            self.match_substrings(tweet_view(tweet, self.view), found)
+        return [self.search_terms[i] for i in sorted(found)]
+
+    def match_folded(self, text):
+        """
+        Return the search terms found in
+        text already normalised and folded
+        """
+        found = set()
+        if self.phrases:
+            self.match_phrases(self.phrases, TOKEN_RE.findall(text), found)
+        if self.substring_re is not None or self.symbol_re is not None:
+            self.match_substrings(text, found)
+        return [self.search_terms[i] for i in sorted(found)]
+
+    def match_phrases(self, phrases, tokens, found):
+        """
+        Add the number of every phrase in
+        tokens, as strings or ids, to found
+        """
+        for pos, token in enumerate(tokens):
+            candidates = phrases.get(token)
+            if candidates:
+                for phrase, i in candidates:
+                    if len(phrase) == 1 or tuple(tokens[pos:pos + len(phrase)]) == phrase:
+                        found.add(i)
+
+    def match_substrings(self, text, found):
+        """
+        Add the number of every substring
+        and symbol term in text to found
+        """
+        if self.substring_re is not None:
+            for m in self.substring_re.finditer(text):
+                key = m.group(1)
+                found.update(self.substring_terms[key])
+                for prefix in self.prefix_terms[key]:
+                    found.update(self.substring_terms[prefix])
+        if self.symbol_re is not None:
+            for m in self.symbol_re.finditer(text):
+                matched = m.group(1)
+                # Keyed as written, or as words for phrases with numbers
+                for key in (' '.join(matched.split()), ' '.join(TOKEN_RE.findall(matched))):
+                    if key not in self.symbol_terms:
+                        continue
+                    found.update(self.symbol_terms[key])
+                    for prefix_re, prefix in self.symbol_prefixes.get(key, ()):
+                        if prefix_re.match(text, m.start()):
+                            found.update(self.symbol_terms[prefix])
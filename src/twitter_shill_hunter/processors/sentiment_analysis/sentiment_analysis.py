@@ -1,4 +1,89 @@
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import threading
+from .search_term_matcher import SearchTermMatcher
+from .polarity_cache import PolarityCache
+from ...lazy_import import lazy_import
+
+# Imported when the first uncached tweet is scored
+vader = lazy_import('vaderSentiment.vaderSentiment')
+
+# Shared by every SentimentAnalysis instance in the process
+_shared_analyzer = None
+_batch_scorer = None
+_polarity_caches = {}
+_shared_lock = threading.Lock()
+
+BACKENDS = ['vader', 'numpy']
+
+
+def get_analyzer():
+    """
+    Return the process wide VADER analyzer,
+    loading the lexicon on first use
+    """
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        with _shared_lock:
+            if _shared_analyzer is None:
+                _shared_analyzer = vader.SentimentIntensityAnalyzer()
+    return _shared_analyzer
+
+
+def get_batch_scorer():
+    """
+    Return the process wide NumPy scorer,
+    or None if NumPy is not installed
+    """
+    global _batch_scorer
+    if _batch_scorer is None:
+        try:
+            from .batch_scorer import BatchVader
+        except ImportError:
+            return None
+        analyzer = get_analyzer()
+        with _shared_lock:
+            if _batch_scorer is None:
+                _batch_scorer = BatchVader(analyzer)
+    return _batch_scorer
+
+
+def get_scorer(backend='vader'):
+    """
+    Return the backend name and a function
+    scoring a list of texts. The numpy
+    backend falls back to vaderSentiment
+    when NumPy is missing.
+    """
+    if backend not in BACKENDS:
+        raise ValueError("Unknown sentiment backend %r, expected one of: %s"
+                         % (backend, ', '.join(BACKENDS)))
+
+    if backend == 'numpy':
+        scorer = get_batch_scorer()
+        if scorer is not None:
+            return backend, scorer.score_batch
+        print("NumPy is not installed, using the vader sentiment backend")
+
+    def score_batch(texts):
+        # The lexicon is only loaded once a score is missing from the cache
+        sia = get_analyzer()
+        return [sia.polarity_scores(t) for t in texts]
+    return 'vader', score_batch
+
+
+def get_polarity_cache(maxsize=100000, path=None, backend='vader'):
+    """
+    Return the process wide polarity
+    cache for the given settings
+    """
+    key = (maxsize, path, backend)
+    with _shared_lock:
+        if key not in _polarity_caches:
+            # Reference scores keep the namespace they always had
+            namespace = '' if backend == 'vader' else backend
+            _polarity_caches[key] = PolarityCache(
+                maxsize=maxsize, path=path, namespace=namespace)
+        return _polarity_caches[key]
+
 
 class SentimentAnalysis():
     """
@@ -6,59 +91,121 @@ class SentimentAnalysis():
     from tweets based upon a 
     list of provided keywords
     """
+
+    # CPU bound, run in a worker process when execution is process
+    execution = 'process'
+    context_fields = ('search_terms', 'search_options', 'sentiment_options')
     
     def __init__(self):
-        self.aggregated_results = []
-
+        # search term -> [compound total, matching tweets]
+        self.term_totals = {}
+        self.tweets_matched = 0
+        self.search_terms = []
+        self.polarity_cache = None
+        self.matcher = None
+        self.matcher_key = None
+
+    def reset(self):
+        """
+        Clear results before the
+        next target
+        """
+        self.term_totals = {}
+        self.tweets_matched = 0
 
-    def process_data(self, tweets_and_date, search_terms):
+    def get_matcher(self, search_terms, search_options):
+        """
+        Compile the search terms once,
+        reusing the matcher while the
+        terms and options are unchanged
+        """
+        options = search_options or {}
+        case_sensitive = bool(options.get('case_sensitive', False))
+        whole_word = bool(options.get('whole_word', True))
+        key = (tuple(search_terms), case_sensitive, whole_word)
+        if self.matcher is None or self.matcher_key != key:
+            self.matcher = SearchTermMatcher(
+                search_terms, case_sensitive=case_sensitive, whole_word=whole_word)
+            self.matcher_key = key
+        return self.matcher
+
+    def process_data(self, tweets_and_date, search_terms, search_options=None,
+                     sentiment_options=None):
         """
         Data processing function
         """
 
-        sia = SentimentIntensityAnalyzer()
-
-        for tweet in tweets_and_date:
-            words_found = []
-            for st in search_terms:
-                if st in tweet['text']:
-                    words_found.append(st) 
-
+        options = sentiment_options or {}
+        backend, score_batch = get_scorer(options.get('backend', 'vader'))
+        cache = get_polarity_cache(
+            maxsize=options.get('cache_size', 100000),
+            path=options.get('cache_path'),
+            backend=backend)
+        self.polarity_cache = cache
+        matcher = self.get_matcher(search_terms, search_options)
+
+        matches = [matcher.match_tweet(tweet) for tweet in tweets_and_date]
+
+        # Score every matching tweet of the page in one batch.
+        # Retweets and copypasta are only scored once.
+        matched_texts = [tweet['text'] for tweet, words_found
+                         in zip(tweets_and_date, matches) if words_found]
+        scores = iter(cache.get_many(matched_texts, score_batch))
+
+        results = []
+        for tweet, words_found in zip(tweets_and_date, matches):
             if len(words_found) > 0:
-
                 result = {}
-                search_terms_found = []
-
-                print("The following search terms were found:")
-
+                result['date'] = tweet['date']
+                result['id'] = tweet.get('id')
+                result['tweet'] = tweet['text']
+                result['search_terms'] = list(words_found)
+                result.update(next(scores))
+                results.append(result)
+                # Only running totals are kept for the summary
                 for w in words_found:
-                     print(w)
-                     search_terms_found.append(w)
+                    totals = self.term_totals.setdefault(w, [0, 0])
+                    totals[0] += result['compound']
+                    totals[1] += 1
 
+        self.tweets_matched += len(results)
+        self.search_terms = search_terms
+        return results
 
-                print(tweet['date'])
-                print(tweet['text']) 
-                
-                result['date'] =  tweet['date']
-                result['tweet'] = tweet['text']
-                result['search_terms'] = search_terms_found 
-                  
-                sps = sia.polarity_scores(tweet['text'])
-                for k in sps:
-                    print("%s value is: %s" % (k,sps[k]))
-                    result[k] = sps[k]
-                
-                print("-------------------------")
-                self.aggregated_results.append(result)
-            else:
-                print("No search terms found in tweet on:")
-
-                print(tweet['date'])
+    def summary(self):
+        """
+        Return the aggregated sentiment of
+        the target's tweets. The tweets
+        themselves were returned page by
+        page, so only their number is kept.
+        """
+        return self.aggregate_search_results(self.search_terms)
 
-                print("-------------------------")          
+    def cache_stats(self):
+        """
+        Return polarity cache hit
+        and miss counters
+        """
+        if self.polarity_cache is None:
+            return {'hits': 0, 'misses': 0, 'size': 0}
+        return self.polarity_cache.stats()
 
-        self.aggregate_search_results(search_terms)
+    def counters(self):
+        """
+        Return counters for
+        the run's metrics
+        """
+        stats = self.cache_stats()
+        return {'polarity_cache_hits': stats['hits'],
+                'polarity_cache_misses': stats['misses']}
 
+    def close(self):
+        """
+        Write any pending cached
+        scores to disk
+        """
+        if self.polarity_cache is not None:
+            self.polarity_cache.flush()
 
     def aggregate_search_results(self, search_terms):
         """
@@ -71,27 +218,21 @@ class SentimentAnalysis():
         total_count = 0
 
         for st in search_terms:
-            counter = 0 
             compound_result[st] = 0
-            for r in self.aggregated_results:
-                for w in r['search_terms']:
-                    if w == st:
-                        compound_result[st] += r['compound']
-                        counter += 1
-                    
+            total, counter = self.term_totals.get(st, (0, 0))
             if counter > 0:
-                compound_result[st] = compound_result[st] / counter
+                compound_result[st] = total / counter
                 total_compound_val += compound_result[st]
                 total_count += 1
 
         # Calculate overall average compound value
         agg_compound_val = total_compound_val / total_count if total_count > 0 else 0
 
-        print("Aggregated average compound value for search terms")
-        print(agg_compound_val)
-        combined_results['tweets_analyzed'] = self.aggregated_results
+        combined_results['tweets_analyzed'] = self.tweets_matched
         combined_results['compound_search_results'] = agg_compound_val 
-        return compound_result 
+        combined_results['search_term_compound'] = compound_result
+        combined_results['polarity_cache'] = self.cache_stats()
+        return combined_results
          
  
 
@@ -0,0 +1,203 @@
+import bisect
+import collections
+import re
+import threading
+
+# Tweets are checked as paragraphs of one document
+SEPARATOR = "\n\n"
+
+# Characters of text LanguageTool shows either side of a match
+CONTEXT_SIZE = 40
+
+# Rules that look at the whole document rather than one paragraph.
+# Tweets they fire on are checked again on their own.
+TEXT_LEVEL_RULES = frozenset([
+    'EN_UNPAIRED_BRACKETS',
+    'EN_UNPAIRED_QUOTES',
+    'UNPAIRED_BRACKETS',
+    'ENGLISH_WORD_REPEAT_BEGINNING_RULE',
+    'WORD_REPEAT_BEGINNING_RULE',
+    'PARAGRAPH_REPEAT_BEGINNING_RULE',
+    'EN_REPEATEDWORDS',
+    'STYLE_REPEATED_WORD_RULE',
+    'READABILITY_RULE_SIMPLE',
+    'READABILITY_RULE_DIFFICULT',
+])
+
+
+# Brackets and quotes can be paired across tweets, hiding
+# unpaired ones, so tweets containing them are checked alone.
+# Apostrophes within words are left to batching.
+PAIRED_RE = re.compile(r"""[()\[\]{}"]|(?<![A-Za-z])'|'(?![A-Za-z])""")
+
+
+def match_field(match, name, old_name):
+    """
+    Read a match attribute under the camel
+    case name language_tool_python 2 used,
+    or its snake case name in release 3
+    """
+    value = getattr(match, old_name, None)
+    if value is None:
+        value = getattr(match, name, None)
+    return value
+
+
+def match_context(text, offset, length, size=CONTEXT_SIZE):
+    """
+    Build the context LanguageTool reports
+    for a match, returning the context and
+    the match offset within it
+    """
+    text = text.replace('\n', ' ')
+    start = offset - size
+    prefix = '...'
+    if start < 0:
+        prefix = ''
+        start = 0
+    end = offset + length + size
+    postfix = '...'
+    if end > len(text):
+        postfix = ''
+        end = len(text)
+    return prefix + text[start:end] + postfix, len(prefix) + offset - start
+
+
+class BatchChecker():
+    """
+    Class to check many tweets with few
+    LanguageTool requests. Tweets are joined
+    as paragraphs of one document and every
+    match is moved back onto its own tweet,
+    with offsets and context as if the tweet
+    had been checked alone. Given an executor,
+    requests are spread over the scanners
+    concurrently, with at most max_in_flight
+    outstanding.
+    """
+
+    def __init__(self, scanners, batch_size=50, text_level_rules=TEXT_LEVEL_RULES,
+                 executor=None, max_in_flight=None):
+        if not isinstance(scanners, (list, tuple)):
+            scanners = [scanners]
+        self.scanners = list(scanners)
+        self.scanner = self.scanners[0]
+        self.batch_size = max(1, int(batch_size))
+        self.text_level_rules = frozenset(text_level_rules)
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rechecked = 0
+
+    def check(self, texts):
+        """
+        Return the list of matches
+        for each of texts
+        """
+        jobs = []
+        batched = []
+        for n, text in enumerate(texts):
+            if self.batch_size > 1 and PAIRED_RE.search(text):
+                jobs.append([n])
+            else:
+                batched.append(n)
+        for i in range(0, len(batched), self.batch_size):
+            jobs.append(batched[i:i + self.batch_size])
+        # Send requests in tweet order
+        jobs.sort()
+
+        results = [None] * len(texts)
+        for positions, matches in self.run(jobs, texts):
+            for n, tweet_matches in zip(positions, matches):
+                results[n] = tweet_matches
+        return results
+
+    def run(self, jobs, texts):
+        """
+        Check each job, a list of tweet
+        positions, and yield the positions
+        with their matches in job order
+        """
+        def job_texts(positions):
+            return [texts[n] for n in positions]
+
+        if self.executor is None or len(jobs) < 2:
+            for j, positions in enumerate(jobs):
+                scanner = self.scanners[j % len(self.scanners)]
+                yield positions, self.check_batch(job_texts(positions), scanner)
+            return
+
+        limit = self.max_in_flight or len(jobs)
+        in_flight = collections.deque()
+        try:
+            for j, positions in enumerate(jobs):
+                if len(in_flight) >= limit:
+                    done, future = in_flight.popleft()
+                    yield done, future.result()
+                scanner = self.scanners[j % len(self.scanners)]
+                in_flight.append((positions, self.executor.submit(
+                    self.check_batch, job_texts(positions), scanner)))
+            while in_flight:
+                done, future = in_flight.popleft()
+                yield done, future.result()
+        finally:
+            for done, future in in_flight:
+                future.cancel()
+
+    def check_single(self, text, scanner=None):
+        """
+        Check one text on its own
+        """
+        with self.lock:
+            self.requests += 1
+        return list((scanner or self.scanner).check(text))
+
+    def check_batch(self, texts, scanner=None):
+        """
+        Check texts in one request and
+        split the matches between them
+        """
+        scanner = scanner or self.scanner
+        if len(texts) == 1:
+            return [self.check_single(texts[0], scanner)]
+
+        starts = []
+        position = 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + len(SEPARATOR)
+
+        with self.lock:
+            self.requests += 1
+        matches = scanner.check(SEPARATOR.join(texts))
+
+        results = [[] for text in texts]
+        recheck = set()
+        for match in matches:
+            length = match_field(match, 'error_length', 'errorLength')
+            first = bisect.bisect_right(starts, match.offset) - 1
+            last = bisect.bisect_right(starts, match.offset + max(length, 1) - 1) - 1
+            local_offset = match.offset - starts[first]
+
+            if first != last or local_offset + length > len(texts[first]):
+                # Spans a separator. Matches only on the separator are dropped.
+                if local_offset < len(texts[first]) or first != last:
+                    recheck.update(range(first, last + 1))
+                continue
+            if match_field(match, 'rule_id', 'ruleId') in self.text_level_rules:
+                recheck.add(first)
+                continue
+
+            context, offset_in_context = match_context(texts[first], local_offset, length)
+            match.offset = local_offset
+            match.context = context
+            match.offset_in_context = offset_in_context
+            match.offsetInContext = offset_in_context
+            results[first].append(match)
+
+        for n in sorted(recheck):
+            with self.lock:
+                self.rechecked += 1
+            results[n] = self.check_single(texts[n], scanner)
+        return results
@@ -0,0 +1,208 @@
+import atexit
+import concurrent.futures
+import threading
+import time
+from ...lazy_import import lazy_import
+
+# Imported when the first server starts
+language_tool_python = lazy_import('language_tool_python')
+
+# One pool per set of options, shared by every SpellingAnalysis instance
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(idle_timeout=600, server=None):
+    """
+    Return the process wide pool
+    for the given settings
+    """
+    key = (idle_timeout, server)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = LanguageToolPool(idle_timeout=idle_timeout, server=server)
+        return _pools[key]
+
+
+def shutdown_pools():
+    """
+    Stop every LanguageTool server
+    started by this process
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+atexit.register(shutdown_pools)
+
+
+class LanguageToolPool():
+    """
+    Class to keep LanguageTool servers
+    running between targets. There are one
+    or more servers per language, started in
+    the background on first use or warm up,
+    shared by every caller and shut down
+    once it has been idle for idle_timeout
+    seconds. With server set, the pool
+    connects to an already running
+    LanguageTool server instead of
+    starting its own.
+    """
+
+    def __init__(self, idle_timeout=600, server=None):
+        self.idle_timeout = idle_timeout
+        self.server = server
+        self.lock = threading.Lock()
+        self.tools = {}
+        self.leases = {}
+        self.last_used = {}
+        self.stopped = threading.Event()
+        self.reaper = None
+
+    def start(self, language, count=1):
+        """
+        Start servers for the language in the
+        background until count are running or
+        starting, and return the futures
+        holding them
+        """
+        with self.lock:
+            futures = self.tools.setdefault(language, [])
+            while len(futures) < count:
+                future = concurrent.futures.Future()
+                futures.append(future)
+                threading.Thread(
+                    target=self.create, args=(language, future),
+                    name='languagetool-%s-%d' % (language, len(futures)),
+                    daemon=True).start()
+            self.leases.setdefault(language, 0)
+            self.last_used[language] = time.monotonic()
+            self.start_reaper()
+            return futures[:count]
+
+    def create(self, language, future):
+        """
+        Start the LanguageTool server
+        and hand it to the future
+        """
+        try:
+            if self.server:
+                tool = language_tool_python.LanguageTool(language, remote_server=self.server)
+            else:
+                tool = language_tool_python.LanguageTool(language)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(tool)
+
+    def warm_up(self, languages, count=1):
+        """
+        Start servers for the languages
+        without waiting for them
+        """
+        for language in languages:
+            self.start(language, count)
+
+    def acquire(self, language):
+        """
+        Return the server for the language,
+        waiting for it to start. Callers
+        release it when they are done.
+        """
+        return self.acquire_many(language, 1)[0]
+
+    def acquire_many(self, language, count):
+        """
+        Return count servers for the
+        language, to share checks between
+        """
+        futures = self.start(language, count)
+        try:
+            tools = [future.result() for future in futures]
+        except Exception:
+            # Let the next caller try again
+            with self.lock:
+                running = self.tools.get(language, [])
+                self.tools[language] = [f for f in running if not (
+                    f.done() and f.exception() is not None)]
+                if not self.tools[language]:
+                    del self.tools[language]
+            raise
+
+        with self.lock:
+            self.leases[language] = self.leases.get(language, 0) + 1
+            self.last_used[language] = time.monotonic()
+        return tools
+
+    def release(self, language):
+        """
+        Hand back the servers taken with
+        acquire or acquire_many
+        """
+        with self.lock:
+            if self.leases.get(language):
+                self.leases[language] -= 1
+            self.last_used[language] = time.monotonic()
+
+    def reap(self, now=None):
+        """
+        Shut down servers nobody holds that
+        have been idle for longer than the
+        timeout, returning their languages
+        """
+        now = time.monotonic() if now is None else now
+        idle = []
+        with self.lock:
+            for language, futures in list(self.tools.items()):
+                if (all(f.done() for f in futures) and not self.leases.get(language) and
+                        now - self.last_used[language] > self.idle_timeout):
+                    idle.append((language, self.tools.pop(language)))
+
+        for language, futures in idle:
+            for future in futures:
+                self.close_tool(future)
+        return [language for language, futures in idle]
+
+    def start_reaper(self):
+        """
+        Start the thread that shuts down
+        idle servers. The lock must be held.
+        """
+        if self.reaper is None and self.idle_timeout:
+            interval = max(1, min(60, self.idle_timeout / 2.0))
+            self.reaper = threading.Thread(
+                target=self.run_reaper, args=(interval,),
+                name='languagetool-reaper', daemon=True)
+            self.reaper.start()
+
+    def run_reaper(self, interval):
+        while not self.stopped.wait(interval):
+            self.reap()
+
+    def close_tool(self, future):
+        """
+        Close a server, ignoring ones
+        that failed to start
+        """
+        try:
+            if future.exception() is None:
+                future.result().close()
+        except Exception:
+            pass  # Ignore errors during cleanup
+
+    def shutdown(self):
+        """
+        Stop the reaper and close
+        every server
+        """
+        self.stopped.set()
+        with self.lock:
+            futures = [f for running in self.tools.values() for f in running]
+            self.tools.clear()
+            self.leases.clear()
+        for future in futures:
+            self.close_tool(future)
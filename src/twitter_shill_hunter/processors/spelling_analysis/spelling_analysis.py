@@ -1,5 +1,20 @@
+import concurrent.futures
+import os
 import sys
-import language_tool_python
+from .language_tool_pool import get_pool
+from .batch_checker import BatchChecker, match_field
+from .spelling_index import start_index
+from ...text_normalizer import fold_ascii, tweet_view
+from ...lazy_import import lazy_import
+
+# Not needed in spelling mode
+language_tool_python = lazy_import('language_tool_python')
+
+# Checks made by the plugin: LanguageTool's grammar and spelling
+# rules, or only unknown words looked up in a frequency dictionary
+GRAMMAR = 'grammar'
+SPELLING = 'spelling'
+MODES = [GRAMMAR, SPELLING]
 
 # Note: This module uses the 'language-tool-python' package for real grammar and 
 # spelling analysis, replacing the previous stub implementation.
@@ -9,59 +24,210 @@ class SpellingAnalysis():
     Class to highlight
     spelling issues 
     """
+
+    # Waits on the LanguageTool server, run in a thread
+    execution = 'thread'
+    context_fields = ('dialect', 'spelling_options')
     
-    def process_data(self, tweets_and_date, dialect):
+    def __init__(self):
+        self.scanner = None
+        self.scanners = None
+        self.scanner_dialect = None
+        self.pool = None
+        self.executor = None
+        self.tweets_checked = 0
+        self.tweets_with_issues = 0
+        self.rule_counts = {}
+
+    def reset(self):
         """
-        Data processing function
+        Clear issue counts before
+        the next target
         """
+        self.tweets_checked = 0
+        self.tweets_with_issues = 0
+        self.rule_counts = {}
 
-        try:
-            scanner = language_tool_python.LanguageTool(dialect)
+    def get_pool(self, spelling_options=None):
+        """
+        Return the shared LanguageTool
+        server pool for the options
+        """
+        options = spelling_options or {}
+        return get_pool(
+            idle_timeout=options.get('idle_timeout', 600),
+            server=options.get('server'))
+
+    def get_mode(self, spelling_options=None):
+        """
+        Return the checks asked for
+        in the options
+        """
+        mode = (spelling_options or {}).get('mode', GRAMMAR)
+        if mode not in MODES:
+            raise ValueError("spelling mode must be one of %s, not '%s'" % (
+                ', '.join(MODES), mode))
+        return mode
+
+    def start_index(self, dialect, spelling_options=None):
+        """
+        Start building the spelling index
+        for the dialect, returning its future
+        """
+        options = spelling_options or {}
+        return start_index(
+            dialect, max_distance=int(options.get('max_distance', 2)),
+            dictionary=options.get('dictionary'))
+
+    def warm_up(self, dialect, spelling_options=None):
+        """
+        Start the LanguageTool server, or build
+        the spelling index, for the dialect in
+        the background so it is ready by the
+        first page
+        """
+        options = spelling_options or {}
+        if self.get_mode(options) == SPELLING:
+            try:
+                self.start_index(dialect, options)
+                return
+            except ValueError:
+                pass  # Checked with LanguageTool instead
+        self.get_pool(options).warm_up([dialect], options.get('servers', 1))
+
+    def get_scanners(self, dialect, spelling_options=None):
+        """
+        Return the LanguageTool servers for the
+        dialect from the pool, keeping them for
+        every page until closed
+        """
+        if self.scanner is None or self.scanner_dialect != dialect:
+            self.close()
+            options = spelling_options or {}
+            pool = self.get_pool(options)
+            self.scanners = pool.acquire_many(dialect, max(1, int(options.get('servers', 1))))
+            self.scanner = self.scanners[0]
+            self.pool = pool
+            self.scanner_dialect = dialect
             print("Chosen language/dialect: " + str(dialect))
+        return self.scanners
+
+    def get_executor(self, workers):
+        """
+        Return the thread pool requests are
+        sent from, or None to send them one
+        at a time
+        """
+        if workers < 2:
+            return None
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix='spelling')
+        return self.executor
+
+    def process_data(self, tweets_and_date, dialect, spelling_options=None):
+        """
+        Data processing function, returning
+        the issues found in each tweet
+        """
+
+        options = spelling_options or {}
+        if self.get_mode(options) == SPELLING:
+            try:
+                index = self.start_index(dialect, options).result()
+            except Exception as e:
+                print(f"Warning: Could not load a spelling dictionary for '{dialect}': {e}")
+                print("Falling back to LanguageTool spelling checking.")
+            else:
+                return self.tweet_records(
+                    tweets_and_date, [index.check_tweet(tweet) for tweet in tweets_and_date])
+
+        try:
+            scanners = self.get_scanners(dialect, spelling_options)
         except Exception as e:
             print(f"Warning: Could not initialize LanguageTool for dialect '{dialect}': {e}")
             print("Falling back to no grammar/spelling checking for this session.")
-            # Process tweets without grammar checking
-            for tweet in tweets_and_date:
-                pass  # Just iterate through without analysis
-            return
+            return []
 
-        try:
-            for tweet in tweets_and_date:
-                # Handle Unicode text properly for Python 3
-                tweet_text = tweet['text']
-                if isinstance(tweet_text, str):
-                    # Remove non-ASCII characters safely
-                    tweet_text = ''.join(char for char in tweet_text if ord(char) < 128)
-                
-                matches = scanner.check(tweet_text)
-                 
-                for i,k in enumerate(matches):
-                    print("----------------")
-                    print("Context: ") 
-                    # Handle context encoding safely
-                    context = matches[i].context
-                    if isinstance(context, str):
-                        context = ''.join(char for char in context if ord(char) < 128)
-                    print(context)
-
-                    print("Rule Id:" + str(matches[i].ruleId))
-                    print("Category: " + matches[i].category)
-                    print("Based upon language/grammar user may have meant: ")
-                    did_you_mean = ""
-                    if matches[i].replacements:
-                        for m in matches[i].replacements:
-
-                            # Handle replacement text safely
-                            replacement = m
-                            if isinstance(replacement, str):
-                                replacement = ''.join(char for char in replacement if ord(char) < 128)
-                            did_you_mean = did_you_mean + replacement + ' ,'
-                    print(did_you_mean)
-        finally:
-            # Always close the LanguageTool instance to clean up resources
-            try:
-                scanner.close()
-            except:
-                pass  # Ignore errors during cleanup
+        # LanguageTool is sent the ASCII folded text
+        tweet_texts = [tweet_view(tweet, 'ascii') for tweet in tweets_and_date]
+
+        # Tweets are checked a batch at a time, with matches
+        # mapped back onto the tweet they were found in. Batches
+        # are sent concurrently across the servers and returned in
+        # tweet order. The texts are ASCII only, so the offsets
+        # Match shares between instances for wide characters
+        # never change under concurrent checks.
+        workers = int(options.get('workers', os.cpu_count() or 1))
+        checker = BatchChecker(
+            scanners, batch_size=options.get('batch_size', 50),
+            executor=self.get_executor(workers), max_in_flight=2 * workers)
+
+        return self.tweet_records(tweets_and_date, checker.check(tweet_texts))
 
+    def tweet_records(self, tweets_and_date, tweet_matches):
+        """
+        Return a record for each tweet with
+        issues and count them for the summary
+        """
+        records = []
+        rule_counts = self.rule_counts
+        for tweet, matches in zip(tweets_and_date, tweet_matches):
+            self.tweets_checked += 1
+            if not matches:
+                continue
+            issues = self.match_records(matches)
+            for issue in issues:
+                rule_counts[issue['rule_id']] = rule_counts.get(issue['rule_id'], 0) + 1
+            self.tweets_with_issues += 1
+            records.append({'date': tweet['date'], 'id': tweet.get('id'), 'matches': issues})
+        return records
+
+    def match_records(self, matches):
+        """
+        Return the matches found in a
+        tweet as plain dicts
+        """
+        issues = []
+        for match in matches:
+            # Handle context and replacement encoding safely
+            context = match.context
+            if isinstance(context, str):
+                context = fold_ascii(context)
+            issues.append({
+                'rule_id': str(match_field(match, 'rule_id', 'ruleId')),
+                'category': match.category,
+                'context': context,
+                'replacements': [fold_ascii(r) if isinstance(r, str) else r
+                                 for r in (match.replacements or [])],
+            })
+        return issues
+
+    def summary(self):
+        """
+        Return the number of tweets checked
+        and the issues found by rule
+        """
+        return {
+            'tweets_checked': self.tweets_checked,
+            'tweets_with_issues': self.tweets_with_issues,
+            'issues': sum(self.rule_counts.values()),
+            'rules': dict(sorted(self.rule_counts.items(),
+                                 key=lambda item: item[1], reverse=True)),
+        }
+
+    def close(self):
+        """
+        Hand the LanguageTool servers back to
+        the pool, which keeps them running for
+        later targets until they are idle
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        if self.scanner is not None:
+            self.pool.release(self.scanner_dialect)
+            self.scanner = None
+            self.scanners = None
+            self.scanner_dialect = None
+            self.pool = None
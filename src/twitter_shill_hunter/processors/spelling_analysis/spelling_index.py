@@ -0,0 +1,411 @@
+import concurrent.futures
+import os
+import re
+import threading
+from .batch_checker import match_context
+from ...input import ProcessInputYaml
+from ...package_data import resource_path
+from ...text_normalizer import tweet_view
+from ...tokenizer import tweet_tokens, vocabulary
+from ...lazy_import import lazy_import
+
+# Only imported in spelling mode
+spellchecker = lazy_import('spellchecker')
+
+# Rule id and category reported for unknown words
+RULE_ID = 'UNKNOWN_WORD'
+CATEGORY = 'TYPOS'
+
+# Words of letters, with apostrophes inside them
+WORD_RE = re.compile(r"(?<![\w@#'])[^\W\d_]+(?:'[^\W\d_]+)*(?![\w@#])")
+
+# Links are never spell checked
+URL_RE = re.compile(r"(?:https?://|www\.)\S+")
+
+# Suggestions kept per word between tweets
+MEMO_SIZE = 100000
+
+# Dialect each pyspellchecker dictionary is written in,
+# other dialects of these languages need a shipped word list
+DICTIONARY_DIALECTS = {'en': 'en-US'}
+
+# Names of the shipped word lists for each dialect
+DIALECT_WORD_LISTS = {'en-gb': 'en-UK', 'en-uk': 'en-UK', 'en-us': 'en-US'}
+
+# One index per dictionary, shared by every SpellingAnalysis instance
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def index_language(dialect):
+    """
+    Return the pyspellchecker language
+    for a dialect such as en-GB, or None
+    when it has no dictionary
+    """
+    language = str(dialect).split('-')[0].lower()
+    return language if language in spellchecker.SpellChecker.languages() else None
+
+
+def dialect_word_list(dialect):
+    """
+    Return the name of the shipped word list
+    to add to the dictionary for a regional
+    dialect such as en-GB, or None when the
+    dictionary is already written in it
+    """
+    language, _, region = str(dialect).partition('-')
+    own = DICTIONARY_DIALECTS.get(language.lower())
+    if not region or own is None:
+        return None
+    name = DIALECT_WORD_LISTS.get(str(dialect).lower())
+    if name is None:
+        raise ValueError(
+            "No spelling word list for dialect '%s', configure a spelling "
+            "dictionary for it" % dialect)
+    return None if name == own else name
+
+
+def dialect_words(language, name):
+    """
+    Return (word, spelling) pairs of the shipped
+    word list and the same words as spelt in
+    the dialect of the language's dictionary
+    """
+    mappings = resource_path('twitter_shill_hunter.processors.grammar_analysis',
+                             'dialect_mappings', language)
+    reader = ProcessInputYaml()
+    words = reader.yaml_processor('/'.join((mappings, name + '.yaml')))['words']
+    spellings_path = '/'.join((mappings, DICTIONARY_DIALECTS[language] + '.yaml'))
+    if not os.path.exists(spellings_path):
+        return [(word, word) for word in words]
+    return list(zip(words, reader.yaml_processor(spellings_path)['words']))
+
+
+def add_dialect_words(frequencies, language, name):
+    """
+    Add the words of the shipped dialect word
+    list to the frequencies, each as common
+    as the dictionary's own spelling of it
+    """
+    for word, spelling in dialect_words(language, name):
+        if word not in frequencies:
+            frequencies[word] = frequencies.get(spelling, 1)
+    return frequencies
+
+
+def start_index(dialect, max_distance=2, dictionary=None):
+    """
+    Build the index for the dialect, or the
+    dictionary file if given, in the background
+    and return the future holding it
+    """
+    language = word_list = None
+    if dictionary is None:
+        language = index_language(dialect)
+        if language is None:
+            raise ValueError("No spelling dictionary for language '%s'" % dialect)
+        word_list = dialect_word_list(dialect)
+
+    key = (language, dictionary, max_distance, word_list)
+    with _indexes_lock:
+        if key not in _indexes:
+            future = concurrent.futures.Future()
+            _indexes[key] = future
+            threading.Thread(
+                target=build_index, args=(key, future),
+                name='spelling-index-%s' % (language or 'custom'),
+                daemon=True).start()
+        return _indexes[key]
+
+
+def get_index(dialect, max_distance=2, dictionary=None):
+    """
+    Return the shared index for the
+    dialect, waiting for it to be built
+    """
+    return start_index(dialect, max_distance, dictionary).result()
+
+
+def build_index(key, future):
+    """
+    Load the frequency dictionary and hand
+    the index built from it to the future
+    """
+    language, dictionary, max_distance, word_list = key
+    try:
+        if dictionary is not None:
+            checker = spellchecker.SpellChecker(language=None, local_dictionary=dictionary)
+        else:
+            checker = spellchecker.SpellChecker(language=language)
+        frequencies = checker.word_frequency.dictionary
+        if word_list is not None:
+            add_dialect_words(frequencies, language, word_list)
+        index = SpellingIndex(frequencies, max_distance=max_distance)
+    except Exception as e:
+        # Let the next caller try again
+        with _indexes_lock:
+            _indexes.pop(key, None)
+        future.set_exception(e)
+    else:
+        future.set_result(index)
+
+
+def edit_distance(source, target, limit):
+    """
+    Return the Damerau-Levenshtein
+    distance between two words, or limit + 1
+    once it is known to exceed limit
+    """
+    if abs(len(source) - len(target)) > limit:
+        return limit + 1
+    # Only the differing middle of the words needs comparing
+    start = 0
+    while start < len(source) and start < len(target) and source[start] == target[start]:
+        start += 1
+    end = 0
+    while (end < len(source) - start and end < len(target) - start and
+           source[-1 - end] == target[-1 - end]):
+        end += 1
+    source = source[start:len(source) - end]
+    target = target[start:len(target) - end]
+    if not source or not target:
+        return len(source) + len(target)
+
+    # Lowrance and Wagner's algorithm, so letters may be
+    # transposed with others inserted or deleted between them
+    # as pyspellchecker's repeated edits allow
+    infinity = len(source) + len(target)
+    rows = [[infinity] * (len(target) + 2)]
+    rows.append([infinity] + list(range(len(target) + 1)))
+    last_row = {}
+    for i in range(1, len(source) + 1):
+        row = [infinity, i] + [0] * len(target)
+        previous = rows[i]
+        last_column = 0
+        for j in range(1, len(target) + 1):
+            k = last_row.get(target[j - 1], 0)
+            l = last_column
+            if source[i - 1] == target[j - 1]:
+                cost = 0
+                last_column = j
+            else:
+                cost = 1
+            row[j + 1] = min(previous[j] + cost, row[j] + 1, previous[j + 1] + 1,
+                             rows[k][l] + (i - k - 1) + 1 + (j - l - 1))
+        if min(row[1:]) > limit:
+            return limit + 1
+        rows.append(row)
+        last_row[source[i - 1]] = i
+    return rows[-1][-1]
+
+
+class SpellingMatch():
+    """
+    Class to describe an unknown word
+    with the fields of a LanguageTool
+    match that get printed
+    """
+
+    rule_id = RULE_ID
+    category = CATEGORY
+    message = 'Possible spelling mistake found.'
+
+    def __init__(self, text, offset, length, replacements):
+        self.offset = offset
+        self.error_length = length
+        self.replacements = replacements
+        self.context, self.offset_in_context = match_context(text, offset, length)
+
+    def __repr__(self):
+        return 'SpellingMatch(%r, offset=%d, replacements=%r)' % (
+            self.context[self.offset_in_context:self.offset_in_context + self.error_length],
+            self.offset, self.replacements)
+
+
+class SpellingIndex():
+    """
+    Class to find unknown words and suggest
+    corrections using a symmetric delete
+    index. Every word in the dictionary is
+    stored under the strings left by deleting
+    up to max_distance letters from its first
+    prefix_length letters, so candidates for a
+    word are found by deleting letters from
+    it, without generating every possible
+    edit as pyspellchecker does.
+    """
+
+    def __init__(self, frequencies, max_distance=2, prefix_length=7, max_suggestions=5):
+        self.frequencies = frequencies
+        self.max_distance = max_distance
+        self.prefix_length = max(prefix_length, max_distance + 1)
+        self.max_suggestions = max_suggestions
+        self.deletes = {}
+        self.memo = {}
+        self.id_memo = {}
+        self.generation = vocabulary.generation
+        for word in frequencies:
+            self.add(word)
+
+    def delete_variants(self, word):
+        """
+        Return the word's prefix with up to
+        max_distance letters deleted
+        """
+        variants = set()
+        for edits in self.delete_levels(word):
+            variants |= edits
+        return variants
+
+    def delete_levels(self, word):
+        """
+        Yield the word's prefix, then its
+        variants with one letter deleted, two
+        letters and so on to max_distance
+        """
+        edits = {word[:self.prefix_length]}
+        yield edits
+        for _ in range(self.max_distance):
+            edits = {edit[:i] + edit[i + 1:] for edit in edits for i in range(len(edit))}
+            yield edits
+
+    def add(self, word):
+        """
+        Add a dictionary word to the index
+        """
+        deletes = self.deletes
+        for variant in self.delete_variants(word):
+            entry = deletes.get(variant)
+            if entry is None:
+                # Most variants belong to one word, kept without a list
+                deletes[variant] = word
+            elif entry.__class__ is str:
+                deletes[variant] = [entry, word]
+            else:
+                entry.append(word)
+
+    def known(self, word):
+        """
+        Return True if the word, or the word
+        without a possessive 's, is known
+        """
+        word = word.lower()
+        if word in self.frequencies:
+            return True
+        return word.endswith("'s") and word[:-2] in self.frequencies
+
+    def suggestions(self, word):
+        """
+        Return the closest dictionary words,
+        most frequent first
+        """
+        word = word.lower()
+        best = self.max_distance
+        found = {}
+        seen = set()
+        for level, variants in enumerate(self.delete_levels(word)):
+            # Words first reached after deleting more letters
+            # than the closest found so far are further away
+            if found and level > best:
+                break
+            for variant in variants:
+                entry = self.deletes.get(variant)
+                if entry is None:
+                    continue
+                for candidate in ([entry] if entry.__class__ is str else entry):
+                    if candidate in seen:
+                        continue
+                    seen.add(candidate)
+                    distance = edit_distance(word, candidate, best)
+                    if distance < best:
+                        best = distance
+                        found = {}
+                    if distance == best:
+                        found[candidate] = self.frequencies[candidate]
+
+        ranked = sorted(found, key=lambda candidate: (-found[candidate], candidate))
+        return ranked[:self.max_suggestions]
+
+    def lookup(self, word):
+        """
+        Return None for a known word, or the
+        suggestions for an unknown one
+        """
+        key = word.lower()
+        if key in self.memo:
+            return self.memo[key]
+        result = None if self.known(key) else self.suggestions(key)
+        if len(self.memo) >= MEMO_SIZE:
+            self.memo.clear()
+        self.memo[key] = result
+        return result
+
+    def lookup_id(self, token_id):
+        """
+        Return None for a known token, or the
+        suggestions for an unknown one
+        """
+        if self.generation != vocabulary.generation:
+            # Ids from a cleared vocabulary mean other words now
+            self.id_memo = {}
+            self.generation = vocabulary.generation
+        try:
+            return self.id_memo[token_id]
+        except KeyError:
+            pass
+        result = self.lookup(vocabulary.word(token_id))
+        if len(self.id_memo) >= MEMO_SIZE:
+            self.id_memo.clear()
+        self.id_memo[token_id] = result
+        return result
+
+    def words(self, text):
+        """
+        Yield the offset and text of each
+        word in a tweet worth checking
+        """
+        urls = [m.span() for m in URL_RE.finditer(text)]
+        for m in WORD_RE.finditer(text):
+            word = m.group()
+            if any(start <= m.start() < end for start, end in urls):
+                continue
+            # Acronyms and names like iPhone
+            if len(word) > 1 and any(c.isupper() for c in word[1:]):
+                continue
+            yield m.start(), word
+
+    def check(self, text):
+        """
+        Return a match for every unknown
+        word in the text
+        """
+        text = text.replace('’', "'")
+        matches = []
+        for offset, word in self.words(text):
+            replacements = self.lookup(word)
+            if replacements is not None:
+                matches.append(SpellingMatch(text, offset, len(word), replacements))
+        return matches
+
+    def check_tweet(self, tweet):
+        """
+        Return a match for every unknown word
+        in a tweet, using its shared tokens
+        """
+        text = tweet_view(tweet, 'normalized')
+        masked = tweet_view(tweet, 'masked')
+        matches = []
+        for token_id, start, end in tweet_tokens(tweet):
+            # Links, mentions and hashtags
+            if masked[start] == ' ':
+                continue
+            word = text[start:end]
+            if not word.replace("'", '').isalpha():
+                continue
+            if len(word) > 1 and any(c.isupper() for c in word[1:]):
+                continue
+            replacements = self.lookup_id(token_id)
+            if replacements is not None:
+                matches.append(SpellingMatch(text, start, end - start, replacements))
+        return matches
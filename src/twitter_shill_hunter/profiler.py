@@ -0,0 +1,305 @@
+import collections
+import os
+import re
+import sys
+import threading
+import time
+from .lazy_import import lazy_import
+
+# Only imported when a run is profiled
+cProfile = lazy_import('cProfile')
+pstats = lazy_import('pstats')
+
+# How processors are profiled: every call with cProfile,
+# or their stacks sampled at an interval
+CPROFILE = 'cprofile'
+SAMPLE = 'sample'
+PROFILE_MODES = [CPROFILE, SAMPLE]
+
+# cProfile allows one active profiler per process from
+# Python 3.12, so profiled calls take turns there. Before
+# that each thread profiles with its own cProfile.Profile
+SERIALIZE_PROFILES = sys.version_info >= (3, 12)
+_profile_lock = threading.Lock()
+
+# The stack sampler of this process, started on first use
+_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_profiler(options=None):
+    """
+    Return the profiler for the profile
+    options, or None when the run is
+    not profiled
+    """
+    if not options:
+        return None
+    mode = options.get('mode', CPROFILE)
+    if mode not in PROFILE_MODES:
+        raise ValueError("profile mode must be one of %s, not '%s'" % (
+            ', '.join(PROFILE_MODES), mode))
+    return ProcessorProfiler(options.get('path', 'profiles'), mode=mode,
+                             interval=float(options.get('interval', 0.005)))
+
+
+def get_sampler(interval):
+    """
+    Return this process's stack
+    sampler, starting it if needed
+    """
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            _sampler = StackSampler(interval)
+            _sampler.start()
+        return _sampler
+
+
+def code_label(filename, name):
+    """
+    Return the name a function
+    has in a collapsed stack
+    """
+    if filename == '~':
+        # Built in functions
+        return name.replace(';', ',')
+    return '%s:%s' % (os.path.basename(filename), name)
+
+
+def collapsed_from_stats(stats):
+    """
+    Return {stack: microseconds} estimated
+    from cProfile stats. cProfile keeps who
+    called whom rather than whole stacks, so
+    each function's time is split between
+    the paths to it in proportion to the
+    time each caller spent in it.
+    """
+    callees = collections.defaultdict(dict)
+    for func, (cc, nc, tt, ct, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+
+    stacks = collections.Counter()
+
+    def walk(func, path, seconds):
+        cc, nc, tt, ct, callers = stats[func]
+        path = path + [code_label(func[0], func[2])]
+        # Paths below a microsecond are not worth following
+        if ct <= 0 or seconds < 1e-6:
+            return
+        stacks[';'.join(path)] += int(round(seconds * tt / ct * 1e6))
+        for callee, edge_seconds in callees.get(func, {}).items():
+            # Recursion is folded into the first call
+            if callee in visiting:
+                continue
+            visiting.add(callee)
+            walk(callee, path, seconds * edge_seconds / ct)
+            visiting.discard(callee)
+
+    for func, (cc, nc, tt, ct, callers) in stats.items():
+        if not callers:
+            visiting = set([func])
+            walk(func, [], ct)
+
+    return dict((stack, us) for stack, us in stacks.items() if us > 0)
+
+
+def write_collapsed(path, stacks):
+    """
+    Write stacks in the collapsed format
+    flamegraph tools read: one stack per
+    line, frames joined by ;, then a count
+    """
+    with open(path, 'w') as output:
+        for stack in sorted(stacks):
+            output.write('%s %d\n' % (stack, stacks[stack]))
+
+
+class StackSampler(threading.Thread):
+    """
+    Class to sample the stacks of threads
+    running a profiled process_data every
+    interval seconds. Each call only notes
+    the thread it runs in, so sampling can
+    be left on for long runs.
+    """
+
+    def __init__(self, interval=0.005):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.interval = interval
+        self.lock = threading.Lock()
+        # thread ident -> plugin being profiled in it
+        self.active = {}
+        self.stacks = collections.defaultdict(collections.Counter)
+
+    def enter(self, name):
+        """
+        Start sampling the calling
+        thread for a plugin
+        """
+        self.active[threading.get_ident()] = name
+
+    def leave(self):
+        """
+        Stop sampling the
+        calling thread
+        """
+        self.active.pop(threading.get_ident(), None)
+
+    def take(self, name):
+        """
+        Return and clear the stacks
+        sampled for a plugin
+        """
+        with self.lock:
+            return self.stacks.pop(name, collections.Counter())
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            active = list(self.active.items())
+            if not active:
+                continue
+            frames = sys._current_frames()
+            with self.lock:
+                for ident, name in active:
+                    frame = frames.get(ident)
+                    stack = []
+                    while frame is not None and frame.f_code is not PROFILED_CODE:
+                        stack.append(code_label(frame.f_code.co_filename, frame.f_code.co_name))
+                        frame = frame.f_back
+                    if stack:
+                        self.stacks[name][';'.join(reversed(stack))] += 1
+
+
+class ProcessorProfiler():
+    """
+    Class to profile each processor's
+    process_data on its own, writing
+    <plugin>.pstats and <plugin>.collapsed
+    files to a directory when the processor
+    is closed. Sampling writes only the
+    collapsed stacks, counted in samples.
+    """
+
+    def __init__(self, path='profiles', mode=CPROFILE, interval=0.005):
+        self.path = path
+        self.mode = mode
+        self.interval = interval
+
+    def wrap(self, name, processor):
+        """
+        Return the processor with
+        its calls profiled
+        """
+        return ProfiledProcessor(processor, name, self)
+
+    def file_path(self, name, extension):
+        """
+        Return the path of a
+        plugin's profile file
+        """
+        os.makedirs(self.path, exist_ok=True)
+        return os.path.join(self.path, '%s.%s' % (re.sub(r'[^\w.-]', '_', name), extension))
+
+
+class ProfiledProcessor():
+    """
+    Class to stand in for a processor,
+    profiling its process_data. Every
+    other attribute is the processor's.
+    """
+
+    def __init__(self, processor, name, profiler):
+        self.processor = processor
+        self.name = name
+        self.profiler = profiler
+        # thread ident -> its profile, or None -> the
+        # one profile when calls are serialized
+        self.profiles = {}
+        self.calls = 0
+        self.waits = 0
+
+    def process_data(self, *args):
+        if self.profiler.mode == SAMPLE:
+            sampler = get_sampler(self.profiler.interval)
+            sampler.enter(self.name)
+            try:
+                return self.processor.process_data(*args)
+            finally:
+                sampler.leave()
+
+        if not SERIALIZE_PROFILES:
+            return self.thread_profile().runcall(self.processor.process_data, *args)
+
+        if not _profile_lock.acquire(blocking=False):
+            # Another profiled call is running
+            self.waits += 1
+            _profile_lock.acquire()
+        try:
+            self.calls += 1
+            return self.thread_profile().runcall(self.processor.process_data, *args)
+        finally:
+            _profile_lock.release()
+
+    def thread_profile(self):
+        """
+        Return the profile of
+        the calling thread
+        """
+        key = None if SERIALIZE_PROFILES else threading.get_ident()
+        profile = self.profiles.get(key)
+        if profile is None:
+            profile = self.profiles[key] = cProfile.Profile()
+        return profile
+
+    def __getattr__(self, name):
+        return getattr(self.processor, name)
+
+    def write(self):
+        """
+        Write the profile files,
+        if anything was profiled
+        """
+        if self.profiler.mode == SAMPLE:
+            if _sampler is None:
+                return
+            stacks = _sampler.take(self.name)
+            if not stacks:
+                return
+        else:
+            if not self.profiles:
+                return
+            stats = pstats.Stats(*self.profiles.values())
+            stats_path = self.profiler.file_path(self.name, 'pstats')
+            stats.dump_stats(stats_path)
+            stacks = collapsed_from_stats(stats.stats)
+            print("Profile of %s written to %s" % (self.name, stats_path))
+            if self.calls:
+                print("Profiled calls of %s were serialized, cProfile allows one profiler "
+                      "at a time from Python 3.12: %d of %d calls waited for another"
+                      % (self.name, self.waits, self.calls))
+            self.profiles = {}
+            self.calls = self.waits = 0
+
+        collapsed_path = self.profiler.file_path(self.name, 'collapsed')
+        write_collapsed(collapsed_path, stacks)
+        print("Collapsed stacks of %s written to %s" % (self.name, collapsed_path))
+
+    def close(self):
+        """
+        Close the processor and
+        write its profile
+        """
+        try:
+            close = getattr(self.processor, 'close', None)
+            if callable(close):
+                close()
+        finally:
+            self.write()
+
+
+# Sampled stacks stop at the profiled call
+PROFILED_CODE = ProfiledProcessor.process_data.__code__
@@ -0,0 +1,79 @@
+from .lazy_import import lazy_import
+
+# Only needed for plugins without a context_fields declaration
+inspect = lazy_import('inspect')
+
+# Arguments every processor method receives before its context fields
+LEADING_ARGS = ('self', 'tweets_and_date')
+
+# Context fields resolved for each processor class and method
+_declared_fields = {}
+
+
+class RunContext():
+    """
+    Class to hold the settings processors can
+    ask for, resolved once from the config.
+    Processors list the fields they need in a
+    context_fields class attribute and receive
+    them, in that order, after the tweets.
+
+    target            - account or archive being screened
+    search_terms      - terms sentiment is reported for
+    search_options    - case_sensitive and whole_word
+    sentiment_options - sentiment cache and backend
+    spelling_options  - spelling mode, servers and batching
+    dialect           - language and dialect, e.g. en-GB
+    page_size         - posts per page
+    history_limit     - most posts read per target
+    """
+
+    __slots__ = ('target', 'search_terms', 'search_options', 'sentiment_options',
+                 'spelling_options', 'dialect', 'page_size', 'history_limit')
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.pop(name, None))
+        if fields:
+            raise TypeError("Unknown context fields: %s" % ', '.join(sorted(fields)))
+
+    @classmethod
+    def from_settings(cls, settings):
+        """
+        Build a context from an object
+        holding the settings as attributes
+        """
+        return cls(**dict((name, getattr(settings, name)) for name in cls.__slots__))
+
+    def values(self, fields):
+        """
+        Return the values of
+        the named fields
+        """
+        return [getattr(self, name) for name in fields]
+
+
+def context_fields(processor_class, method='process_data'):
+    """
+    Return the context fields a processor
+    method takes. process_data uses the
+    class's context_fields declaration. Other
+    methods, and plugins without one, are read
+    from the signature the first time.
+    """
+    key = (processor_class, method)
+    fields = _declared_fields.get(key)
+    if fields is None:
+        declared = getattr(processor_class, 'context_fields', None)
+        if method == 'process_data' and declared is not None:
+            fields = tuple(declared)
+        else:
+            args = inspect.getfullargspec(getattr(processor_class, method)).args
+            fields = tuple(a for a in args if a not in LEADING_ARGS)
+
+        unknown = [f for f in fields if f not in RunContext.__slots__]
+        if unknown:
+            raise ValueError("%s.%s asks for unknown context fields: %s" % (
+                processor_class.__name__, method, ', '.join(unknown)))
+        _declared_fields[key] = fields
+    return fields
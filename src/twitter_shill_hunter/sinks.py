@@ -0,0 +1,283 @@
+import csv
+import io
+import json
+import sys
+
+# Output formats a run can write its results in
+SUMMARY = 'summary'
+JSONL = 'jsonl'
+CSV = 'csv'
+QUIET = 'quiet'
+PARQUET = 'parquet'
+ARROW = 'arrow'
+OUTPUT_FORMATS = [SUMMARY, JSONL, CSV, QUIET, PARQUET, ARROW]
+
+# Columns of the CSV output. Fields a plugin reports that
+# have no column of their own are kept in extra as JSON.
+CSV_COLUMNS = ('target', 'plugin', 'type', 'date', 'tweet', 'search_terms',
+               'neg', 'neu', 'pos', 'compound', 'coordinates', 'source',
+               'dialect_hits', 'matches', 'extra')
+
+
+def get_sink(output_options=None):
+    """
+    Return the sink for the output options,
+    printing a summary when none are given
+    """
+    options = output_options or {}
+    output_format = options.get('format', SUMMARY)
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError("output format must be one of %s, not '%s'" % (
+            ', '.join(OUTPUT_FORMATS), output_format))
+
+    if output_format == QUIET:
+        return QuietSink()
+    if output_format == SUMMARY:
+        return SummarySink(options.get('path'))
+    if output_format in (PARQUET, ARROW):
+        # Only imported, with pyarrow, when asked for
+        from .columnar_sink import ColumnarSink
+        return ColumnarSink(options.get('path'), file_format=output_format,
+                            row_group_size=options.get('row_group_size', 65536))
+    buffer_size = int(options.get('buffer_size', 1000))
+    if output_format == JSONL:
+        return JsonlSink(options.get('path'), buffer_size=buffer_size)
+    return CsvSink(options.get('path'), buffer_size=buffer_size)
+
+
+class ResultSink():
+    """
+    Class to receive the results of a run.
+    Processors return a list of records for
+    each page and a summary for each target,
+    and the run hands them to its sink.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.stream = None
+
+    def get_stream(self):
+        """
+        Return the stream to write to, with
+        no path or - meaning standard output
+        """
+        if self.path in (None, '', '-'):
+            return sys.stdout
+        if self.stream is None:
+            self.stream = open(self.path, 'w', encoding='utf-8', newline='')
+        return self.stream
+
+    def write_page(self, target, tweets, results):
+        """
+        Take the results of every plugin for
+        a page of tweets. Plugins report a
+        list of dicts, other return values
+        are not output.
+        """
+        for plugin in results:
+            records = results[plugin]
+            if records and isinstance(records, list):
+                self.write(target, plugin, records)
+
+    def write(self, target, plugin, records):
+        """
+        Take the records a plugin
+        returned for one page
+        """
+        pass
+
+    def write_summary(self, target, plugin, summary):
+        """
+        Take the summary a plugin
+        returned for a target
+        """
+        pass
+
+    def end_target(self, target, run_summary=None):
+        """
+        Called once every result of a target
+        has been written, with the posts,
+        pages, time and error of its run
+        """
+        pass
+
+    def close(self):
+        """
+        Write anything still
+        held and close
+        """
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+
+class QuietSink(ResultSink):
+    """
+    Class to discard every result,
+    for runs only timing or warming
+    caches
+    """
+    pass
+
+
+class BufferedSink(ResultSink):
+    """
+    Class to collect formatted records in
+    memory and write them out in large
+    blocks, rather than a write per line
+    """
+
+    def __init__(self, path=None, buffer_size=1000):
+        super().__init__(path)
+        self.buffer_size = max(1, buffer_size)
+        self.buffer = io.StringIO()
+        self.pending = 0
+
+    def added(self, count=1):
+        """
+        Note records added to the buffer,
+        writing it out once it is full
+        """
+        self.pending += count
+        if self.pending >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffer out
+        """
+        text = self.buffer.getvalue()
+        if text:
+            stream = self.get_stream()
+            stream.write(text)
+            stream.flush()
+            self.buffer.seek(0)
+            self.buffer.truncate()
+        self.pending = 0
+
+    def end_target(self, target, run_summary=None):
+        self.flush()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+class JsonlSink(BufferedSink):
+    """
+    Class to write one JSON object per line:
+    a record line for each record, tagged
+    with its target and plugin, and a
+    summary line for each target
+    """
+
+    def write(self, target, plugin, records):
+        for record in records:
+            line = {'target': target, 'plugin': plugin, 'type': 'record'}
+            line.update(record)
+            self.buffer.write(json.dumps(line, default=str))
+            self.buffer.write('\n')
+        self.added(len(records))
+
+    def write_summary(self, target, plugin, summary):
+        line = {'target': target, 'plugin': plugin, 'type': 'summary', 'summary': summary}
+        self.buffer.write(json.dumps(line, default=str))
+        self.buffer.write('\n')
+        self.added()
+
+
+class CsvSink(BufferedSink):
+    """
+    Class to write records as CSV rows with a
+    fixed set of columns. Lists and dicts are
+    written as JSON, and summaries are rows
+    of type summary with the summary in extra.
+    """
+
+    def __init__(self, path=None, buffer_size=1000):
+        super().__init__(path, buffer_size=buffer_size)
+        self.writer = csv.writer(self.buffer)
+        self.writer.writerow(CSV_COLUMNS)
+
+    def cell(self, value):
+        """
+        Return a value as
+        written in a cell
+        """
+        if value is None:
+            return ''
+        if isinstance(value, (list, tuple, dict)):
+            return json.dumps(value, default=str)
+        return value
+
+    def row(self, target, plugin, row_type, fields):
+        """
+        Return a row for a record
+        or summary
+        """
+        fields = dict(fields)
+        row = [target, plugin, row_type]
+        for column in CSV_COLUMNS[3:-1]:
+            row.append(self.cell(fields.pop(column, None)))
+        row.append(self.cell(fields) if fields else '')
+        return row
+
+    def write(self, target, plugin, records):
+        self.writer.writerows(self.row(target, plugin, 'record', r) for r in records)
+        self.added(len(records))
+
+    def write_summary(self, target, plugin, summary):
+        row = self.row(target, plugin, 'summary', {})
+        row[-1] = self.cell(summary)
+        self.writer.writerow(row)
+        self.added()
+
+
+class SummarySink(ResultSink):
+    """
+    Class to print a human readable report
+    for each target: how many records each
+    plugin returned and the summary it gave
+    """
+
+    def __init__(self, path=None):
+        super().__init__(path)
+        self.counts = {}
+        self.summaries = {}
+
+    def write(self, target, plugin, records):
+        self.counts[plugin] = self.counts.get(plugin, 0) + len(records)
+
+    def write_summary(self, target, plugin, summary):
+        self.summaries[plugin] = summary
+
+    def end_target(self, target, run_summary=None):
+        lines = ["=========================",
+                 "Results for target %s" % target]
+        for plugin in list(self.counts) + [p for p in self.summaries if p not in self.counts]:
+            lines.append("%s: %d records" % (plugin, self.counts.get(plugin, 0)))
+            for key, value in (self.summaries.get(plugin) or {}).items():
+                self.format_value(lines, key, value, 1)
+        stream = self.get_stream()
+        stream.write('\n'.join(lines) + '\n')
+        stream.flush()
+        self.counts = {}
+        self.summaries = {}
+
+    def format_value(self, lines, key, value, depth):
+        """
+        Add indented lines
+        for a summary value
+        """
+        indent = '  ' * depth
+        if isinstance(value, dict):
+            lines.append("%s%s:" % (indent, key))
+            for k, v in value.items():
+                self.format_value(lines, k, v, depth + 1)
+        elif isinstance(value, float):
+            lines.append("%s%s: %.4f" % (indent, key, value))
+        elif isinstance(value, (list, tuple)):
+            lines.append("%s%s: %s" % (indent, key, ', '.join(str(v) for v in value)))
+        else:
+            lines.append("%s%s: %s" % (indent, key, value))
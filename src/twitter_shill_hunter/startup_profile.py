@@ -0,0 +1,88 @@
+import os
+import re
+import subprocess
+import sys
+
+# A line of python -X importtime output:
+# "import time:  self [us] | cumulative | imported package"
+IMPORT_TIME_RE = re.compile(r'^import time:\s*(\d+) \|\s*(\d+) \|( *)(\S+)\s*$')
+
+
+def parse_import_times(lines):
+    """
+    Return (module, self_us, cumulative_us,
+    depth) for each timed import, in the
+    order the imports finished
+    """
+    timings = []
+    for line in lines:
+        m = IMPORT_TIME_RE.match(line)
+        if m:
+            depth = (len(m.group(3)) - 1) // 2
+            timings.append((m.group(4), int(m.group(1)), int(m.group(2)), depth))
+    return timings
+
+
+class StartupProfile():
+    """
+    Class to run the CLI in a child interpreter
+    started with -X importtime and report the
+    modules that took longest to import, so
+    slow dependencies pulled in at startup
+    can be spotted
+    """
+
+    def __init__(self, limit=25):
+        self.limit = limit
+        self.timings = []
+
+    def command(self, args):
+        """
+        Return the command running
+        the CLI with import timing
+        """
+        return [sys.executable, '-X', 'importtime', '-m', 'twitter_shill_hunter'] + list(args)
+
+    def environment(self):
+        """
+        Return the child's environment, able
+        to import this copy of the package
+        """
+        env = dict(os.environ)
+        source = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        paths = [source] + [p for p in env.get('PYTHONPATH', '').split(os.pathsep) if p]
+        env['PYTHONPATH'] = os.pathsep.join(paths)
+        return env
+
+    def run(self, args):
+        """
+        Run the CLI with args, pass its errors
+        through and report its import times.
+        Returns the child's exit code.
+        """
+        child = subprocess.Popen(self.command(args), stderr=subprocess.PIPE,
+                                 env=self.environment(), universal_newlines=True)
+        lines = []
+        for line in child.stderr:
+            if line.startswith('import time:'):
+                lines.append(line)
+            else:
+                sys.stderr.write(line)
+        returncode = child.wait()
+        self.timings = parse_import_times(lines)
+        self.report()
+        return returncode
+
+    def report(self):
+        """
+        Print the total import time and the
+        slowest modules, cumulative time first
+        """
+        total = sum(t[2] for t in self.timings if t[3] == 0)
+        print("Startup profile: %d modules imported in %.1f ms"
+              % (len(self.timings), total / 1000.0))
+        print("%10s %10s  %s" % ('cumulative', 'self', 'module'))
+        slowest = sorted(self.timings, key=lambda t: t[2], reverse=True)[:self.limit]
+        for module, self_us, cumulative_us, depth in slowest:
+            print("%8.1fms %8.1fms  %s%s" % (
+                cumulative_us / 1000.0, self_us / 1000.0, '  ' * depth, module))
@@ -0,0 +1,180 @@
+import datetime
+import json
+import random
+from .input import ProcessInputYaml
+from .package_data import resource_path
+from .tweet_record import CREATED_AT_FORMAT
+
+# Words every tweet is padded out with
+FILLER_WORDS = (
+    'the', 'a', 'this', 'that', 'we', 'they', 'our', 'people', 'today', 'really',
+    'just', 'again', 'about', 'new', 'time', 'week', 'local', 'plan', 'vote',
+    'news', 'team', 'city', 'everyone', 'still', 'going', 'think', 'said', 'here',
+    'after', 'morning', 'tonight', 'council', 'report', 'story', 'government')
+
+# Words moving the sentiment of a tweet either way
+POSITIVE_WORDS = ('great', 'love', 'brilliant', 'happy', 'amazing', 'proud', 'win', 'best')
+NEGATIVE_WORDS = ('terrible', 'hate', 'awful', 'sad', 'disaster', 'angry', 'worst', 'fail')
+
+# Terms a screening config might search for
+SEARCH_TERMS = ('election', 'vaccine', 'crypto', 'climate', 'tax cuts')
+
+# Clients posts are sent from, with how often each is seen
+SOURCES = (
+    ('<a href="http://twitter.com/download/iphone" rel="nofollow">Twitter for iPhone</a>', 40),
+    ('<a href="http://twitter.com/download/android" rel="nofollow">Twitter for Android</a>', 30),
+    ('<a href="https://mobile.twitter.com" rel="nofollow">Twitter Web App</a>', 20),
+    ('<a href="https://about.twitter.com/products/tweetdeck" rel="nofollow">TweetDeck</a>', 6),
+    ('<a href="https://buffer.com" rel="nofollow">Buffer</a>', 3),
+    ('<a href="https://example.com/autoposter" rel="nofollow">AutoPoster 3000</a>', 1),
+)
+
+# (longitude, latitude) of cities tweets are placed near
+UK_CITIES = ((-0.1276, 51.5072), (-2.2426, 53.4808), (-1.8904, 52.4862),
+             (-3.1883, 55.9533), (-2.5879, 51.4545))
+US_CITIES = ((-74.0060, 40.7128), (-118.2437, 34.0522), (-87.6298, 41.8781),
+             (-95.3698, 29.7604), (-122.4194, 37.7749))
+
+# First post id and time, newest first as timelines are read
+FIRST_ID = 1712345678901234567
+FIRST_TIME = datetime.datetime(2023, 10, 11, 10, 30, tzinfo=datetime.timezone.utc)
+
+
+def dialect_pairs(language='en', first='en-UK', second='en-US'):
+    """
+    Return (first, second) spellings of the
+    words the shipped dialect files list
+    for both dialects in the same order
+    """
+    mappings = resource_path('twitter_shill_hunter.processors.grammar_analysis',
+                             'dialect_mappings', language)
+    reader = ProcessInputYaml()
+    first_words = reader.yaml_processor('/'.join((mappings, first + '.yaml')))['words']
+    second_words = reader.yaml_processor('/'.join((mappings, second + '.yaml')))['words']
+    return [(a, b) for a, b in zip(first_words, second_words) if a != b]
+
+
+class SyntheticCorpus():
+    """
+    Class to generate a timeline of posts in
+    the X API's JSON, seeded so the same
+    settings always give the same posts.
+
+    uk_share        - share of posts written with UK spellings,
+                      the rest use US spellings
+    dialect_density - dialect words in each post
+    term_density    - share of posts naming a search term
+    duplicate_share - share of posts repeating a recent post
+    geo_share       - share of posts with coordinates
+    typo_share      - share of posts with a misspelt word
+    """
+
+    def __init__(self, seed=0, uk_share=0.5, dialect_density=2, term_density=0.2,
+                 duplicate_share=0.05, geo_share=0.1, typo_share=0.05,
+                 search_terms=SEARCH_TERMS):
+        self.seed = seed
+        self.uk_share = uk_share
+        self.dialect_density = dialect_density
+        self.term_density = term_density
+        self.duplicate_share = duplicate_share
+        self.geo_share = geo_share
+        self.typo_share = typo_share
+        self.search_terms = list(search_terms)
+        self.pairs = dialect_pairs()
+        self.sources = [s for s, weight in SOURCES]
+        self.source_weights = [weight for s, weight in SOURCES]
+
+    def tweets(self, count):
+        """
+        Generator yielding count posts,
+        newest first
+        """
+        rng = random.Random(self.seed)
+        recent = []
+        created = FIRST_TIME
+        for i in range(count):
+            uk = rng.random() < self.uk_share
+            if recent and rng.random() < self.duplicate_share:
+                text = rng.choice(recent)
+            else:
+                text = self.text(rng, uk)
+                recent.append(text)
+                if len(recent) > 100:
+                    del recent[0]
+
+            post_id = FIRST_ID - i
+            created -= datetime.timedelta(seconds=rng.randint(30, 7200))
+            coordinates = None
+            if rng.random() < self.geo_share:
+                longitude, latitude = rng.choice(UK_CITIES if uk else US_CITIES)
+                coordinates = {'type': 'Point', 'coordinates': [
+                    round(longitude + rng.uniform(-0.2, 0.2), 6),
+                    round(latitude + rng.uniform(-0.2, 0.2), 6)]}
+
+            yield {
+                'id': post_id,
+                'id_str': str(post_id),
+                'created_at': created.strftime(CREATED_AT_FORMAT),
+                'full_text': text,
+                'coordinates': coordinates,
+                'place': None,
+                'source': rng.choices(self.sources, self.source_weights)[0],
+            }
+
+    def text(self, rng, uk):
+        """
+        Return the text of a new post
+        in UK or US spellings
+        """
+        words = rng.sample(FILLER_WORDS, rng.randint(6, 14))
+        for pair in rng.sample(self.pairs, self.dialect_density):
+            words.insert(rng.randrange(len(words) + 1), pair[0] if uk else pair[1])
+        mood = rng.random()
+        if mood < 0.3:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(POSITIVE_WORDS))
+        elif mood < 0.6:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(NEGATIVE_WORDS))
+        if self.search_terms and rng.random() < self.term_density:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(self.search_terms))
+        if rng.random() < self.typo_share:
+            i = rng.randrange(len(words))
+            word = words[i]
+            if len(word) > 3:
+                j = rng.randrange(len(word) - 1)
+                words[i] = word[:j] + word[j + 1] + word[j] + word[j + 2:]
+
+        text = ' '.join(words)
+        text = text[0].upper() + text[1:] + rng.choice(('.', '!', '?', '...'))
+        extra = rng.random()
+        if extra < 0.1:
+            text = '@%s %s' % (rng.choice(('newsdesk', 'localpaper', 'mp_office')), text)
+        elif extra < 0.2:
+            text += ' #%s' % rng.choice(FILLER_WORDS)
+        elif extra < 0.25:
+            text += ' https://t.co/%08x' % rng.getrandbits(32)
+        return text
+
+    def pages(self, count, page_size=200):
+        """
+        Generator yielding the posts
+        a page at a time
+        """
+        page = []
+        for tweet in self.tweets(count):
+            page.append(tweet)
+            if len(page) == page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def write_jsonl(self, path, count):
+        """
+        Write count posts to a JSONL
+        archive ArchiveReader can read
+        """
+        with open(path, 'w', encoding='utf-8') as archive:
+            for tweet in self.tweets(count):
+                archive.write(json.dumps(tweet))
+                archive.write('\n')
+        return path
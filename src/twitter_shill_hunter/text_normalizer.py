@@ -0,0 +1,91 @@
+import re
+import unicodedata
+
+# Punctuation Unicode normalisation leaves alone, mapped to ASCII.
+# Invisible characters used to break up words are removed.
+PUNCTUATION = str.maketrans({
+    '‘': "'", '’': "'", '‚': "'", '‛': "'", '′': "'",
+    '“': '"', '”': '"', '„': '"', '‟': '"', '″': '"',
+    '‐': '-', '‒': '-', '–': '-', '—': '-', '−': '-',
+    '­': None, '​': None, '⁠': None, '﻿': None,
+})
+
+# Links, mentions and hashtags
+MASK_RE = re.compile(r"(?:https?://|www\.)\S+|(?<!\w)[@#]\w+")
+
+# Views built for every tweet
+VIEWS = ('normalized', 'folded', 'masked', 'ascii')
+
+
+def fold_ascii(text):
+    """
+    Return text with accents removed
+    and any other non-ASCII characters
+    dropped
+    """
+    if text.isascii():
+        return text
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+
+
+class TextNormalizer():
+    """
+    Class to build the normalised views of
+    a tweet's text that plugins work on, so
+    each tweet is normalised once however
+    many plugins read it:
+
+    normalized - NFKC normalised, with curly
+                 quotes and dashes made ASCII
+    folded     - normalized, case folded
+    masked     - normalized with links, mentions
+                 and hashtags blanked out, keeping
+                 the length of the text
+    ascii      - normalized with accents removed
+                 and other non-ASCII dropped
+    """
+
+    def normalize(self, text):
+        """
+        Return the Unicode
+        normalised text
+        """
+        if text.isascii():
+            return text
+        return unicodedata.normalize('NFKC', text).translate(PUNCTUATION)
+
+    def mask(self, text):
+        """
+        Blank out links, mentions and
+        hashtags with spaces
+        """
+        if '/' not in text and '@' not in text and '#' not in text and 'www.' not in text:
+            return text
+        return MASK_RE.sub(lambda m: ' ' * len(m.group()), text)
+
+    def views(self, text):
+        """
+        Return every view of
+        the text by name
+        """
+        normalized = self.normalize(text)
+        return {
+            'normalized': normalized,
+            'folded': normalized.casefold(),
+            'masked': self.mask(normalized),
+            'ascii': fold_ascii(normalized),
+        }
+
+
+_normalizer = TextNormalizer()
+
+
+def tweet_view(tweet, name):
+    """
+    Return a view of a tweet's text,
+    building the views on first use
+    """
+    views = tweet.get('views')
+    if views is None:
+        views = tweet['views'] = _normalizer.views(tweet['text'])
+    return views[name]
@@ -0,0 +1,198 @@
+import contextlib
+import json
+import os
+import sqlite3
+import time
+
+
+class TimelineCache():
+    """
+    Class to keep a local SQLite copy of
+    each target's raw posts so repeat runs
+    only fetch what is new
+    """
+
+    default_path = os.path.join(
+        os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache')),
+        'twitter_shill_hunter', 'timelines.db')
+
+    def __init__(self, path=None, ttl_seconds=None, max_posts=None):
+        """
+        Open (or create) the cache database.
+        Targets not refreshed within ttl_seconds
+        are dropped and at most max_posts of the
+        newest posts are kept per target.
+        """
+        self.path = os.path.expanduser(path or self.default_path)
+        self.ttl_seconds = ttl_seconds
+        self.max_posts = max_posts
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self.transaction() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS posts ("
+                "target TEXT NOT NULL, id INTEGER NOT NULL, json TEXT NOT NULL, "
+                "PRIMARY KEY (target, id)) WITHOUT ROWID")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS targets ("
+                "target TEXT PRIMARY KEY, since_id INTEGER, fetched_at REAL)")
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Build a cache from the 'cache'
+        block of the YAML config
+        """
+        if config is True:
+            config = {}
+        ttl_days = config.get('ttl_days')
+        return cls(
+            path=config.get('path'),
+            ttl_seconds=ttl_days * 86400 if ttl_days is not None else None,
+            max_posts=config.get('max_posts'))
+
+    def connect(self):
+        """
+        Open a connection. Each thread
+        uses its own connection.
+        """
+        return sqlite3.connect(self.path, timeout=30)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """
+        Connection that commits on success
+        and is always closed
+        """
+        db = self.connect()
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def since_id(self, target):
+        """
+        Newest post id from the last
+        complete fetch of the target
+        """
+        with self.transaction() as db:
+            row = db.execute(
+                "SELECT since_id FROM targets WHERE target = ?",
+                (target,)).fetchone()
+        return row[0] if row else None
+
+    def store(self, target, posts):
+        """
+        Add raw posts for a target,
+        replacing any already cached
+        """
+        rows = [(target, p['id'], json.dumps(p)) for p in posts
+                if p.get('id') is not None]
+        with self.transaction() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO posts (target, id, json) VALUES (?, ?, ?)",
+                rows)
+
+    def mark_fetched(self, target, since_id):
+        """
+        Record a complete fetch. Only then
+        does since_id move forward, so an
+        interrupted fetch is retried in full.
+        """
+        with self.transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO targets (target, since_id, fetched_at) "
+                "VALUES (?, ?, ?)",
+                (target, since_id, time.time()))
+
+    def clear(self, target):
+        """
+        Forget everything cached
+        for the target
+        """
+        with self.transaction() as db:
+            db.execute("DELETE FROM posts WHERE target = ?", (target,))
+            db.execute("DELETE FROM targets WHERE target = ?", (target,))
+
+    def evict(self):
+        """
+        Drop expired targets and trim
+        each target to max_posts
+        """
+        with self.transaction() as db:
+            if self.ttl_seconds is not None:
+                cutoff = time.time() - self.ttl_seconds
+                expired = [r[0] for r in db.execute(
+                    "SELECT target FROM targets WHERE fetched_at < ?", (cutoff,))]
+                for target in expired:
+                    db.execute("DELETE FROM posts WHERE target = ?", (target,))
+                    db.execute("DELETE FROM targets WHERE target = ?", (target,))
+
+            if self.max_posts is not None:
+                targets = [r[0] for r in db.execute("SELECT DISTINCT target FROM posts")]
+                for target in targets:
+                    db.execute(
+                        "DELETE FROM posts WHERE target = ? AND id < ("
+                        "SELECT MIN(id) FROM (SELECT id FROM posts WHERE target = ? "
+                        "ORDER BY id DESC LIMIT ?))",
+                        (target, target, self.max_posts))
+
+    def cached_pages(self, target, page_size, max_id=None):
+        """
+        Generator yielding cached posts for
+        the target newest first, page_size
+        at a time
+        """
+        db = self.connect()
+        try:
+            if max_id is None:
+                cursor = db.execute(
+                    "SELECT json FROM posts WHERE target = ? ORDER BY id DESC",
+                    (target,))
+            else:
+                cursor = db.execute(
+                    "SELECT json FROM posts WHERE target = ? AND id <= ? "
+                    "ORDER BY id DESC", (target, max_id))
+            while True:
+                rows = cursor.fetchmany(page_size)
+                if not rows:
+                    return
+                yield [json.loads(r[0]) for r in rows]
+        finally:
+            db.close()
+
+    def pages(self, fetcher, refresh=False):
+        """
+        Generator merging newly fetched posts
+        with the cached history. Posts newer
+        than the cached since_id are fetched,
+        stored and yielded first, followed by
+        the cached posts. Both are counted in
+        the fetcher's metrics.
+        """
+        target = fetcher.target
+        if refresh:
+            self.clear(target)
+
+        since_id = self.since_id(target)
+        fetcher.since_id = since_id
+        newest_id = since_id
+
+        for page in fetcher.pages():
+            fetcher.metrics.add('timeline_cache_misses', len(page))
+            self.store(target, page)
+            ids = [p['id'] for p in page if p.get('id') is not None]
+            if ids and (newest_id is None or max(ids) > newest_id):
+                newest_id = max(ids)
+            yield page
+
+        self.mark_fetched(target, newest_id)
+
+        if since_id is not None:
+            for page in self.cached_pages(target, fetcher.page_size, since_id):
+                fetcher.metrics.add('timeline_cache_hits', len(page))
+                yield page
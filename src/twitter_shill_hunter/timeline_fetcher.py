@@ -0,0 +1,212 @@
+import queue
+import threading
+from .metrics import Metrics
+
+
+def is_reply_or_repost(tweet):
+    """
+    Return True for posts the filtered
+    timeline leaves out
+    """
+    return (tweet.get('in_reply_to_status_id') is not None or
+            'retweeted_status' in tweet)
+
+
+class TimelineFetcher():
+    """
+    Class to walk a target's timeline
+    page by page using max_id pagination
+    """
+
+    # X only serves the most recent 3,200 posts of a timeline
+    history_limit = 3200
+    page_size = 200
+    # Windows in a row holding nothing to analyse before giving
+    # up, None walks on until X stops serving posts
+    max_empty_pages = None
+
+    def __init__(self, api, target, page_size=200, history_limit=3200,
+                 since_id=None, metrics=None, max_empty_pages=None):
+        """
+        Store the API handle and
+        paging limits. When since_id
+        is given only newer posts
+        are fetched. API calls are
+        counted and timed in metrics.
+        """
+        self.api = api
+        self.target = target
+        self.page_size = page_size
+        self.history_limit = history_limit
+        self.since_id = since_id
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.max_empty_pages = max_empty_pages
+        self.pages_fetched = 0
+
+    def pages(self):
+        """
+        Generator yielding one page of
+        raw post JSON at a time, newest
+        first, until the timeline or the
+        history limit is exhausted.
+
+        X drops replies and reposts after
+        taking count posts, so a window of
+        nothing but those comes back empty.
+        It is then asked for again unfiltered
+        to step past it, and the walk only
+        ends once the unfiltered window is
+        exhausted or stops moving, or after
+        max_empty_pages such windows in a
+        row when a cap is set.
+        """
+        max_id = None
+        fetched = 0
+        empty_pages = 0
+
+        while fetched < self.history_limit:
+            params = {
+                'screen_name': self.target,
+                'exclude_replies': True,
+                'include_rts': False,
+                'count': self.page_size,
+                'tweet_mode': 'extended'
+            }
+            if max_id is not None:
+                params['max_id'] = max_id
+            if self.since_id is not None:
+                params['since_id'] = self.since_id
+
+            statuses = self.user_timeline(params)
+            unfiltered = False
+            if not statuses:
+                params.update({'exclude_replies': False, 'include_rts': True})
+                statuses = self.user_timeline(params)
+                unfiltered = True
+                if not statuses:
+                    return
+
+            page = []
+            for status in statuses:
+                tweet = status._json
+                # max_id is inclusive, skip anything already seen
+                if max_id is not None and tweet.get('id', 0) > max_id:
+                    continue
+                if self.since_id is not None and tweet.get('id', 0) <= self.since_id:
+                    continue
+                if unfiltered and is_reply_or_repost(tweet):
+                    continue
+                page.append(tweet)
+
+            ids = [s._json['id'] for s in statuses if s._json.get('id') is not None]
+            if not ids:
+                if page:
+                    yield page
+                return
+            next_max_id = min(ids) - 1
+            if max_id is not None and next_max_id >= max_id:
+                # The window has stopped moving
+                if page:
+                    yield page
+                return
+
+            if page:
+                empty_pages = 0
+                fetched += len(page)
+                yield page
+            else:
+                empty_pages += 1
+                if (self.max_empty_pages is not None and
+                        empty_pages >= self.max_empty_pages):
+                    print("Warning: stopped reading %s's timeline after %d windows "
+                          "of only replies and reposts, older posts were not read"
+                          % (self.target, empty_pages))
+                    return
+            max_id = next_max_id
+
+    def user_timeline(self, params):
+        """
+        Request one window of
+        the timeline
+        """
+        # Includes any rate limit wait tweepy sleeps through
+        with self.metrics.timer('fetch'):
+            statuses = self.api.user_timeline(**params)
+        self.metrics.add('api_calls')
+        self.pages_fetched += 1
+        return statuses
+
+    def prefetch(self, depth=1):
+        """
+        Iterate over pages while the next
+        page is fetched on a background
+        thread. At most depth pages are
+        held ahead of the consumer.
+        """
+        return PagePrefetcher(self.pages(), depth)
+
+
+class PagePrefetcher():
+    """
+    Class to run a page generator on a
+    background thread, handing pages to
+    the consumer through a bounded queue
+    """
+
+    _done = object()
+
+    def __init__(self, page_iter, depth=1):
+        """
+        Start pulling pages from
+        page_iter immediately
+        """
+        self.page_iter = page_iter
+        self.pages = queue.Queue(maxsize=max(1, depth))
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        """
+        Producer loop, exceptions are
+        passed to the consumer
+        """
+        try:
+            for page in self.page_iter:
+                if not self._put(('page', page)):
+                    return
+            self._put(('done', self._done))
+        except Exception as e:
+            self._put(('error', e))
+
+    def _put(self, item):
+        """
+        Put an item on the queue, giving
+        up if the consumer has gone away
+        """
+        while not self.stopped.is_set():
+            try:
+                self.pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self):
+        try:
+            while True:
+                kind, value = self.pages.get()
+                if kind == 'page':
+                    yield value
+                elif kind == 'error':
+                    raise value
+                else:
+                    return
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Stop the producer thread
+        """
+        self.stopped.set()
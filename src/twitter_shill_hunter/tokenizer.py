@@ -0,0 +1,208 @@
+import re
+import threading
+from array import array
+from .text_normalizer import tweet_view
+
+# Words, allowing inner apostrophes (e.g. "don't")
+TOKEN_RE = re.compile(r"\w+(?:'\w+)*")
+
+# Links and mentions are not tokenized. Nearly every one is new,
+# so interning them would grow the vocabulary without bound.
+SKIP_RE = re.compile(r"(?:https?://|www\.)\S+|(?<!\w)@\w+")
+
+
+def blank_skipped(text):
+    """
+    Blank out links and mentions with
+    spaces, keeping the length of the text
+    """
+    if '/' not in text and '@' not in text and 'www.' not in text:
+        return text
+    return SKIP_RE.sub(lambda m: ' ' * len(m.group()), text)
+
+
+class Vocabulary():
+    """
+    Class to intern case folded tokens as
+    integer ids. One vocabulary is shared by
+    every tweet and plugin in a process, so
+    plugins can key their word lists and
+    caches by id instead of by string.
+
+    The vocabulary is cleared between runs,
+    and between pages once it holds more than
+    max_size tokens. Each clear starts a new
+    generation, and caches keyed by id must
+    be dropped when the generation changes.
+    """
+
+    def __init__(self, max_size=None):
+        self.ids = {}
+        self.words = []
+        self.max_size = max_size
+        self.generation = 0
+        self.lock = threading.Lock()
+
+    def intern(self, word):
+        """
+        Return the id of word,
+        adding it if it is new
+        """
+        token_id = self.ids.get(word)
+        if token_id is None:
+            with self.lock:
+                token_id = self.ids.get(word)
+                if token_id is None:
+                    token_id = len(self.words)
+                    self.words.append(word)
+                    self.ids[word] = token_id
+        return token_id
+
+    def get(self, word, default=None):
+        """
+        Return the id of word without
+        adding it
+        """
+        return self.ids.get(word, default)
+
+    def word(self, token_id):
+        """
+        Return the token with an id
+        """
+        return self.words[token_id]
+
+    def clear(self):
+        """
+        Forget every token, starting
+        a new generation of ids
+        """
+        with self.lock:
+            self.ids = {}
+            self.words = []
+            self.generation += 1
+
+    def trim(self):
+        """
+        Clear the vocabulary if it has grown
+        past max_size. Only call this between
+        pages, when no tokens are in use.
+        """
+        if self.max_size is not None and len(self.words) > self.max_size:
+            self.clear()
+            return True
+        return False
+
+    def __len__(self):
+        return len(self.words)
+
+
+vocabulary = Vocabulary()
+
+
+def rebuild_tokens(words, starts, ends):
+    """
+    Recreate tokens sent from another process,
+    interning them in this process's vocabulary
+    """
+    if words is None:
+        # Sent after the sender's vocabulary was cleared,
+        # so the tweet is tokenized again where it is used
+        return TokenizedText(array('I'), array('I'), array('I'), -1)
+    ids = array('I', map(vocabulary.intern, words))
+    return TokenizedText(ids, array('I', starts), array('I', ends), vocabulary.generation)
+
+
+class TokenizedText():
+    """
+    Class to hold a tweet's tokens as arrays of
+    vocabulary ids with the character offsets
+    of each token in the normalised text, and
+    the vocabulary generation the ids are from
+    """
+
+    __slots__ = ('ids', 'starts', 'ends', 'generation')
+
+    def __init__(self, ids, starts, ends, generation=None):
+        self.ids = ids
+        self.starts = starts
+        self.ends = ends
+        self.generation = vocabulary.generation if generation is None else generation
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return zip(self.ids, self.starts, self.ends)
+
+    def words(self):
+        """
+        Return the case folded
+        token strings
+        """
+        words = vocabulary.words
+        return [words[i] for i in self.ids]
+
+    def __reduce__(self):
+        # Ids are only meaningful in this process
+        if self.generation != vocabulary.generation:
+            return (rebuild_tokens, (None, None, None))
+        return (rebuild_tokens, (self.words(), self.starts.tolist(), self.ends.tolist()))
+
+
+class Tokenizer():
+    """
+    Class to split normalised text into
+    case folded tokens, interned in the
+    shared vocabulary. Links, mentions and
+    numbers are skipped.
+    """
+
+    def tokenize(self, text, folded=None):
+        """
+        Return the tokens of normalised text,
+        using its case folded form if given
+        """
+        if folded is None:
+            folded = text.casefold()
+        generation = vocabulary.generation
+        intern = vocabulary.intern
+        ids = array('I')
+        starts = array('I')
+        ends = array('I')
+        if len(folded) == len(text):
+            # Case folding kept every offset
+            for m in TOKEN_RE.finditer(blank_skipped(folded)):
+                word = m.group()
+                # Numbers, like links, are nearly all new
+                if word.isdigit():
+                    continue
+                ids.append(intern(word))
+                start, end = m.span()
+                starts.append(start)
+                ends.append(end)
+        else:
+            for m in TOKEN_RE.finditer(blank_skipped(text)):
+                word = m.group()
+                if word.isdigit():
+                    continue
+                ids.append(intern(word.casefold()))
+                start, end = m.span()
+                starts.append(start)
+                ends.append(end)
+        return TokenizedText(ids, starts, ends, generation)
+
+
+_tokenizer = Tokenizer()
+
+
+def tweet_tokens(tweet):
+    """
+    Return a tweet's tokens, tokenizing it on
+    first use or if the vocabulary has been
+    cleared since
+    """
+    tokens = tweet.get('tokens')
+    if tokens is None or tokens.generation != vocabulary.generation:
+        tokens = tweet['tokens'] = _tokenizer.tokenize(
+            tweet_view(tweet, 'normalized'), tweet_view(tweet, 'folded'))
+    return tokens
@@ -0,0 +1,115 @@
+import datetime
+import math
+import sys
+
+# The timestamp format of the X API and its archives
+CREATED_AT_FORMAT = '%a %b %d %H:%M:%S %z %Y'
+
+
+def parse_timestamp(created_at):
+    """
+    Return a post's creation time in seconds
+    since the epoch, or NaN if it cannot
+    be read
+    """
+    if not created_at:
+        return math.nan
+    try:
+        return datetime.datetime.strptime(created_at, CREATED_AT_FORMAT).timestamp()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.datetime.fromisoformat(
+            str(created_at).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return math.nan
+
+
+class TweetRecord():
+    """
+    Class to hold one extracted tweet. Fields
+    live in slots rather than a dict, sources
+    are interned so repeated client names are
+    stored once, and the timestamp, normalised
+    views and tokens are filled in on first use. Records
+    can be read like the dicts plugins were
+    written for, with date an alias of
+    created_at.
+    """
+
+    __slots__ = ('id', 'text', 'created_at', '_timestamp', 'coordinates', 'place', 'source',
+                 'views', 'tokens')
+
+    # Keys readable with record[key]
+    FIELDS = ('date', 'id', 'text', 'coordinates', 'place', 'source', 'created_at',
+              'timestamp', 'views', 'tokens')
+
+    def __init__(self, text, created_at, coordinates=None, place=None, source=None,
+                 timestamp=None, post_id=None):
+        self.id = post_id
+        self.text = text
+        self.created_at = created_at
+        # Parsed when first read, as only some sinks need it
+        self._timestamp = timestamp
+        self.coordinates = coordinates
+        self.place = place
+        self.source = sys.intern(source) if isinstance(source, str) else source
+        self.views = None
+        self.tokens = None
+
+    @property
+    def timestamp(self):
+        """
+        Seconds since the epoch the
+        post was created at, NaN if
+        created_at cannot be read
+        """
+        if self._timestamp is None:
+            self._timestamp = parse_timestamp(self.created_at)
+        return self._timestamp
+
+    def __getitem__(self, key):
+        if key == 'date':
+            return self.created_at
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in ('views', 'tokens'):
+            raise KeyError("Only views and tokens can be set on a tweet record")
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.FIELDS
+
+    def get(self, key, default=None):
+        """
+        Return a field, or default
+        if there is no such field
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self.FIELDS)
+
+    def to_dict(self):
+        """
+        Return the fields as a plain dict,
+        as extract_text used to build
+        """
+        return {
+            'date': self.created_at,
+            'id': self.id,
+            'text': self.text,
+            'coordinates': self.coordinates,
+            'place': self.place,
+            'source': self.source,
+            'created_at': self.created_at,
+        }
+
+    def __repr__(self):
+        return 'TweetRecord(%r, %r)' % (self.created_at, self.text)
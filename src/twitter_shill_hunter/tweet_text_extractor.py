@@ -1,9 +1,22 @@
+from .tweet_record import TweetRecord
+
+
+def post_id(tweet):
+    """
+    Return a post's id as a string,
+    or None if it has none
+    """
+    if tweet.get('id_str'):
+        return tweet['id_str']
+    if tweet.get('id') is not None:
+        return str(tweet['id'])
+    return None
 
 
 class TweetTextExtractor():
 
-    tweet_json = {}
-    processed_tweets = []
+    tweet_json = ()
+    processed_tweets = ()
 
     def __init__(self, tweet_json):
         """
@@ -13,7 +26,26 @@ class TweetTextExtractor():
         """
 
         self.tweet_json = tweet_json
+        self.processed_tweets = []
 
+    def records(self):
+        """
+        Generator yielding a TweetRecord
+        for each tweet, ready for
+        processing.
+        """
+
+        for i in self.tweet_json:
+            # Handle both 'text' and 'full_text' fields for compatibility
+            # Archived posts may omit fields the API always sends
+            # Views and tokens are built by the first plugin reading them
+            yield TweetRecord(
+                i.get('full_text', i.get('text', '')),
+                i['created_at'],
+                coordinates=i.get('coordinates'),
+                place=i.get('place'),
+                source=i.get('source'),
+                post_id=post_id(i))
 
     def extract_text(self):
         """
@@ -21,20 +53,6 @@ class TweetTextExtractor():
         from tweets ready for
         processing.
         """
-        
-        for i in self.tweet_json:
-            tweet_data = {}
-            tweet_data['date'] = i['created_at']
-            # Handle both 'text' and 'full_text' fields for compatibility
-            tweet_data['text'] = i.get('full_text', i.get('text', ''))
-            tweet_data['coordinates'] = i['coordinates']
-            tweet_data['place'] = i['place']
-            tweet_data['source'] = i['source']
-            tweet_data['created_at'] = i['created_at']
-            self.processed_tweets.append(tweet_data)
 
+        self.processed_tweets = list(self.records())
         return self.processed_tweets
-
-            
-  
-     
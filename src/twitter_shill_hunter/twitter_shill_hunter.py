@@ -1,8 +1,21 @@
-import pkg_resources
 import json
-import inspect
-import tweepy
+import time
+import collections
 from .tweet_text_extractor import TweetTextExtractor 
+from .timeline_fetcher import TimelineFetcher, PagePrefetcher
+from .archive_reader import ArchiveReader
+from .timeline_cache import TimelineCache
+from .processor_scheduler import ProcessorScheduler, RemoteProcessor, execution_mode, PROCESS
+from .run_context import RunContext, context_fields
+from .plugin_registry import get_registry
+from .sinks import get_sink
+from .metrics import Metrics, RateLimitHandler
+from .profiler import get_profiler
+from .tokenizer import vocabulary
+from .lazy_import import lazy_import
+
+# Only imported when posts are read from the X API
+tweepy = lazy_import('tweepy')
 
 class TwitterShillHunter():
     """
@@ -15,11 +28,33 @@ class TwitterShillHunter():
     consumer_key = ''
     consumer_secret = ''
     target = ''
+    targets = []
+    archives = []
+    max_concurrent_targets = 4
+    target_summaries = []
+    timeline_cache = None
+    refresh = False
     api = None
     search_terms = []
+    search_options = {}
+    sentiment_options = {}
+    spelling_options = {}
     dialect = ''
     processors_plugin = 'twitter_shill_hunter.processors'
     loaded_processor_plugin_dict = {}
+    processor_instances = {}
+    processor_fields = {}
+    processor_execution = 'serial'
+    context = None
+    scheduler = None
+    sink = None
+    metrics = None
+    metrics_options = {}
+    profiler = None
+    page_size = 200
+    history_limit = 3200
+    max_empty_pages = None
+    vocabulary_size = 200000
 
     def __init__(self, yaml_dict, plugins):
         """"
@@ -28,32 +63,114 @@ class TwitterShillHunter():
         application
         """
         yaml_to_dict = yaml_dict["config"]
-        self.access_token = yaml_to_dict['access_token']
-        self.access_secret = yaml_to_dict['access_secret']
-        self.consumer_key = yaml_to_dict['consumer_key']
-        self.consumer_secret = yaml_to_dict['consumer_secret']
-        self.target = yaml_to_dict['target']
+        self.metrics = Metrics()
+        self.metrics_options = yaml_to_dict.get('metrics') or {}
+        # Credentials are not needed when reading archives
+        self.access_token = yaml_to_dict.get('access_token', '')
+        self.access_secret = yaml_to_dict.get('access_secret', '')
+        self.consumer_key = yaml_to_dict.get('consumer_key', '')
+        self.consumer_secret = yaml_to_dict.get('consumer_secret', '')
+        self.targets = self.get_targets(yaml_to_dict)
+        self.archives = self.get_archives(yaml_to_dict)
+        self.target = self.targets[0] if self.targets else ''
         self.search_terms = yaml_to_dict['search_terms'] 
+        self.search_options = yaml_to_dict.get('search_options') or {}
+        self.sentiment_options = yaml_to_dict.get('sentiment') or {}
+        self.spelling_options = yaml_to_dict.get('spelling') or {}
         self.dialect = yaml_to_dict['dialect']
-        self.loaded_processor_plugin_dict = self.load_plugins(
-            self.processors_plugin,
-            plugins)
- 
-        print("Processing target %s" % self.target)
+        self.page_size = yaml_to_dict.get('page_size', self.page_size)
+        self.history_limit = yaml_to_dict.get(
+            'history_limit', self.history_limit)
+        self.max_empty_pages = yaml_to_dict.get(
+            'max_empty_pages', self.max_empty_pages)
+        # Token ids are kept for one run, and bounded within it
+        self.vocabulary_size = yaml_to_dict.get('vocabulary_size', self.vocabulary_size)
+        vocabulary.max_size = self.vocabulary_size
+        vocabulary.clear()
+        self.max_concurrent_targets = yaml_to_dict.get(
+            'max_concurrent_targets', self.max_concurrent_targets)
+        self.refresh = yaml_to_dict.get('refresh', False)
+        if yaml_to_dict.get('cache'):
+            self.timeline_cache = TimelineCache.from_config(yaml_to_dict['cache'])
+            self.timeline_cache.evict()
+        self.processor_execution = yaml_to_dict.get(
+            'processor_execution', self.processor_execution)
+        if self.processor_execution not in ('serial', 'parallel', 'process'):
+            raise ValueError("processor_execution must be serial, parallel or process, not %r"
+                             % self.processor_execution)
+        self.scheduler = ProcessorScheduler(self.metrics)
+        self.profiler = get_profiler(yaml_to_dict.get('profile'))
+        self.sink = get_sink(yaml_to_dict.get('output'))
+        self.context = RunContext.from_settings(self)
+        self.processor_instances = {}
+        self.processor_fields = {}
+        with self.metrics.timer('load_plugins'):
+            self.loaded_processor_plugin_dict = self.load_plugins(
+                self.processors_plugin,
+                plugins)
+            for p in self.loaded_processor_plugin_dict:
+                self.get_processor(p)
+        with self.metrics.timer('warm_up'):
+            self.warm_up_processors()
+
+        if self.archives:
+            self.run_batch(self.archives, self.read_archive)
+            return
 
         self.authenticate()
-        self.initiate_api()
+
+        with RateLimitHandler(self.metrics).installed():
+            if len(self.targets) > 1:
+                self.run_batch(self.targets, self.fetch_pages)
+            else:
+                print("Processing target %s" % self.target)
+                self.initiate_api()
  
 
+    def get_targets(self, config):
+        """
+        Build the list of targets from the
+        config. A single target, a list of
+        targets and a file with one target
+        per line are all accepted.
+        """
+        targets = []
+        if config.get('target'):
+            targets.append(config['target'])
+        targets.extend(config.get('targets') or [])
+
+        if config.get('target_file'):
+            with open(config['target_file'], 'r') as target_file:
+                for line in target_file:
+                    line = line.strip()
+                    if line and not line.startswith('#'):
+                        targets.append(line)
+
+        # Drop repeats but keep the given order
+        return list(collections.OrderedDict.fromkeys(targets))
+
+
+    def get_archives(self, config):
+        """
+        Return the list of local archive
+        files to read instead of calling
+        the X API
+        """
+        archives = config.get('archive') or []
+        if isinstance(archives, str):
+            archives = [archives]
+        return list(archives)
+
+
     def load_plugins(self, cat, plugins):
         """
         Load the plugin and store object in array
         """
         plugin_dict = {}
+        registry = get_registry(cat)
         for p in plugins[cat]:
             print("Loading plugin %s" % p)
-            plugin_dict[p] = pkg_resources.load_entry_point(
-                'twitter_shill_hunter', cat, p)
+            plugin_dict[p] = registry.load(p)
         return plugin_dict
 
 
@@ -69,53 +186,266 @@ class TwitterShillHunter():
         self.api = tweepy.API(auth, wait_on_rate_limit=True)
  
 
+    def fetch_pages(self, target):
+        """
+        Start fetching a target's timeline in
+        the background and return the page
+        iterator
+        """
+        fetcher = TimelineFetcher(
+            self.api, target,
+            page_size=self.page_size,
+            history_limit=self.history_limit,
+            metrics=self.metrics,
+            max_empty_pages=self.max_empty_pages)
+        if self.timeline_cache is not None:
+            return PagePrefetcher(
+                self.timeline_cache.pages(fetcher, refresh=self.refresh))
+        return fetcher.prefetch()
+
+    def read_archive(self, path):
+        """
+        Start streaming an archive's posts
+        from disk in the background and
+        return the page iterator
+        """
+        reader = ArchiveReader(path, page_size=self.page_size)
+        return PagePrefetcher(reader.pages())
+
     def initiate_api(self):
         """
-        Initiate X API and grab list of target's posts.
-        """
-        try: 
-            # Get user timeline using tweepy
-            get_tweets = self.api.user_timeline(
-                screen_name=self.target, 
-                exclude_replies=True,
-                include_rts=False,
-                count=200,
-                tweet_mode='extended'
-            )
-            
-            # Convert tweepy Status objects to dict format expected by TweetTextExtractor
-            tweets_json = []
-            for tweet in get_tweets:
-                tweets_json.append(tweet._json)
-            
-            tweet_extractor = TweetTextExtractor(tweets_json)
-            tweets_and_time = tweet_extractor.extract_text()
-            self.load_processors(tweets_and_time)
+        Initiate X API and walk the target's posts
+        page by page. The next page is fetched in
+        the background while processors work on
+        the current one.
+        """
+        try:
+            with self.metrics.timer('run'):
+                self.target_summaries = [
+                    self.process_target(self.target, self.fetch_pages(self.target))]
+        finally:
+            self.finish_run()
+
+    def run_batch(self, targets, get_pages):
+        """
+        Screen every target with the same warm
+        processor instances. get_pages starts
+        reading a target's posts, and up to
+        max_concurrent_targets are read ahead
+        of the one being analysed.
+        """
+        pending = collections.deque(targets)
+        in_flight = collections.deque()
+        self.target_summaries = []
+
+        try:
+            with self.metrics.timer('run'):
+                while pending or in_flight:
+                    while pending and len(in_flight) < self.max_concurrent_targets:
+                        target = pending.popleft()
+                        in_flight.append((target, get_pages(target)))
+
+                    target, pages = in_flight.popleft()
+                    print("Processing target %s" % target)
+                    self.target_summaries.append(self.process_target(target, pages))
+        finally:
+            for target, pages in in_flight:
+                pages.close()
+            self.finish_run()
+
+        self.print_batch_summary(self.target_summaries)
+
+    def process_target(self, target, pages):
+        """
+        Run the processors over each page
+        of one target and return a summary
+        of the run
+        """
+        self.target = target
+        self.context.target = target
+        self.reset_processors()
+        summary = {
+            'target': target,
+            'posts': 0,
+            'pages': 0,
+            'seconds': 0.0,
+            'error': None
+        }
+        started = time.perf_counter()
+        metrics = self.metrics
+        metrics.add('targets')
+
+        try:
+            pages = iter(pages)
+            while True:
+                # Time spent waiting for the reader or fetcher
+                with metrics.timer('wait'):
+                    page = next(pages, None)
+                if page is None:
+                    break
+                with metrics.timer('extract'):
+                    tweet_extractor = TweetTextExtractor(page)
+                    tweets_and_time = tweet_extractor.extract_text()
+                with metrics.timer('processors'):
+                    results = self.load_processors(tweets_and_time)
+                with metrics.timer('output'):
+                    self.sink.write_page(target, tweets_and_time, results)
+                summary['posts'] += len(tweets_and_time)
+                summary['pages'] += 1
+                metrics.add('pages')
+                # Every plugin is done with the page's token ids
+                if vocabulary.trim():
+                    metrics.add('vocabulary_resets')
+                metrics.add('posts', len(tweets_and_time))
+
+            # Processors still report on an empty timeline
+            if summary['pages'] == 0:
+                self.sink.write_page(target, [], self.load_processors([]))
+            with metrics.timer('summaries'):
+                self.write_summaries(target)
         except Exception as e:
-            print(e) 
+            summary['error'] = str(e)
+            metrics.add('errors')
+            print(e)
+
+        summary['seconds'] = time.perf_counter() - started
+        with metrics.timer('output'):
+            self.sink.end_target(target, summary)
+        return summary
+
+    def write_summaries(self, target):
+        """
+        Hand each processor's summary
+        of the target to the sink
+        """
+        for p in self.processor_instances:
+            summary = getattr(self.processor_instances[p], 'summary', None)
+            if callable(summary):
+                result = summary()
+                if isinstance(result, dict):
+                    self.sink.write_summary(target, p, result)
+
+    def print_batch_summary(self, summaries):
+        """
+        Print one line per target
+        screened in the batch
+        """
+        print("-------------------------")
+        print("Batch summary")
+        print("%-20s %8s %6s %9s  %s" % (
+            'target', 'posts', 'pages', 'seconds', 'status'))
+        for s in summaries:
+            status = 'error: %s' % s['error'] if s['error'] else 'ok'
+            print("%-20s %8d %6d %9.2f  %s" % (
+                s['target'], s['posts'], s['pages'], s['seconds'], status))
 
     def load_processors(self, tweets_and_time):
         """
         Load processors and pass
         list of tweets and their time
-        stamps in
+        stamps in. Processors run one
+        after another unless execution is
+        parallel or process, and their
+        results are returned by name.
         """
  
+        calls = []
         for p in self.loaded_processor_plugin_dict:
-            dynamic_args = []
+            processor = self.get_processor(p)
+            dynamic_args = [tweets_and_time] + self.context.values(self.processor_fields[p])
+            calls.append((p, processor, dynamic_args))
 
-            params_to_pass = inspect.getfullargspec(self.loaded_processor_plugin_dict[p]().process_data)
+        if self.processor_execution == 'serial':
+            return dict((p, self.call_processor(p, args)) for p, processor, args in calls)
+        return self.scheduler.run(calls)
 
-            dynamic_args.append(tweets_and_time)
-            for f in params_to_pass.args:
-                if f != 'tweets_and_date' and f != 'self': 
-                    dynamic_args.append(eval('self.'+f))
+    def warm_up_processors(self):
+        """
+        Let processors start slow resources
+        in the background before the first
+        page arrives
+        """
+        for p in self.processor_instances:
+            processor_class = self.loaded_processor_plugin_dict[p]
+            warm_up = getattr(self.processor_instances[p], 'warm_up', None)
+            if callable(warm_up):
+                warm_up(*self.context.values(context_fields(processor_class, 'warm_up')))
 
-               
-            self.call_processor(p, dynamic_args)
+    def get_processor(self, p):
+        """
+        Return the processor instance, created
+        once and reused for every page and
+        every target of the run. CPU bound
+        processors get a worker process only
+        when execution is process. When the run is
+        profiled every processor is wrapped,
+        in its worker if it has one.
+        """
+        if p not in self.processor_instances:
+            processor_class = self.loaded_processor_plugin_dict[p]
+            # The fields are resolved once, before any work is done
+            self.processor_fields[p] = context_fields(processor_class)
+            if (self.processor_execution == 'process' and
+                    execution_mode(processor_class) == PROCESS):
+                self.processor_instances[p] = RemoteProcessor(
+                    processor_class, self.profiler, p, self.vocabulary_size)
+            elif self.profiler is not None:
+                self.processor_instances[p] = self.profiler.wrap(p, processor_class())
+            else:
+                self.processor_instances[p] = processor_class()
+        return self.processor_instances[p]
 
     def call_processor(self, p, args):
-            self.loaded_processor_plugin_dict[p]().process_data(*args)
+            return self.scheduler.call(p, self.get_processor(p), args)
+
+    def reset_processors(self):
+        """
+        Clear per target state held
+        by processors
+        """
+        for p in self.processor_instances:
+            reset = getattr(self.processor_instances[p], 'reset', None)
+            if callable(reset):
+                reset()
+
+    def finish_run(self):
+        """
+        Collect the processors' counters, close
+        the processors and the sink, then export
+        the run's metrics
+        """
+        try:
+            self.collect_counters()
+            self.close_processors()
+            self.sink.close()
+        finally:
+            self.metrics.export(self.metrics_options)
+
+    def collect_counters(self):
+        """
+        Add the counters processors keep,
+        such as cache hits, to the metrics
+        """
+        for p in self.processor_instances:
+            counters = getattr(self.processor_instances[p], 'counters', None)
+            if callable(counters):
+                values = counters()
+                if isinstance(values, dict):
+                    for name, value in values.items():
+                        self.metrics.set(name, value, p)
+
+    def close_processors(self):
+        """
+        Let processors holding external
+        resources release them
+        """
+        for p in self.processor_instances:
+            close = getattr(self.processor_instances[p], 'close', None)
+            if callable(close):
+                close()
+        if self.scheduler is not None:
+            self.scheduler.close()
+
         
 
   
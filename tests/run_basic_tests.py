@@ -12,6 +12,27 @@ sys.path.insert(0, os.path.dirname(__file__))
 from test_tweet_text_extractor import TestTweetTextExtractor
 from test_input import TestProcessInputYaml
 from test_geo_analysis import TestGeoAnalysis
+from test_timeline_fetcher import TestTimelineFetcher
+from test_archive_reader import TestArchiveReader
+from test_timeline_cache import TestTimelineCache
+from test_polarity_cache import TestPolarityCache
+from test_processor_scheduler import TestProcessorScheduler
+from test_language_tool_pool import TestLanguageToolPool
+from test_batch_checker import TestBatchChecker
+from test_spelling_index import TestSpellingIndex, TestSharedIndexes
+from test_text_normalizer import TestTextNormalizer
+from test_tokenizer import TestTokenizer
+from test_tweet_record import TestTweetRecord
+from test_run_context import TestRunContext
+from test_plugin_registry import TestPluginRegistry
+from test_lazy_import import TestLazyImport
+from test_startup_profile import TestStartupProfile
+from test_sinks import TestSinks
+from test_columnar_sink import TestColumnarSink
+from test_synthetic_corpus import TestSyntheticCorpus
+from test_benchmark import TestBenchmark
+from test_metrics import TestMetrics
+from test_profiler import TestProfiler
 
 def run_basic_tests():
     """Run tests that don't require external dependencies"""
@@ -22,6 +43,28 @@ def run_basic_tests():
     suite.addTest(loader.loadTestsFromTestCase(TestTweetTextExtractor))
     suite.addTest(loader.loadTestsFromTestCase(TestProcessInputYaml))
     suite.addTest(loader.loadTestsFromTestCase(TestGeoAnalysis))
+    suite.addTest(loader.loadTestsFromTestCase(TestTimelineFetcher))
+    suite.addTest(loader.loadTestsFromTestCase(TestArchiveReader))
+    suite.addTest(loader.loadTestsFromTestCase(TestTimelineCache))
+    suite.addTest(loader.loadTestsFromTestCase(TestPolarityCache))
+    suite.addTest(loader.loadTestsFromTestCase(TestProcessorScheduler))
+    suite.addTest(loader.loadTestsFromTestCase(TestLanguageToolPool))
+    suite.addTest(loader.loadTestsFromTestCase(TestBatchChecker))
+    suite.addTest(loader.loadTestsFromTestCase(TestSpellingIndex))
+    suite.addTest(loader.loadTestsFromTestCase(TestSharedIndexes))
+    suite.addTest(loader.loadTestsFromTestCase(TestTextNormalizer))
+    suite.addTest(loader.loadTestsFromTestCase(TestTokenizer))
+    suite.addTest(loader.loadTestsFromTestCase(TestTweetRecord))
+    suite.addTest(loader.loadTestsFromTestCase(TestRunContext))
+    suite.addTest(loader.loadTestsFromTestCase(TestPluginRegistry))
+    suite.addTest(loader.loadTestsFromTestCase(TestLazyImport))
+    suite.addTest(loader.loadTestsFromTestCase(TestStartupProfile))
+    suite.addTest(loader.loadTestsFromTestCase(TestSinks))
+    suite.addTest(loader.loadTestsFromTestCase(TestColumnarSink))
+    suite.addTest(loader.loadTestsFromTestCase(TestSyntheticCorpus))
+    suite.addTest(loader.loadTestsFromTestCase(TestBenchmark))
+    suite.addTest(loader.loadTestsFromTestCase(TestMetrics))
+    suite.addTest(loader.loadTestsFromTestCase(TestProfiler))
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
@@ -14,11 +14,34 @@ sys.path.insert(0, os.path.dirname(__file__))
 from test_tweet_text_extractor import TestTweetTextExtractor
 from test_input import TestProcessInputYaml
 from test_geo_analysis import TestGeoAnalysis
+from test_timeline_fetcher import TestTimelineFetcher
+from test_archive_reader import TestArchiveReader
+from test_timeline_cache import TestTimelineCache
+from test_polarity_cache import TestPolarityCache
+from test_processor_scheduler import TestProcessorScheduler
+from test_language_tool_pool import TestLanguageToolPool
+from test_batch_checker import TestBatchChecker
+from test_spelling_index import TestSpellingIndex, TestSharedIndexes
+from test_text_normalizer import TestTextNormalizer
+from test_tokenizer import TestTokenizer
+from test_tweet_record import TestTweetRecord
+from test_run_context import TestRunContext
+from test_plugin_registry import TestPluginRegistry
+from test_lazy_import import TestLazyImport
+from test_startup_profile import TestStartupProfile
+from test_sinks import TestSinks
+from test_columnar_sink import TestColumnarSink
+from test_synthetic_corpus import TestSyntheticCorpus
+from test_benchmark import TestBenchmark
+from test_metrics import TestMetrics
+from test_profiler import TestProfiler
 
 # Import test classes that require external dependencies
 # These will fail if dependencies are not installed, but import errors are resolved
 try:
     from test_grammar_analysis import TestGrammarAnalysis
+    from test_dialect_matcher import TestDialectMatcher
+    from test_dialect_index import TestDialectIndex
     grammar_analysis_available = True
 except ImportError as e:
     print(f"Warning: Could not import grammar analysis tests: {e}")
@@ -33,6 +56,8 @@ except ImportError as e:
 
 try:
     from test_sentiment_analysis import TestSentimentAnalysis
+    from test_search_term_matcher import TestSearchTermMatcher
+    from test_batch_scorer import TestBatchVader
     sentiment_analysis_available = True
 except ImportError as e:
     print(f"Warning: Could not import sentiment analysis tests: {e}")
@@ -54,16 +79,42 @@ def run_tests():
     suite.addTest(loader.loadTestsFromTestCase(TestTweetTextExtractor))
     suite.addTest(loader.loadTestsFromTestCase(TestProcessInputYaml))
     suite.addTest(loader.loadTestsFromTestCase(TestGeoAnalysis))
+    suite.addTest(loader.loadTestsFromTestCase(TestTimelineFetcher))
+    suite.addTest(loader.loadTestsFromTestCase(TestArchiveReader))
+    suite.addTest(loader.loadTestsFromTestCase(TestTimelineCache))
+    suite.addTest(loader.loadTestsFromTestCase(TestPolarityCache))
+    suite.addTest(loader.loadTestsFromTestCase(TestProcessorScheduler))
+    suite.addTest(loader.loadTestsFromTestCase(TestLanguageToolPool))
+    suite.addTest(loader.loadTestsFromTestCase(TestBatchChecker))
+    suite.addTest(loader.loadTestsFromTestCase(TestSpellingIndex))
+    suite.addTest(loader.loadTestsFromTestCase(TestSharedIndexes))
+    suite.addTest(loader.loadTestsFromTestCase(TestTextNormalizer))
+    suite.addTest(loader.loadTestsFromTestCase(TestTokenizer))
+    suite.addTest(loader.loadTestsFromTestCase(TestTweetRecord))
+    suite.addTest(loader.loadTestsFromTestCase(TestRunContext))
+    suite.addTest(loader.loadTestsFromTestCase(TestPluginRegistry))
+    suite.addTest(loader.loadTestsFromTestCase(TestLazyImport))
+    suite.addTest(loader.loadTestsFromTestCase(TestStartupProfile))
+    suite.addTest(loader.loadTestsFromTestCase(TestSinks))
+    suite.addTest(loader.loadTestsFromTestCase(TestColumnarSink))
+    suite.addTest(loader.loadTestsFromTestCase(TestSyntheticCorpus))
+    suite.addTest(loader.loadTestsFromTestCase(TestBenchmark))
+    suite.addTest(loader.loadTestsFromTestCase(TestMetrics))
+    suite.addTest(loader.loadTestsFromTestCase(TestProfiler))
     
     # Add test cases that require external dependencies (if available)
     if grammar_analysis_available:
         suite.addTest(loader.loadTestsFromTestCase(TestGrammarAnalysis))
+        suite.addTest(loader.loadTestsFromTestCase(TestDialectMatcher))
+        suite.addTest(loader.loadTestsFromTestCase(TestDialectIndex))
     
     if spelling_analysis_available:
         suite.addTest(loader.loadTestsFromTestCase(TestSpellingAnalysis))
     
     if sentiment_analysis_available:
         suite.addTest(loader.loadTestsFromTestCase(TestSentimentAnalysis))
+        suite.addTest(loader.loadTestsFromTestCase(TestSearchTermMatcher))
+        suite.addTest(loader.loadTestsFromTestCase(TestBatchVader))
     
     if twitter_shill_hunter_available:
         suite.addTest(loader.loadTestsFromTestCase(TestTwitterShillHunter))
@@ -0,0 +1,126 @@
+"""
+Unit tests for ArchiveReader offline ingestion
+"""
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from twitter_shill_hunter.archive_reader import ArchiveReader
+from mock_data import UK_ENGLISH_TWEETS, US_ENGLISH_TWEETS, MIXED_TWEETS
+
+
+class TestArchiveReader(unittest.TestCase):
+    """Test cases for ArchiveReader"""
+
+    def setUp(self):
+        """Set up a scratch directory for archive files"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def write_file(self, name, content):
+        """Write text content to a file in the scratch directory"""
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_reads_json_array(self):
+        """Test streaming posts from a JSON array file"""
+        path = self.write_file('posts.json', json.dumps(MIXED_TWEETS, indent=2))
+
+        posts = list(ArchiveReader(path).posts())
+
+        self.assertEqual(posts, MIXED_TWEETS)
+
+    def test_reads_json_array_across_chunks(self):
+        """Test that posts split across read chunks are decoded"""
+        path = self.write_file('posts.json', json.dumps(MIXED_TWEETS))
+        reader = ArchiveReader(path)
+        reader.chunk_size = 7
+
+        posts = list(reader.posts())
+
+        self.assertEqual(posts, MIXED_TWEETS)
+
+    def test_reads_jsonl(self):
+        """Test streaming posts from a JSONL file with blank lines"""
+        lines = '\n'.join(json.dumps(t) for t in UK_ENGLISH_TWEETS) + '\n\n'
+        path = self.write_file('posts.jsonl', lines)
+
+        posts = list(ArchiveReader(path).posts())
+
+        self.assertEqual(posts, UK_ENGLISH_TWEETS)
+
+    def test_reads_gzip_jsonl(self):
+        """Test streaming posts from a gzip compressed JSONL file"""
+        path = os.path.join(self.temp_dir, 'posts.jsonl.gz')
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            for tweet in US_ENGLISH_TWEETS:
+                f.write(json.dumps(tweet) + '\n')
+
+        posts = list(ArchiveReader(path).posts())
+
+        self.assertEqual(posts, US_ENGLISH_TWEETS)
+
+    def test_reads_zstd_jsonl(self):
+        """Test streaming posts from a zstd compressed JSONL file"""
+        try:
+            import zstandard
+        except ImportError:
+            self.skipTest("zstandard is not installed")
+
+        path = os.path.join(self.temp_dir, 'posts.jsonl.zst')
+        data = ''.join(json.dumps(t) + '\n' for t in UK_ENGLISH_TWEETS)
+        with open(path, 'wb') as f:
+            f.write(zstandard.ZstdCompressor().compress(data.encode('utf-8')))
+
+        posts = list(ArchiveReader(path).posts())
+
+        self.assertEqual(posts, UK_ENGLISH_TWEETS)
+
+    def test_reads_x_archive_tweets_js(self):
+        """Test reading the X data export tweets.js format"""
+        wrapped = [{'tweet': t} for t in UK_ENGLISH_TWEETS]
+        path = self.write_file(
+            'tweets.js', 'window.YTD.tweets.part0 = ' + json.dumps(wrapped, indent=2))
+
+        posts = list(ArchiveReader(path).posts())
+
+        self.assertEqual(posts, UK_ENGLISH_TWEETS)
+
+    def test_pages_are_bounded(self):
+        """Test that posts are grouped into pages of page_size"""
+        path = self.write_file('posts.json', json.dumps(MIXED_TWEETS * 2))
+
+        pages = list(ArchiveReader(path, page_size=3).pages())
+
+        self.assertEqual([len(p) for p in pages], [3, 3, 2])
+
+    def test_empty_array(self):
+        """Test that an empty archive yields no posts"""
+        path = self.write_file('posts.json', '[]')
+
+        self.assertEqual(list(ArchiveReader(path).pages()), [])
+
+    def test_unterminated_array_raises(self):
+        """Test that a truncated archive is reported"""
+        path = self.write_file('posts.json', json.dumps(MIXED_TWEETS)[:-1])
+
+        with self.assertRaises(ValueError):
+            list(ArchiveReader(path).posts())
+
+    def test_json_without_array_raises(self):
+        """Test that a .json file must hold an array"""
+        path = self.write_file('posts.json', json.dumps(UK_ENGLISH_TWEETS[0]))
+
+        with self.assertRaises(ValueError):
+            list(ArchiveReader(path).posts())
+
+
+if __name__ == '__main__':
+    unittest.main()
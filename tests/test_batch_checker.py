@@ -0,0 +1,248 @@
+"""
+Unit tests for the batched LanguageTool BatchChecker
+"""
+import concurrent.futures
+import re
+import threading
+import time
+import unittest
+from language_tool_python.match import Match
+from twitter_shill_hunter.processors.spelling_analysis.batch_checker import (
+    BatchChecker, match_context, match_field)
+
+
+MISSPELLINGS = {'teh': 'the', 'recieve': 'receive', 'wierd': 'weird'}
+
+
+def make_match(text, offset, length, rule_id):
+    """Build a language_tool_python Match the way the server reports it"""
+    context, offset_in_context = match_context(text, offset, length)
+    return Match({
+        'rule': {'id': rule_id, 'category': {'id': 'TYPOS'}, 'issueType': 'misspelling'},
+        'context': {'text': context, 'offset': offset_in_context},
+        'replacements': [{'value': MISSPELLINGS.get(text[offset:offset + length], '')}],
+        'offset': offset,
+        'length': length,
+        'message': 'Possible spelling mistake found.',
+        'sentence': text,
+    }, text)
+
+
+class FakeLanguageTool():
+    """Checks spelling per word and flags paragraphs starting with 'And'"""
+
+    def __init__(self):
+        self.requests = []
+
+    def check(self, text):
+        self.requests.append(text)
+        matches = []
+        for m in re.finditer(r"[A-Za-z]+", text):
+            if m.group().lower() in MISSPELLINGS:
+                matches.append(make_match(text, m.start(), len(m.group()), 'MORFOLOGIK_RULE_EN_US'))
+        # A document wide rule: unpaired brackets anywhere in the text
+        if text.count('(') != text.count(')'):
+            i = text.index('(') if '(' in text else text.index(')')
+            matches.append(make_match(text, i, 1, 'EN_UNPAIRED_BRACKETS'))
+        return matches
+
+
+def summary(matches):
+    """The parts of each match SpellingAnalysis prints or relies upon"""
+    return [(m.offset, m.error_length, m.context, m.offset_in_context, m.rule_id, m.replacements)
+            for m in matches]
+
+
+class TestBatchChecker(unittest.TestCase):
+    """Test cases for BatchChecker"""
+
+    def setUp(self):
+        """Set up tweets and a fake LanguageTool server"""
+        self.tool = FakeLanguageTool()
+        self.texts = [
+            "I did not recieve teh parcel",
+            "",
+            "Nothing wrong here at all, this is a much longer tweet that goes past the context size",
+            "This is wierd, at the very end of a long tweet that also has a typo near the end teh",
+            "Line one\nline two has teh typo",
+        ]
+
+    def test_matches_identical_to_per_tweet_checks(self):
+        """Test that batched matches equal those of checking each tweet"""
+        expected = [summary(self.tool.check(t)) for t in self.texts]
+        self.tool.requests = []
+
+        checker = BatchChecker(self.tool, batch_size=50)
+        results = checker.check(self.texts)
+
+        self.assertEqual([summary(r) for r in results], expected)
+        self.assertEqual(len(self.tool.requests), 1)
+        self.assertEqual(checker.requests, 1)
+
+    def test_batch_size(self):
+        """Test that tweets are split into requests of batch_size"""
+        checker = BatchChecker(self.tool, batch_size=2)
+
+        results = checker.check(self.texts)
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(self.tool.requests, [
+            self.texts[0] + "\n\n" + self.texts[1],
+            self.texts[2] + "\n\n" + self.texts[3],
+            self.texts[4],
+        ])
+
+    def test_tweets_with_brackets_checked_alone(self):
+        """Test that brackets are never paired across tweets"""
+        texts = ["An open (bracket here", "and a closing one) there", "teh", "don't recieve"]
+        expected = [summary(self.tool.check(t)) for t in texts]
+        self.tool.requests = []
+
+        results = BatchChecker(self.tool).check(texts)
+
+        self.assertEqual([summary(r) for r in results], expected)
+        self.assertEqual(self.tool.requests, texts[:2] + ["teh\n\ndon't recieve"])
+
+    def test_text_level_rules_are_rechecked(self):
+        """Test that tweets hit by document wide rules are checked alone"""
+        class RepeatTool(FakeLanguageTool):
+            def check(self, text):
+                matches = super().check(text)
+                paragraphs = text.split("\n\n")
+                offset = 0
+                for previous, paragraph in zip([None] + paragraphs, paragraphs):
+                    if previous and previous.split()[0] == paragraph.split()[0]:
+                        matches.append(make_match(text, offset, 1, 'WORD_REPEAT_BEGINNING_RULE'))
+                    offset += len(paragraph) + 2
+                return matches
+
+        tool = RepeatTool()
+        texts = ["The teh one", "The other"]
+        expected = [summary(tool.check(t)) for t in texts]
+        tool.requests = []
+
+        checker = BatchChecker(tool)
+        results = checker.check(texts)
+
+        self.assertEqual([summary(r) for r in results], expected)
+        self.assertEqual(checker.rechecked, 1)
+        self.assertEqual(tool.requests, ["The teh one\n\nThe other", "The other"])
+
+    def test_matches_across_tweets_are_rechecked(self):
+        """Test that a match spanning a separator sends both tweets to be checked alone"""
+        texts = ["ends with te", "h starts this one"]
+
+        class SpanningTool(FakeLanguageTool):
+            def check(self, text):
+                self.requests.append(text)
+                if "\n\n" in text:
+                    return [make_match(text, 10, 5, 'SPANNING_RULE')]
+                return []
+
+        tool = SpanningTool()
+        checker = BatchChecker(tool)
+
+        self.assertEqual(checker.check(texts), [[], []])
+        self.assertEqual(tool.requests[1:], texts)
+
+    def test_matches_on_separator_are_dropped(self):
+        """Test that matches only covering the separator are ignored"""
+        class SeparatorTool(FakeLanguageTool):
+            def check(self, text):
+                self.requests.append(text)
+                return [make_match(text, 3, 2, 'EMPTY_LINE_RULE')] if "\n\n" in text else []
+
+        tool = SeparatorTool()
+
+        self.assertEqual(BatchChecker(tool).check(["one", "two"]), [[], []])
+        self.assertEqual(len(tool.requests), 1)
+
+    def test_single_text_checked_directly(self):
+        """Test that a single tweet is passed through unchanged"""
+        self.assertEqual(summary(BatchChecker(self.tool).check(["teh"])[0]),
+                         summary(self.tool.check("teh")))
+        self.assertEqual(self.tool.requests, ["teh", "teh"])
+
+    def test_concurrent_checks_keep_tweet_order(self):
+        """Test that batches checked concurrently come back in tweet order"""
+        class SlowTool(FakeLanguageTool):
+            def check(self, text):
+                matches = super().check(text)
+                # Earlier batches finish last
+                time.sleep(0.05 if text.startswith("I did") else 0)
+                return matches
+
+        tools = [SlowTool(), SlowTool()]
+        expected = [summary(self.tool.check(t)) for t in self.texts]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            checker = BatchChecker(tools, batch_size=1, executor=executor, max_in_flight=4)
+            results = checker.check(self.texts)
+
+        self.assertEqual([summary(r) for r in results], expected)
+        self.assertEqual(checker.requests, 5)
+        # Requests alternate between the servers
+        self.assertEqual(tools[0].requests, self.texts[0::2])
+        self.assertEqual(tools[1].requests, self.texts[1::2])
+
+    def test_in_flight_requests_are_bounded(self):
+        """Test that no more than max_in_flight requests are outstanding"""
+        class CountingTool(FakeLanguageTool):
+            def __init__(self):
+                super().__init__()
+                self.lock = threading.Lock()
+                self.active = 0
+                self.most_active = 0
+
+            def check(self, text):
+                with self.lock:
+                    self.active += 1
+                    self.most_active = max(self.most_active, self.active)
+                time.sleep(0.01)
+                with self.lock:
+                    self.active -= 1
+                return super().check(text)
+
+        tool = CountingTool()
+        texts = ["tweet %d teh" % n for n in range(20)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            results = BatchChecker(tool, batch_size=2, executor=executor,
+                                   max_in_flight=3).check(texts)
+
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(len(r) == 1 for r in results))
+        self.assertLessEqual(tool.most_active, 3)
+        self.assertEqual(len(tool.requests), 10)
+
+    def test_concurrent_errors_are_raised(self):
+        """Test that a failed request is raised by check"""
+        class FailingTool(FakeLanguageTool):
+            def check(self, text):
+                raise RuntimeError("server unavailable")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            checker = BatchChecker(FailingTool(), batch_size=1, executor=executor)
+            with self.assertRaises(RuntimeError):
+                checker.check(self.texts)
+
+    def test_match_context(self):
+        """Test that contexts are cut like LanguageTool's"""
+        text = "x" * 50 + "teh" + "y" * 50
+
+        context, offset = match_context(text, 50, 3)
+
+        self.assertEqual(context, "..." + "x" * 40 + "teh" + "y" * 40 + "...")
+        self.assertEqual(offset, 43)
+        self.assertEqual(match_context("a teh\nb", 2, 3), ("a teh b", 2))
+
+    def test_match_field_reads_old_names(self):
+        """Test reading matches from older language_tool_python releases"""
+        class OldMatch:
+            ruleId = 'OLD_RULE'
+
+        self.assertEqual(match_field(OldMatch(), 'rule_id', 'ruleId'), 'OLD_RULE')
+        self.assertEqual(match_field(make_match("teh", 0, 3, 'NEW_RULE'), 'rule_id', 'ruleId'),
+                         'NEW_RULE')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Unit tests for the NumPy BatchVader sentiment scorer
+"""
+import random
+import unittest
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer, BOOSTER_DICT, NEGATE
+from mock_data import MIXED_TWEETS
+
+try:
+    import numpy
+    from twitter_shill_hunter.processors.sentiment_analysis.batch_scorer import BatchVader
+except ImportError:
+    numpy = None
+
+
+# Sentences from the vaderSentiment examples, covering every rule
+REFERENCE_SENTENCES = [
+    "VADER is smart, handsome, and funny.",
+    "VADER is smart, handsome, and funny!",
+    "VADER is very smart, handsome, and funny.",
+    "VADER is VERY SMART, handsome, and FUNNY.",
+    "VADER is VERY SMART, handsome, and FUNNY!!!",
+    "VADER is VERY SMART, uber handsome, and FRIGGIN FUNNY!!!",
+    "VADER is not smart, handsome, nor funny.",
+    "The book was good.",
+    "At least it isn't a horrible book.",
+    "The book was only kind of good.",
+    "The plot was good, but the characters are uncompelling and the dialog is not great.",
+    "Today SUX!",
+    "Today only kinda sux! But I'll get by, lol",
+    "Make sure you :) or :D today!",
+    "Catch utf-8 emoji such as 💘 and 💋 and 😁",
+    "Not bad at all",
+    "Sentiment analysis has never been good.",
+    "Sentiment analysis has never been this good!",
+    "Most automated sentiment analysis tools are shit.",
+    "With VADER, sentiment analysis is the shit!",
+    "Other sentiment analysis tools can be quite bad.",
+    "On the other hand, VADER is quite bad ass",
+    "VADER is such a badass!",
+    "Without a doubt, excellent idea.",
+    "Roger Dodger is one of the most compelling variations on this theme.",
+    "Roger Dodger is at least compelling as a variation on the theme.",
+    "Roger Dodger is one of the least compelling variations on this theme.",
+    "Not such a badass after all.",
+    "Without a doubt, an excellent idea.",
+    "There is no good reason?? None???",
+    "",
+    "   ",
+    "!!!",
+]
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestBatchVader(unittest.TestCase):
+    """Test cases for BatchVader"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the VADER lexicon once for every test"""
+        cls.reference = SentimentIntensityAnalyzer()
+
+    def setUp(self):
+        """Set up a scorer sharing the reference lexicon"""
+        self.scorer = BatchVader(self.reference)
+
+    def test_reference_sentences_match(self):
+        """Test the batch scores against vaderSentiment on its own examples"""
+        self.assertEqual(self.scorer.validate(REFERENCE_SENTENCES, tolerance=1e-9), [])
+
+    def test_tweets_match(self):
+        """Test the batch scores against vaderSentiment on sample tweets"""
+        texts = [t['text'] for t in MIXED_TWEETS]
+
+        self.assertEqual(self.scorer.validate(texts, tolerance=1e-9), [])
+
+    def test_generated_sentences_match(self):
+        """Test random mixes of lexicon, booster, negation and capitalised words"""
+        rng = random.Random(7)
+        words = (list(self.reference.lexicon)[:2000] + list(BOOSTER_DICT) + NEGATE +
+                 ["so", "this", "never", "without", "doubt", "storm", ":)", "😁"] * 20)
+        texts = []
+        for _ in range(500):
+            sentence = []
+            for _ in range(rng.randint(0, 15)):
+                word = rng.choice(words)
+                if rng.random() < 0.15:
+                    word = word.upper()
+                if rng.random() < 0.1:
+                    word += rng.choice(["!", "?", ",", "..."])
+                sentence.append(word)
+            texts.append(" ".join(sentence))
+
+        self.assertEqual(self.scorer.validate(texts, tolerance=1e-9), [])
+
+    def test_batch_keeps_order(self):
+        """Test that scores come back in the order of the texts"""
+        texts = ["I love this", "I hate this", "The sky"]
+
+        scores = self.scorer.score_batch(texts)
+
+        self.assertEqual(scores, [self.reference.polarity_scores(t) for t in texts])
+        self.assertGreater(scores[0]['compound'], 0)
+        self.assertLess(scores[1]['compound'], 0)
+        self.assertEqual(scores[2]['compound'], 0.0)
+
+    def test_sentence_wide_rules_use_reference(self):
+        """Test that texts with 'but', 'no' or 'least' are handed to the reference"""
+        self.scorer.score_batch(["Good, but bad", "No good", "least good", "very good"])
+
+        self.assertEqual(self.scorer.fallbacks, 3)
+
+    def test_empty_batch(self):
+        """Test scoring nothing"""
+        self.assertEqual(self.scorer.score_batch([]), [])
+
+    def test_vocabulary_reused_between_batches(self):
+        """Test that tokens are only added to the vocabulary once"""
+        self.scorer.score_batch(["Great news!", "great news"])
+        size = len(self.scorer.vocabulary)
+
+        self.scorer.score_batch(["Great news!", "great news"])
+
+        self.assertEqual(len(self.scorer.vocabulary), size)
+
+    def test_vocabulary_limit(self):
+        """Test that the vocabulary is cleared between batches once too large"""
+        scorer = BatchVader(self.reference, max_vocabulary=3)
+
+        first = scorer.score_batch(["one two three four five good"])
+        second = scorer.score_batch(["bad"])
+
+        self.assertEqual(first, [self.reference.polarity_scores("one two three four five good")])
+        self.assertEqual(second, [self.reference.polarity_scores("bad")])
+        self.assertEqual(len(scorer.vocabulary), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Unit tests for the processor benchmark suite
+"""
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+from twitter_shill_hunter.benchmark import Benchmark, PIPELINE, compare, main
+from twitter_shill_hunter.processors.geo_analysis.geo_analysis import GeoAnalysis
+
+
+class CountingProcessor():
+    """Processor counting the tweets and context it is given"""
+
+    context_fields = ('dialect', 'search_terms')
+    instances = []
+
+    def __init__(self):
+        self.tweets = 0
+        self.args = None
+        self.closed = False
+        CountingProcessor.instances.append(self)
+
+    def process_data(self, tweets_and_date, dialect, search_terms):
+        self.tweets += len(tweets_and_date)
+        self.args = (dialect, search_terms)
+        return []
+
+    def close(self):
+        self.closed = True
+
+
+class FailingProcessor():
+    """Processor failing on the first page"""
+
+    def process_data(self, tweets_and_date):
+        raise RuntimeError("broken")
+
+
+PLUGINS = {'counting': CountingProcessor, 'failing': FailingProcessor, 'geo_analysis': GeoAnalysis}
+
+
+def result(name, size, tweets_per_second, peak_rss_mb):
+    """Return a case as the benchmark reports it"""
+    return {'name': name, 'size': size, 'tweets_per_second': tweets_per_second,
+            'peak_rss_mb': peak_rss_mb, 'error': None}
+
+
+@patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load',
+       side_effect=lambda plugin: PLUGINS[plugin])
+class TestBenchmark(unittest.TestCase):
+    """Test cases for Benchmark"""
+
+    def setUp(self):
+        """Set up a scratch directory for results"""
+        self.temp_dir = tempfile.mkdtemp()
+        CountingProcessor.instances = []
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def run_benchmark(self, benchmark):
+        """Run a benchmark without its output"""
+        with redirect_stdout(io.StringIO()):
+            return benchmark.run()
+
+    def test_processor_case(self, mock_load):
+        """Test a processor is fed every tweet with the configured context"""
+        benchmark = Benchmark(['counting'], sizes=[450], page_size=100, isolate=False,
+                              pipeline=False, config={'dialect': 'en-GB'})
+        cases = self.run_benchmark(benchmark)['cases']
+        self.assertEqual(len(cases), 1)
+        case = cases[0]
+        self.assertEqual((case['name'], case['size'], case['tweets']), ('counting', 450, 450))
+        self.assertIsNone(case['error'])
+        self.assertTrue(case['tweets_per_second'] > 0)
+        processor = CountingProcessor.instances[0]
+        self.assertEqual(processor.tweets, 450)
+        self.assertEqual(processor.args[0], 'en-GB')
+        self.assertTrue(processor.closed)
+
+    def test_failing_case(self, mock_load):
+        """Test a failing processor is reported without stopping the run"""
+        benchmark = Benchmark(['failing', 'counting'], sizes=[10], isolate=False, pipeline=False)
+        cases = self.run_benchmark(benchmark)['cases']
+        self.assertEqual(cases[0]['error'], 'RuntimeError: broken')
+        self.assertIsNone(cases[0]['tweets_per_second'])
+        self.assertIsNone(cases[1]['error'])
+
+    def test_pipeline_case(self, mock_load):
+        """Test the pipeline case runs every plugin over an archive of the timeline"""
+        benchmark = Benchmark(['geo_analysis'], sizes=[300, 50], page_size=100, isolate=False)
+        cases = self.run_benchmark(benchmark)['cases']
+        self.assertEqual([(c['name'], c['size']) for c in cases], [
+            ('geo_analysis', 300), (PIPELINE, 300), ('geo_analysis', 50), (PIPELINE, 50)])
+        for case in cases:
+            self.assertIsNone(case['error'])
+            self.assertEqual(case['tweets'], case['size'])
+
+    def test_compare(self, mock_load):
+        """Test slower or larger cases beyond the tolerance are regressions"""
+        baseline = {'cases': [result('geo', 1000, 1000.0, 100.0),
+                              result('pipeline', 1000, 500.0, 100.0)]}
+        results = {'cases': [result('geo', 1000, 950.0, 105.0),
+                             result('pipeline', 1000, 400.0, 150.0),
+                             result('geo', 100000, 10.0, 900.0)]}
+        regressions = compare(results, baseline, tolerance=0.1)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('pipeline at 1000: 400 tweets/sec'))
+        self.assertIn('150.0 MB peak RSS', regressions[1])
+        self.assertEqual(compare(results, baseline, tolerance=0.6), [])
+
+    def test_main_baseline(self, mock_load):
+        """Test results are saved as JSON and a regression exits with 1"""
+        output = os.path.join(self.temp_dir, 'results.json')
+        baseline = os.path.join(self.temp_dir, 'baseline.json')
+        with open(baseline, 'w') as f:
+            json.dump({'cases': [result('counting', 20, 1e12, None)]}, f)
+
+        with redirect_stdout(io.StringIO()) as printed:
+            status = main(['counting', '--sizes', '20', '--no-isolate', '--no-pipeline',
+                           '--output', output, '--baseline', baseline])
+        self.assertEqual(status, 1)
+        self.assertIn('Regressions against', printed.getvalue())
+        with open(output) as f:
+            saved = json.load(f)
+        self.assertEqual(saved['cases'][0]['tweets'], 20)
+        self.assertEqual(saved['seed'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
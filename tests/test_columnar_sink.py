@@ -0,0 +1,134 @@
+"""
+Unit tests for the Parquet and Arrow IPC result sink
+"""
+import json
+import os
+import tempfile
+import unittest
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+from twitter_shill_hunter.sinks import get_sink
+from twitter_shill_hunter.tweet_record import TweetRecord
+
+TWEETS = [
+    TweetRecord("What a colour", "Wed Oct 11 10:30:00 +0000 2023", post_id='1',
+                coordinates={'type': 'Point', 'coordinates': [-0.12, 51.5]},
+                source='Twitter for iPhone'),
+    TweetRecord("Nothing to see", "Wed Oct 11 10:30:00 +0000 2023", post_id='2',
+                source='Twitter Web App'),
+    TweetRecord("Lovely colour, teh best", "Thu Oct 12 09:00:00 +0000 2023", post_id='3'),
+]
+RESULTS = {
+    'sentiment_analysis': [
+        {'date': TWEETS[0]['date'], 'id': '1', 'search_terms': ['colour'],
+         'neg': 0.0, 'neu': 0.5, 'pos': 0.5, 'compound': 0.6},
+        {'date': TWEETS[2]['date'], 'id': '3', 'search_terms': ['colour'],
+         'neg': 0.0, 'neu': 0.4, 'pos': 0.6, 'compound': 0.8},
+    ],
+    'grammar_analysis': [
+        {'date': TWEETS[0]['date'], 'id': '1', 'dialect_hits': {'en-GB': {'colour': 1}}},
+    ],
+    'spelling_analysis': [
+        {'date': TWEETS[2]['date'], 'id': '3',
+         'matches': [{'rule_id': 'UNKNOWN_WORD', 'category': 'TYPOS'}]},
+    ],
+    'geo_analysis': ('not', 'records'),
+}
+SUMMARIES = {
+    'sentiment_analysis': {'tweets_analyzed': 2, 'compound_search_results': 0.7},
+    'grammar_analysis': {'dialect': 'en-US', 'dialect_hits': {'en-GB': {'colour': 3}}},
+    'spelling_analysis': {'tweets_checked': 3, 'issues': 1, 'rules': {'UNKNOWN_WORD': 1}},
+}
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestColumnarSink(unittest.TestCase):
+    """Test cases for ColumnarSink"""
+
+    def setUp(self):
+        """Set up an output directory"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'results')
+
+    def run_target(self, output_format, pages=1, row_group_size=65536):
+        """Write pages of one target and close the sink"""
+        sink = get_sink({'format': output_format, 'path': self.path,
+                         'row_group_size': row_group_size})
+        for page in range(pages):
+            sink.write_page('someone', TWEETS, RESULTS)
+        for plugin, summary in SUMMARIES.items():
+            sink.write_summary('someone', plugin, summary)
+        sink.end_target('someone', {'posts': 3 * pages, 'pages': pages,
+                                    'seconds': 0.5, 'error': None})
+        sink.close()
+
+    def test_parquet_tweets(self):
+        """Test plugin records are joined onto one row per tweet"""
+        self.run_target('parquet')
+
+        rows = pyarrow.parquet.read_table(os.path.join(self.path, 'tweets.parquet')).to_pylist()
+        self.assertEqual([r['id'] for r in rows], ['1', '2', '3'])
+        self.assertEqual(rows[0]['source'], 'Twitter for iPhone')
+        self.assertEqual((rows[0]['longitude'], rows[0]['latitude']), (-0.12, 51.5))
+        self.assertEqual(rows[0]['timestamp'].year, 2023)
+        self.assertEqual(rows[0]['compound'], 0.6)
+        self.assertEqual(rows[0]['dialect_hits'],
+                         [{'dialect': 'en-GB', 'word': 'colour', 'hits': 1}])
+        self.assertIsNone(rows[1]['compound'])
+        self.assertIsNone(rows[1]['search_terms'])
+        self.assertEqual(rows[2]['search_terms'], ['colour'])
+        self.assertEqual(rows[2]['spelling_rules'], ['UNKNOWN_WORD'])
+
+    def test_parquet_targets(self):
+        """Test each target's aggregates are written to a second table"""
+        self.run_target('parquet')
+
+        rows = pyarrow.parquet.read_table(os.path.join(self.path, 'targets.parquet')).to_pylist()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['posts'], 3)
+        self.assertEqual(rows[0]['tweets_matched'], 2)
+        self.assertEqual(rows[0]['compound'], 0.7)
+        self.assertEqual(rows[0]['dialect_words'], 3)
+        self.assertEqual(rows[0]['spelling_issues'], 1)
+        self.assertEqual(json.loads(rows[0]['summaries']), SUMMARIES)
+
+    def test_row_groups(self):
+        """Test rows are written a row group at a time"""
+        self.run_target('parquet', pages=3, row_group_size=4)
+
+        parquet_file = pyarrow.parquet.ParquetFile(os.path.join(self.path, 'tweets.parquet'))
+        self.assertEqual(parquet_file.metadata.num_rows, 9)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+
+    def test_arrow_ipc(self):
+        """Test the Arrow IPC file format"""
+        self.run_target('arrow', pages=2)
+
+        with pyarrow.ipc.open_file(os.path.join(self.path, 'tweets.arrow')) as reader:
+            table = reader.read_all()
+        self.assertEqual(table.num_rows, 6)
+        self.assertEqual(table.column('compound').to_pylist(), [0.6, None, 0.8] * 2)
+
+    def test_empty_run(self):
+        """Test a run with no tweets still leaves readable tables"""
+        sink = get_sink({'format': 'parquet', 'path': self.path})
+        sink.close()
+
+        table = pyarrow.parquet.read_table(os.path.join(self.path, 'tweets.parquet'))
+        self.assertEqual(table.num_rows, 0)
+        self.assertIn('spelling_rules', table.column_names)
+
+    def test_path_required(self):
+        """Test columnar output needs a directory"""
+        with self.assertRaises(ValueError):
+            get_sink({'format': 'parquet'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Unit tests for the compiled, memory mapped DialectIndex
+"""
+import mmap
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+import yaml
+from twitter_shill_hunter.processors.grammar_analysis import dialect_index
+from twitter_shill_hunter.processors.grammar_analysis.dialect_index import (
+    DialectIndex, load_dialect_index, source_fingerprint)
+from twitter_shill_hunter.processors.grammar_analysis.dialect_matcher import DialectMatcher
+from twitter_shill_hunter.input import ProcessInputYaml
+
+
+def load_yaml(path):
+    """Parse a word list the way GrammarAnalysis does"""
+    return ProcessInputYaml().yaml_processor(path)
+
+
+class TestDialectIndex(unittest.TestCase):
+    """Test cases for DialectIndex"""
+
+    def setUp(self):
+        """Write small word lists to a scratch directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, 'cache')
+        self.uk_path = self.write_words('en-UK.yaml', ['colour', 'centre', 'favour '])
+        self.us_path = self.write_words('en-US.yaml', ['color', 'center', 'favor'])
+        self.sources = [('en-UK', self.uk_path), ('en-US', self.us_path)]
+        dialect_index._indexes.clear()
+
+    def tearDown(self):
+        """Remove the scratch directory and forget opened indexes"""
+        dialect_index._indexes.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def write_words(self, name, words):
+        """Write a dialect word list YAML file"""
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w') as f:
+            yaml.dump({'words': words}, f)
+        return path
+
+    def test_compile_and_lookup(self):
+        """Test looking words up in a compiled index"""
+        index = DialectIndex(DialectIndex.compile(
+            [('en-UK', ['colour', 'Centre']), ('en-US', ['color', 'centre'])]))
+
+        self.assertEqual(index.dialects, ['en-UK', 'en-US'])
+        self.assertEqual(index.lookup('colour'), 0b01)
+        self.assertEqual(index.lookup('color'), 0b10)
+        self.assertEqual(index.lookup('centre'), 0b11)
+        self.assertEqual(index.lookup('colours'), 0)
+        self.assertEqual(index.lookup(''), 0)
+        self.assertEqual(index.lookup('zzz'), 0)
+
+    def test_empty_index(self):
+        """Test an index with no words"""
+        index = DialectIndex(DialectIndex.compile([('en-UK', [])]))
+
+        self.assertEqual(index.lookup('colour'), 0)
+
+    def test_rejects_foreign_data(self):
+        """Test that data without the index header is rejected"""
+        with self.assertRaises(ValueError):
+            DialectIndex(b'not an index at all, just some bytes')
+
+    def test_load_writes_and_maps_cache_file(self):
+        """Test that the first load compiles a cache file that is memory mapped"""
+        index = load_dialect_index(self.sources, load_yaml, cache_dir=self.cache_dir)
+
+        files = os.listdir(self.cache_dir)
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].endswith('.idx'))
+        self.assertNotIsInstance(index.buffer, bytes)
+        self.assertEqual(index.lookup('favour'), 0b01)
+        self.assertEqual(index.lookup('center'), 0b10)
+
+    def test_load_reuses_cache_file_without_parsing(self):
+        """Test that a later process opens the cache file instead of parsing YAML"""
+        load_dialect_index(self.sources, load_yaml, cache_dir=self.cache_dir)
+        dialect_index._indexes.clear()
+
+        loader = MagicMock()
+        index = load_dialect_index(self.sources, loader, cache_dir=self.cache_dir)
+
+        loader.assert_not_called()
+        self.assertEqual(index.lookup('colour'), 0b01)
+
+    def test_load_shares_index_within_process(self):
+        """Test that repeated loads return the same index object"""
+        first = load_dialect_index(self.sources, load_yaml, cache_dir=self.cache_dir)
+        second = load_dialect_index(self.sources, load_yaml, cache_dir=self.cache_dir)
+
+        self.assertIs(first, second)
+
+    def test_changed_source_invalidates_cache(self):
+        """Test that editing a word list produces a fresh index"""
+        load_dialect_index(self.sources, load_yaml, cache_dir=self.cache_dir)
+        before = source_fingerprint(self.sources)
+
+        self.write_words('en-UK.yaml', ['colour', 'centre', 'favour', 'aeroplane'])
+        st = os.stat(self.uk_path)
+        os.utime(self.uk_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+        self.assertNotEqual(source_fingerprint(self.sources), before)
+        index = load_dialect_index(self.sources, load_yaml, cache_dir=self.cache_dir)
+        self.assertEqual(index.lookup('aeroplane'), 0b01)
+
+    def test_stale_file_is_unmapped(self):
+        """Test that opening an index with another fingerprint closes its mapping"""
+        index = load_dialect_index(self.sources, load_yaml, cache_dir=self.cache_dir)
+        path = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+
+        with patch('mmap.mmap', wraps=mmap.mmap) as mapped:
+            self.assertIsNone(DialectIndex.open(path, 'another fingerprint'))
+        self.assertTrue(mapped.return_value.closed)
+        self.assertIsNotNone(DialectIndex.open(path, index.fingerprint))
+
+    def test_close(self):
+        """Test that a mapped index can be closed"""
+        load_dialect_index(self.sources, load_yaml, cache_dir=self.cache_dir)
+        path = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        index = DialectIndex.open(path)
+
+        index.close()
+        self.assertTrue(index.buffer.closed)
+
+    def test_missing_sources_are_not_cached(self):
+        """Test that sources which are not files are compiled in memory"""
+        loader = MagicMock(return_value={'words': ['colour']})
+        sources = [('en-UK', '/path/to/en-UK.yaml')]
+
+        self.assertIsNone(source_fingerprint(sources))
+        index = load_dialect_index(sources, loader, cache_dir=self.cache_dir)
+
+        self.assertEqual(index.lookup('colour'), 1)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_matcher_over_index(self):
+        """Test a DialectMatcher limited to some dialects of an index"""
+        index = load_dialect_index(self.sources, load_yaml, cache_dir=self.cache_dir)
+        matcher = DialectMatcher.from_index(index, dialects=['en-US'])
+
+        self.assertEqual(matcher.match("Colour and color"), [('en-US', 'color')])
+
+    def test_packaged_word_lists(self):
+        """Test compiling the word lists shipped with the package"""
+        base = os.path.join(os.path.dirname(dialect_index.__file__), 'dialect_mappings', 'en')
+        sources = [('en-UK', os.path.join(base, 'en-UK.yaml')),
+                   ('en-US', os.path.join(base, 'en-US.yaml'))]
+
+        index = load_dialect_index(sources, load_yaml, cache_dir=self.cache_dir)
+
+        self.assertEqual(index.lookup('aeroplane'), 0b01)
+        self.assertEqual(index.lookup('airplane'), 0b10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Unit tests for the DialectMatcher word index
+"""
+import unittest
+from twitter_shill_hunter.processors.grammar_analysis.dialect_matcher import DialectMatcher
+from twitter_shill_hunter.tokenizer import vocabulary
+from mock_data import UK_ENGLISH_TWEETS, US_ENGLISH_TWEETS
+
+
+class TestDialectMatcher(unittest.TestCase):
+    """Test cases for DialectMatcher"""
+
+    def setUp(self):
+        """Build a matcher with small UK and US word lists"""
+        self.matcher = DialectMatcher()
+        self.matcher.add_dialect('en-UK', ['colour', 'centre', 'organisation', 'favour', 'aeon'])
+        self.matcher.add_dialect('en-US', ['color', 'center', 'organization', 'favor', 'eon'])
+
+    def test_match_uk_words(self):
+        """Test that UK spellings are attributed to the UK dialect"""
+        hits = self.matcher.match(UK_ENGLISH_TWEETS[0]['text'])
+
+        self.assertEqual(hits, [('en-UK', 'colour'), ('en-UK', 'centre')])
+
+    def test_match_is_case_insensitive(self):
+        """Test that capitalised words still match"""
+        hits = self.matcher.match("Favour the ORGANISATION")
+
+        self.assertEqual(hits, [('en-UK', 'favour'), ('en-UK', 'organisation')])
+
+    def test_match_respects_word_boundaries(self):
+        """Test that dialect words inside other words do not match"""
+        self.assertEqual(self.matcher.match("neon people colourful"), [])
+
+    def test_match_ignores_punctuation(self):
+        """Test that punctuation around words is ignored"""
+        hits = self.matcher.match("#color, (center)!")
+
+        self.assertEqual(hits, [('en-US', 'color'), ('en-US', 'center')])
+
+    def test_word_in_several_dialects(self):
+        """Test that a word shared by dialects is reported for each"""
+        self.matcher.add_dialect('en-AU', ['colour'])
+
+        hits = self.matcher.match("colour")
+
+        self.assertEqual(hits, [('en-UK', 'colour'), ('en-AU', 'colour')])
+
+    def test_count_across_tweets(self):
+        """Test per dialect hit counts over a list of tweets"""
+        tweets = [{'text': t['text']} for t in UK_ENGLISH_TWEETS + US_ENGLISH_TWEETS]
+
+        counts = self.matcher.count(tweets)
+
+        self.assertEqual(counts['en-UK'], {
+            'colour': 1, 'centre': 1, 'favour': 1, 'organisation': 1})
+        self.assertEqual(counts['en-US'], {
+            'color': 1, 'favor': 1, 'organization': 1})
+
+    def test_count_uses_token_ids(self):
+        """Test that counting looks each token id up once"""
+        tweets = [{'text': 'Colour colour COLOUR'}, {'text': 'colour centre'}]
+        lookups = []
+        lookup = self.matcher.lookup
+        self.matcher.lookup = lambda word: lookups.append(word) or lookup(word)
+
+        counts = self.matcher.count(tweets)
+
+        self.assertEqual(counts, {'en-UK': {'colour': 4, 'centre': 1}})
+        self.assertEqual(sorted(lookups), ['centre', 'colour'])
+
+    def test_count_after_vocabulary_cleared(self):
+        """Test that ids cached before the vocabulary was cleared are dropped"""
+        self.matcher.count([{'text': 'The colour of the centre'}])
+        vocabulary.clear()
+
+        counts = self.matcher.count([{'text': 'Center of the color'}])
+
+        self.assertEqual(counts, {'en-US': {'center': 1, 'color': 1}})
+        self.assertEqual(self.matcher.generation, vocabulary.generation)
+
+    def test_count_per_tweet(self):
+        """Test that each tweet's hits are collected when asked for"""
+        tweets = [{'text': 'Colour colour'}, {'text': 'nothing here'}, {'text': 'centre'}]
+        tweet_hits = []
+
+        counts = self.matcher.count(tweets, tweet_hits)
+
+        self.assertEqual(counts, {'en-UK': {'colour': 2, 'centre': 1}})
+        self.assertEqual(tweet_hits, [{'en-UK': {'colour': 2}}, {}, {'en-UK': {'centre': 1}}])
+
+    def test_count_empty(self):
+        """Test counting with no tweets"""
+        self.assertEqual(self.matcher.count([]), {})
+
+    def test_word_list_entries_are_normalised(self):
+        """Test that trailing spaces and case in word lists are ignored"""
+        matcher = DialectMatcher()
+        matcher.add_dialect('en-UK', ['Judgement ', ''])
+
+        self.assertEqual(matcher.match("a judgement"), [('en-UK', 'judgement')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -24,7 +24,7 @@ class TestGrammarAnalysis(unittest.TestCase):
         self.assertEqual(analyzer.valid_dialects, [])
 
     @patch('twitter_shill_hunter.processors.grammar_analysis.grammar_analysis.os.listdir')
-    @patch('twitter_shill_hunter.processors.grammar_analysis.grammar_analysis.pkg_resources.resource_filename')
+    @patch('twitter_shill_hunter.processors.grammar_analysis.grammar_analysis.resource_path')
     def test_get_lang_dialects(self, mock_resource_filename, mock_listdir):
         """Test get_lang_dialects method"""
         # Mock the resource path and directory listing
@@ -72,11 +72,16 @@ class TestGrammarAnalysis(unittest.TestCase):
         self.grammar_analyzer.valid_dialects = ['/path/to/en-GB.yaml']
         
         # Execute the method
-        self.grammar_analyzer.analyze_dialect()
+        result = self.grammar_analyzer.analyze_dialect()
         
         # Verify process_input was called with the dialect
         mock_process_input.assert_called_once_with('/path/to/en-GB.yaml')
 
+        # Hit counts are returned per dialect
+        self.assertEqual(result, {
+            'en-GB': {'colour': 1, 'centre': 1, 'organisation': 1}
+        })
+
     @patch('twitter_shill_hunter.processors.grammar_analysis.grammar_analysis.ProcessInputYaml')
     def test_process_input(self, mock_process_input_yaml_class):
         """Test process_input method"""
@@ -110,13 +115,14 @@ class TestGrammarAnalysis(unittest.TestCase):
         }]
         self.grammar_analyzer.valid_dialects = ['/path/to/en-GB.yaml']
         
-        # Execute the method (this will print results but we can't easily capture them)
-        # The main test is that it doesn't raise an exception
-        self.grammar_analyzer.analyze_dialect()
+        result = self.grammar_analyzer.analyze_dialect()
         
         # Verify process_input was called
         mock_process_input.assert_called_once()
 
+        # Matching is case insensitive on whole words
+        self.assertEqual(result, {'en-GB': {'colour': 1, 'centre': 1}})
+
     @patch.object(GrammarAnalysis, 'process_input')
     def test_analyze_dialect_no_matches(self, mock_process_input):
         """Test analyze_dialect when no dialect words are found"""
@@ -129,7 +135,7 @@ class TestGrammarAnalysis(unittest.TestCase):
         self.grammar_analyzer.valid_dialects = ['/path/to/test.yaml']
         
         # This should run without error even when no matches are found
-        self.grammar_analyzer.analyze_dialect()
+        self.assertEqual(self.grammar_analyzer.analyze_dialect(), {})
         
         mock_process_input.assert_called_once()
 
@@ -157,7 +163,7 @@ class TestGrammarAnalysis(unittest.TestCase):
     def test_get_lang_dialects_splits_dialect_correctly(self):
         """Test that get_lang_dialects correctly splits dialect string"""
         with patch('twitter_shill_hunter.processors.grammar_analysis.grammar_analysis.os.listdir') as mock_listdir:
-            with patch('twitter_shill_hunter.processors.grammar_analysis.grammar_analysis.pkg_resources.resource_filename') as mock_resource_filename:
+            with patch('twitter_shill_hunter.processors.grammar_analysis.grammar_analysis.resource_path') as mock_resource_filename:
                 mock_resource_filename.return_value = '/mock/path/fr'
                 mock_listdir.return_value = ['fr-FR.yaml', 'fr-CA.yaml']
                 
@@ -165,12 +171,47 @@ class TestGrammarAnalysis(unittest.TestCase):
                 self.grammar_analyzer.dialect = 'fr-FR'
                 self.grammar_analyzer.get_lang_dialects()
                 
-                # Verify resource_filename was called with correct language
+                # Verify resource_path was called with correct language
                 mock_resource_filename.assert_called_once_with(
-                    'twitter_shill_hunter.processors.grammar_analysis', 
-                    '/dialect_mappings/fr'
+                    'twitter_shill_hunter.processors.grammar_analysis',
+                    'dialect_mappings', 'fr'
                 )
 
+    @patch.object(GrammarAnalysis, 'process_input')
+    def test_analyze_dialect_matches_whole_words_only(self, mock_process_input):
+        """Test that dialect words inside longer words are not reported"""
+        mock_process_input.return_value = {'words': ['eon', 'colour']}
+
+        self.grammar_analyzer.tweets_and_date = [
+            {'text': 'Neon signs for people in colourful colour', 'date': 'test_date'}
+        ]
+        self.grammar_analyzer.valid_dialects = ['/path/to/en-US.yaml']
+
+        result = self.grammar_analyzer.analyze_dialect()
+
+        self.assertEqual(result, {'en-US': {'colour': 1}})
+
+    @patch.object(GrammarAnalysis, 'get_lang_dialects')
+    @patch.object(GrammarAnalysis, 'process_input')
+    def test_process_data_compiles_word_lists_once(self, mock_process_input, mock_get_lang_dialects):
+        """Test that dialect files are parsed once across pages and hits accumulate"""
+        mock_process_input.return_value = {'words': ['colour']}
+        self.grammar_analyzer.valid_dialects = ['/path/to/en-UK.yaml']
+
+        page = [{'text': 'What a colour', 'date': 'test_date'}]
+        self.assertEqual(self.grammar_analyzer.process_data(page, 'en-US'),
+                         [{'date': 'test_date', 'id': None, 'dialect_hits': {'en-UK': {'colour': 1}}}])
+        self.grammar_analyzer.process_data(page, 'en-US')
+
+        mock_process_input.assert_called_once()
+        self.assertEqual(self.grammar_analyzer.dialect_hits, {'en-UK': {'colour': 2}})
+
+        self.assertEqual(self.grammar_analyzer.summary(),
+                         {'dialect': 'en-US', 'dialect_hits': {'en-UK': {'colour': 2}}})
+
+        self.grammar_analyzer.reset()
+        self.assertEqual(self.grammar_analyzer.dialect_hits, {})
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Unit tests for the shared LanguageToolPool
+"""
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+from twitter_shill_hunter.processors.spelling_analysis import language_tool_pool
+from twitter_shill_hunter.processors.spelling_analysis.language_tool_pool import (
+    LanguageToolPool, get_pool, shutdown_pools)
+
+
+@patch('twitter_shill_hunter.processors.spelling_analysis.language_tool_pool.language_tool_python.LanguageTool')
+class TestLanguageToolPool(unittest.TestCase):
+    """Test cases for LanguageToolPool"""
+
+    def setUp(self):
+        """Set up a pool that does not reap on its own"""
+        self.pool = LanguageToolPool(idle_timeout=0)
+
+    def tearDown(self):
+        """Stop servers started by the test"""
+        self.pool.shutdown()
+        shutdown_pools()
+
+    def test_one_server_per_language(self, mock_language_tool_class):
+        """Test that servers are shared by every caller of a language"""
+        mock_language_tool_class.side_effect = lambda language: MagicMock(language=language)
+
+        first = self.pool.acquire('en-US')
+        second = self.pool.acquire('en-US')
+        other = self.pool.acquire('en-GB')
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(mock_language_tool_class.call_count, 2)
+
+    def test_several_servers_per_language(self, mock_language_tool_class):
+        """Test that callers asking for more servers share the extra ones"""
+        mock_language_tool_class.side_effect = lambda language: MagicMock(language=language)
+
+        first = self.pool.acquire('en-US')
+        several = self.pool.acquire_many('en-US', 3)
+        fewer = self.pool.acquire_many('en-US', 2)
+
+        self.assertEqual(len(several), 3)
+        self.assertIs(several[0], first)
+        self.assertEqual(len(set(map(id, several))), 3)
+        self.assertEqual(fewer, several[:2])
+        self.assertEqual(mock_language_tool_class.call_count, 3)
+
+        for _ in range(3):
+            self.pool.release('en-US')
+        self.assertEqual(self.pool.reap(now=time.monotonic() + 1), ['en-US'])
+        for tool in several:
+            tool.close.assert_called_once()
+
+    def test_warm_up_runs_in_background(self, mock_language_tool_class):
+        """Test that warm up returns before the server has started"""
+        started = threading.Event()
+        mock_language_tool_class.side_effect = lambda language: started.wait(5) and MagicMock()
+
+        before = time.perf_counter()
+        self.pool.warm_up(['en-US'])
+        self.assertLess(time.perf_counter() - before, 1)
+
+        started.set()
+        self.assertIsNotNone(self.pool.acquire('en-US'))
+        mock_language_tool_class.assert_called_once_with('en-US')
+
+    def test_failed_start_is_retried(self, mock_language_tool_class):
+        """Test that a server failing to start is tried again next time"""
+        tool = MagicMock()
+        mock_language_tool_class.side_effect = [Exception("no java"), tool]
+
+        with self.assertRaises(Exception):
+            self.pool.acquire('en-US')
+
+        self.assertIs(self.pool.acquire('en-US'), tool)
+
+    def test_idle_servers_are_reaped(self, mock_language_tool_class):
+        """Test that idle servers nobody holds are shut down"""
+        tools = {'en-US': MagicMock(), 'en-GB': MagicMock()}
+        mock_language_tool_class.side_effect = lambda language: tools[language]
+        pool = LanguageToolPool(idle_timeout=60)
+        try:
+            pool.acquire('en-US')
+            pool.acquire('en-GB')
+            pool.release('en-GB')
+
+            self.assertEqual(pool.reap(now=time.monotonic() + 30), [])
+            self.assertEqual(pool.reap(now=time.monotonic() + 120), ['en-GB'])
+
+            tools['en-GB'].close.assert_called_once()
+            tools['en-US'].close.assert_not_called()
+        finally:
+            pool.shutdown()
+        tools['en-US'].close.assert_called_once()
+
+    def test_reaper_thread(self, mock_language_tool_class):
+        """Test that the reaper thread closes servers after the timeout"""
+        tool = MagicMock()
+        mock_language_tool_class.return_value = tool
+        pool = LanguageToolPool(idle_timeout=0.5)
+        try:
+            pool.acquire('en-US')
+            pool.release('en-US')
+
+            deadline = time.monotonic() + 5
+            while not tool.close.called and time.monotonic() < deadline:
+                time.sleep(0.05)
+        finally:
+            pool.shutdown()
+
+        tool.close.assert_called_once()
+
+    def test_shared_pools(self, mock_language_tool_class):
+        """Test that pools are shared per setting and shut down together"""
+        tool = MagicMock()
+        mock_language_tool_class.return_value = tool
+
+        self.assertIs(get_pool(), get_pool())
+        self.assertIsNot(get_pool(), get_pool(server='http://localhost:8081'))
+        get_pool().acquire('en-US')
+
+        shutdown_pools()
+
+        tool.close.assert_called_once()
+        self.assertEqual(language_tool_pool._pools, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+"""
+Unit tests for lazily imported dependencies
+"""
+import os
+import subprocess
+import sys
+import unittest
+from twitter_shill_hunter.lazy_import import LazyModule, lazy_import
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+class TestLazyImport(unittest.TestCase):
+    """Test cases for lazy_import"""
+
+    def test_imported_on_first_use(self):
+        """Test the module is imported when an attribute is read"""
+        module = LazyModule('colorsys')
+        self.assertIn('not loaded', repr(module))
+        self.assertEqual(module.rgb_to_hsv(0, 0, 0), (0, 0, 0))
+        self.assertIs(module.load(), sys.modules['colorsys'])
+
+    def test_shared_stand_in(self):
+        """Test every caller gets the same stand-in"""
+        self.assertIs(lazy_import('colorsys'), lazy_import('colorsys'))
+
+    def test_missing_attribute(self):
+        """Test a missing attribute is still an AttributeError"""
+        with self.assertRaises(AttributeError):
+            lazy_import('colorsys').missing
+
+    def test_cli_startup_skips_heavy_imports(self):
+        """Test starting the CLI imports no plugin or client library"""
+        code = ("import sys, twitter_shill_hunter.__main__, "
+                "twitter_shill_hunter.twitter_shill_hunter\n"
+                "print(' '.join(m for m in ('tweepy', 'yaml', 'multiprocessing', "
+                "'language_tool_python', 'vaderSentiment') if m in sys.modules))")
+        env = dict(os.environ, PYTHONPATH=SRC)
+        output = subprocess.check_output([sys.executable, '-c', code], env=env,
+                                         universal_newlines=True)
+        self.assertEqual(output.strip(), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Unit tests for run metrics and their JSON and Prometheus export
+"""
+import io
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from twitter_shill_hunter.metrics import Metrics, RateLimitHandler
+from twitter_shill_hunter.processor_scheduler import ProcessorScheduler
+
+
+class SleepyProcessor():
+    """Processor taking a little wall time but no CPU"""
+
+    execution = 'thread'
+
+    def process_data(self, tweets_and_date):
+        time.sleep(0.02)
+        return len(tweets_and_date)
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for Metrics"""
+
+    def setUp(self):
+        """Set up a scratch directory for exports"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_timer(self):
+        """Test stages add up their calls, wall and CPU time"""
+        metrics = Metrics()
+        for i in range(2):
+            with metrics.timer('wait'):
+                time.sleep(0.01)
+        with metrics.timer('process', 'geo_analysis') as timing:
+            timing['cpu'] += 1.5
+
+        calls, wall, cpu = metrics.timings[('wait', None)]
+        self.assertEqual(calls, 2)
+        self.assertTrue(wall >= 0.02)
+        self.assertTrue(cpu < wall)
+        self.assertTrue(metrics.timings[('process', 'geo_analysis')][2] >= 1.5)
+
+    def test_counters(self):
+        """Test counters are added to, or set, per plugin"""
+        metrics = Metrics()
+        metrics.add('posts', 3)
+        metrics.add('posts', 2)
+        metrics.set('polarity_cache_hits', 7, 'sentiment_analysis')
+        metrics.set('polarity_cache_hits', 9, 'sentiment_analysis')
+        self.assertEqual(metrics.get('posts'), 5)
+        self.assertEqual(metrics.get('polarity_cache_hits', 'sentiment_analysis'), 9)
+        self.assertEqual(metrics.get('api_calls'), 0)
+
+    def test_scheduler_times_each_processor(self):
+        """Test the scheduler times and counts each processor by name"""
+        metrics = Metrics()
+        scheduler = ProcessorScheduler(metrics)
+        try:
+            calls = [(name, SleepyProcessor(), [[{}, {}]]) for name in ('first', 'second')]
+            scheduler.run(calls)
+            scheduler.run(calls[:1])
+        finally:
+            scheduler.close()
+        self.assertEqual(metrics.timings[('process', 'first')][0], 2)
+        self.assertEqual(metrics.timings[('process', 'second')][0], 1)
+        self.assertTrue(metrics.timings[('process', 'second')][1] >= 0.02)
+        self.assertEqual(metrics.get('tweets', 'first'), 4)
+
+    def test_report(self):
+        """Test the end of run table lists stages and counters"""
+        metrics = Metrics()
+        metrics.record('extract', 0.5, 0.25)
+        metrics.record('process', 2.0, 1.0, 'sentiment_analysis')
+        metrics.add('rate_limit_wait_seconds', 900.0)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            metrics.report()
+        lines = output.getvalue().splitlines()
+        self.assertTrue(lines[1].startswith('Run metrics'))
+        self.assertEqual(lines[3].split(), ['extract', '1', '0.500', '0.250'])
+        self.assertTrue(lines[4].startswith('process: sentiment_analysis '))
+        self.assertEqual(lines[6].split(), ['rate_limit_wait_seconds', '900.00'])
+
+    def test_prometheus(self):
+        """Test the textfile export has one family per measure with labels"""
+        metrics = Metrics()
+        metrics.record('process', 2.0, 1.0, 'sentiment_analysis')
+        metrics.add('api_calls', 4)
+        metrics.set('polarity_cache_hits', 3, 'say "hi"')
+        text = metrics.prometheus()
+        lines = text.splitlines()
+        self.assertIn('# TYPE twitter_shill_hunter_stage_wall_seconds_total counter', lines)
+        self.assertIn('twitter_shill_hunter_stage_wall_seconds_total'
+                      '{stage="process",plugin="sentiment_analysis"} 2.0', lines)
+        self.assertIn('twitter_shill_hunter_api_calls_total 4.0', lines)
+        self.assertIn('twitter_shill_hunter_polarity_cache_hits_total'
+                      '{plugin="say \\"hi\\""} 3.0', lines)
+        self.assertEqual(len([l for l in lines if l.startswith('# HELP')]),
+                         len(set(l.split()[2] for l in lines if l.startswith('# HELP'))))
+        self.assertTrue(text.endswith('\n'))
+
+    def test_export(self):
+        """Test the JSON and Prometheus files are written as asked"""
+        metrics = Metrics()
+        metrics.add('posts', 10)
+        json_path = os.path.join(self.temp_dir, 'metrics.json')
+        prometheus_path = os.path.join(self.temp_dir, 'run.prom')
+        metrics.export({'json': json_path, 'prometheus': prometheus_path})
+
+        with open(json_path) as f:
+            saved = json.load(f)
+        self.assertEqual(saved['counters'], [{'name': 'posts', 'plugin': None, 'value': 10}])
+        with open(prometheus_path) as f:
+            self.assertIn('twitter_shill_hunter_posts_total 10.0', f.read())
+        self.assertEqual(sorted(os.listdir(self.temp_dir)), ['metrics.json', 'run.prom'])
+
+    def test_rate_limit_handler(self):
+        """Test tweepy's rate limit sleeps are counted while installed"""
+        metrics = Metrics()
+        api_log = logging.getLogger('tweepy.api')
+        client_log = logging.getLogger('tweepy.client')
+        root = logging.getLogger()
+        quiet = logging.NullHandler()
+        root.addHandler(quiet)
+        try:
+            with RateLimitHandler(metrics).installed():
+                api_log.warning("Rate limit reached. Sleeping for: 900")
+                client_log.warning("Rate limit exceeded. Sleeping for 12 seconds.")
+                api_log.warning("Something else")
+            api_log.warning("Rate limit reached. Sleeping for: 5")
+        finally:
+            root.removeHandler(quiet)
+        self.assertEqual(metrics.get('rate_limit_waits'), 2)
+        self.assertEqual(metrics.get('rate_limit_wait_seconds'), 912.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
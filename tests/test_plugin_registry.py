@@ -0,0 +1,75 @@
+"""
+Unit tests for the entry point plugin registry
+"""
+import io
+import sys
+import unittest
+from contextlib import redirect_stdout
+from importlib.metadata import EntryPoint
+from unittest.mock import patch
+from twitter_shill_hunter import plugin_registry
+from twitter_shill_hunter.plugin_registry import PluginRegistry, PROCESSOR_GROUP
+from twitter_shill_hunter.__main__ import list_plugins
+
+
+ENTRY_POINTS = [
+    EntryPoint('geo_analysis',
+               'twitter_shill_hunter.processors.geo_analysis:GeoAnalysis',
+               PROCESSOR_GROUP),
+    EntryPoint('text_normalizer',
+               'twitter_shill_hunter.text_normalizer:TextNormalizer',
+               PROCESSOR_GROUP),
+]
+
+
+class TestPluginRegistry(unittest.TestCase):
+    """Test cases for PluginRegistry"""
+
+    def setUp(self):
+        """Serve the fake entry points"""
+        patcher = patch.object(plugin_registry, 'group_entry_points',
+                               return_value=ENTRY_POINTS)
+        self.group_entry_points = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.registry = PluginRegistry()
+
+    def test_describe_does_not_import(self):
+        """Test listing plugins imports none of them"""
+        sys.modules.pop('twitter_shill_hunter.processors.geo_analysis', None)
+        self.assertEqual(self.registry.names(), ['geo_analysis', 'text_normalizer'])
+        self.assertEqual(self.registry.describe()[0], (
+            'geo_analysis', 'twitter_shill_hunter.processors.geo_analysis:GeoAnalysis'))
+        self.assertNotIn('twitter_shill_hunter.processors.geo_analysis', sys.modules)
+
+    def test_entry_points_read_once(self):
+        """Test package metadata is only read the first time"""
+        self.registry.names()
+        self.registry.describe()
+        self.group_entry_points.assert_called_once_with(PROCESSOR_GROUP)
+
+    def test_load(self):
+        """Test loading imports the selected plugin and caches it"""
+        from twitter_shill_hunter.text_normalizer import TextNormalizer
+        self.assertIs(self.registry.load('text_normalizer'), TextNormalizer)
+        self.assertIs(self.registry.load('text_normalizer'), TextNormalizer)
+        self.assertEqual(list(self.registry.loaded), ['text_normalizer'])
+
+    def test_unknown_plugin(self):
+        """Test an unknown plugin names the installed ones"""
+        with self.assertRaisesRegex(ValueError, 'geo_analysis, text_normalizer'):
+            self.registry.load('missing')
+
+    def test_list_plugins(self):
+        """Test the --list-plugins output"""
+        plugin_registry._registries.pop(PROCESSOR_GROUP, None)
+        self.addCleanup(plugin_registry._registries.pop, PROCESSOR_GROUP, None)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            list_plugins(PROCESSOR_GROUP)
+        self.assertIn(
+            'geo_analysis = twitter_shill_hunter.processors.geo_analysis:GeoAnalysis',
+            output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Unit tests for the PolarityCache score memo
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from twitter_shill_hunter.processors.sentiment_analysis.polarity_cache import PolarityCache
+
+
+SCORES = {'neg': 0.0, 'neu': 0.4, 'pos': 0.6, 'compound': 0.7}
+
+
+class TestPolarityCache(unittest.TestCase):
+    """Test cases for PolarityCache"""
+
+    def setUp(self):
+        """Set up a scoring function that records its calls"""
+        self.score = MagicMock(return_value=SCORES)
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_hit_after_miss(self):
+        """Test that a repeated text is served from the cache"""
+        cache = PolarityCache()
+
+        self.assertEqual(cache.get("Great news!", self.score), SCORES)
+        self.assertEqual(cache.get("Great news!", self.score), SCORES)
+
+        self.score.assert_called_once_with("Great news!")
+        self.assertEqual(cache.stats(), {'hits': 1, 'misses': 1, 'size': 1})
+
+    def test_whitespace_is_normalised(self):
+        """Test that texts differing only in whitespace share an entry"""
+        cache = PolarityCache()
+
+        cache.get("Great   news!\n", self.score)
+        cache.get(" Great news!", self.score)
+
+        self.score.assert_called_once()
+
+    def test_case_is_significant(self):
+        """Test that case changes are scored separately, as VADER weights caps"""
+        cache = PolarityCache()
+
+        cache.get("great news", self.score)
+        cache.get("GREAT news", self.score)
+
+        self.assertEqual(self.score.call_count, 2)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = PolarityCache(maxsize=2)
+
+        cache.get("one", self.score)
+        cache.get("two", self.score)
+        cache.get("one", self.score)
+        cache.get("three", self.score)
+        cache.get("one", self.score)
+        cache.get("two", self.score)
+
+        self.assertEqual([c.args[0] for c in self.score.call_args_list],
+                         ["one", "two", "three", "two"])
+        self.assertEqual(cache.stats()['size'], 2)
+
+    def test_get_many_scores_misses_in_one_batch(self):
+        """Test that batch lookups score each distinct miss once"""
+        cache = PolarityCache()
+        cache.get("cached", self.score)
+        score_batch = MagicMock(side_effect=lambda texts: [{'text': t} for t in texts])
+
+        results = cache.get_many(["cached", "new", "new ", "other"], score_batch)
+
+        score_batch.assert_called_once_with(["new", "other"])
+        self.assertEqual(results, [SCORES, {'text': 'new'}, {'text': 'new'}, {'text': 'other'}])
+        self.assertEqual(cache.stats(), {'hits': 2, 'misses': 3, 'size': 3})
+
+    def test_namespaces_are_kept_apart(self):
+        """Test that scores from different backends do not mix"""
+        path = os.path.join(self.temp_dir, 'polarity.db')
+        cache = PolarityCache(path=path)
+        cache.get("Great news!", self.score)
+        cache.close()
+
+        other_score = MagicMock(return_value={'compound': 0.1})
+        numpy_cache = PolarityCache(path=path, namespace='numpy')
+        numpy_cache.get("Great news!", other_score)
+        numpy_cache.close()
+
+        other_score.assert_called_once()
+
+    def test_persistent_cache(self):
+        """Test that scores written to disk are reused by a new cache"""
+        path = os.path.join(self.temp_dir, 'scores', 'polarity.db')
+        cache = PolarityCache(path=path)
+        cache.get("Great news!", self.score)
+        cache.close()
+
+        other_score = MagicMock()
+        reopened = PolarityCache(path=path)
+        self.assertEqual(reopened.get("Great news!", other_score), SCORES)
+        reopened.close()
+
+        other_score.assert_not_called()
+        self.assertEqual(reopened.stats()['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+"""
+Unit tests for the concurrent ProcessorScheduler
+"""
+import io
+import os
+import time
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+from twitter_shill_hunter.processor_scheduler import (
+    ProcessorScheduler, RemoteProcessor, execution_mode)
+
+
+class SlowProcessor():
+    """Processor waiting on an external service"""
+
+    execution = 'thread'
+
+    def __init__(self, name='slow'):
+        self.name = name
+
+    def process_data(self, tweets_and_date):
+        time.sleep(0.3)
+        print("%s saw %d tweets" % (self.name, len(tweets_and_date)))
+        return self.name
+
+
+class CountingProcessor():
+    """CPU bound processor keeping state between pages"""
+
+    execution = 'process'
+
+    def __init__(self):
+        self.seen = 0
+
+    def process_data(self, tweets_and_date):
+        self.seen += len(tweets_and_date)
+        print("counted %d in %d" % (self.seen, os.getpid()))
+        return self.seen
+
+    def reset(self):
+        self.seen = 0
+
+
+class SerialProcessor():
+    """Processor without a declared execution mode"""
+
+    def process_data(self, tweets_and_date):
+        print("serial")
+        return 'serial'
+
+
+class ExitingProcessor():
+    """Processor whose worker dies on an empty page"""
+
+    execution = 'process'
+
+    def process_data(self, tweets_and_date):
+        if not tweets_and_date:
+            os._exit(1)
+        return len(tweets_and_date)
+
+
+class FailingProcessor():
+    """Processor that raises"""
+
+    execution = 'thread'
+
+    def process_data(self, tweets_and_date):
+        raise RuntimeError("processor failed")
+
+
+class TestProcessorScheduler(unittest.TestCase):
+    """Test cases for ProcessorScheduler"""
+
+    def setUp(self):
+        """Set up a scheduler and sample tweets"""
+        self.scheduler = ProcessorScheduler()
+        self.tweets = [{'text': 'one'}, {'text': 'two'}]
+
+    def tearDown(self):
+        """Stop the scheduler's threads"""
+        self.scheduler.close()
+
+    def run_calls(self, calls):
+        """Run calls, returning results and printed output"""
+        output = io.StringIO()
+        with redirect_stdout(output):
+            results = self.scheduler.run(calls)
+        return results, output.getvalue()
+
+    def test_execution_mode(self):
+        """Test reading the declared execution mode"""
+        self.assertEqual(execution_mode(SlowProcessor), 'thread')
+        self.assertEqual(execution_mode(CountingProcessor()), 'process')
+        self.assertEqual(execution_mode(SerialProcessor), 'serial')
+        self.assertEqual(execution_mode(object()), 'serial')
+
+    def test_thread_processors_run_concurrently(self):
+        """Test that a page takes as long as the slowest processor"""
+        calls = [('a', SlowProcessor('a'), [self.tweets]),
+                 ('b', SlowProcessor('b'), [self.tweets]),
+                 ('c', SlowProcessor('c'), [self.tweets])]
+
+        started = time.perf_counter()
+        results, output = self.run_calls(calls)
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.8)
+        self.assertEqual(results, {'a': 'a', 'b': 'b', 'c': 'c'})
+        self.assertEqual(list(results), ['a', 'b', 'c'])
+
+    def test_output_in_processor_order(self):
+        """Test that printed output is replayed in processor order"""
+        calls = [('slow', SlowProcessor(), [self.tweets]),
+                 ('serial', SerialProcessor(), [self.tweets])]
+
+        results, output = self.run_calls(calls)
+
+        self.assertEqual(output, "slow saw 2 tweets\nserial\n")
+        self.assertEqual(results, {'slow': 'slow', 'serial': 'serial'})
+
+    def test_errors_raised_after_all_processors(self):
+        """Test that an error is raised once the other processors finish"""
+        calls = [('failing', FailingProcessor(), [self.tweets]),
+                 ('slow', SlowProcessor(), [self.tweets])]
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            with self.assertRaises(RuntimeError):
+                self.scheduler.run(calls)
+
+        self.assertEqual(output.getvalue(), "slow saw 2 tweets\n")
+
+    def test_single_processor_runs_directly(self):
+        """Test that a lone processor is called without the pool"""
+        results, output = self.run_calls([('slow', SlowProcessor(), [self.tweets])])
+
+        self.assertEqual(results, {'slow': 'slow'})
+        self.assertIsNone(self.scheduler.threads)
+
+    def test_remote_processor_keeps_state(self):
+        """Test that a process processor keeps state in its worker"""
+        remote = RemoteProcessor(CountingProcessor)
+        calls = [('count', remote, [self.tweets]),
+                 ('serial', SerialProcessor(), [self.tweets])]
+        try:
+            first, output = self.run_calls(calls)
+            second, _ = self.run_calls(calls)
+            remote.reset()
+            third, _ = self.run_calls(calls)
+        finally:
+            remote.close()
+
+        self.assertEqual(first['count'], 2)
+        self.assertEqual(second['count'], 4)
+        self.assertEqual(third['count'], 2)
+        self.assertNotIn(str(os.getpid()), output)
+        self.assertTrue(output.startswith("counted 2 in "))
+        self.assertTrue(output.endswith("serial\n"))
+        self.assertIsNone(remote.executor)
+
+    def test_process_processor_kept_in_process(self):
+        """Test that a process processor not given a worker runs on a thread"""
+        calls = [('count', CountingProcessor(), [self.tweets]),
+                 ('slow', SlowProcessor(), [self.tweets])]
+
+        results, output = self.run_calls(calls)
+
+        self.assertEqual(results, {'count': 2, 'slow': 'slow'})
+        self.assertIn("counted 2 in %d" % os.getpid(), output)
+        self.assertIsNotNone(self.scheduler.threads)
+
+    def test_broken_worker_is_replaced(self):
+        """Test that a worker dying fails only its own call"""
+        remote = RemoteProcessor(ExitingProcessor)
+        try:
+            with self.assertRaises(BrokenProcessPool):
+                remote.call('process_data', ([],))
+            self.assertIsNone(remote.executor)
+            result, output = remote.call('process_data', (self.tweets,))
+        finally:
+            remote.close()
+
+        self.assertEqual(result, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,208 @@
+"""
+Unit tests for the per processor cProfile and sampling profiler
+"""
+import io
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+from twitter_shill_hunter.profiler import (
+    SAMPLE, ProcessorProfiler, ProfiledProcessor, collapsed_from_stats, get_profiler)
+
+
+def busy_work(seconds):
+    """Spin for a while so the sampler sees this function"""
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += 1
+    return total
+
+
+class BusyProcessor():
+    """Processor spending its time in busy_work"""
+
+    execution = 'thread'
+
+    def __init__(self):
+        self.closed = False
+
+    def process_data(self, tweets_and_date):
+        busy_work(0.05)
+        return len(tweets_and_date)
+
+    def summary(self):
+        return {'busy': True}
+
+    def close(self):
+        self.closed = True
+
+
+class MeetingProcessor():
+    """Processor whose calls wait for each other at a barrier"""
+
+    execution = 'thread'
+
+    def __init__(self, parties):
+        self.barrier = threading.Barrier(parties, timeout=5)
+
+    def process_data(self, tweets_and_date):
+        self.barrier.wait()
+        return len(tweets_and_date)
+
+
+def call_in_threads(processor, count):
+    """Call process_data from count threads at once, returning the errors raised"""
+    errors = []
+
+    def call():
+        try:
+            processor.process_data([{}])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+class TestProfiler(unittest.TestCase):
+    """Test cases for ProcessorProfiler"""
+
+    def setUp(self):
+        """Set up a scratch directory for profiles"""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def read_collapsed(self, name):
+        """Return {stack: count} read from a collapsed stack file"""
+        stacks = {}
+        with open(os.path.join(self.temp_dir, name)) as f:
+            for line in f:
+                stack, count = line.rsplit(' ', 1)
+                stacks[stack] = int(count)
+        return stacks
+
+    def test_get_profiler(self):
+        """Test profiling is off without options and modes are checked"""
+        self.assertIsNone(get_profiler(None))
+        profiler = get_profiler({'mode': 'sample', 'path': self.temp_dir, 'interval': 0.01})
+        self.assertEqual((profiler.mode, profiler.interval), (SAMPLE, 0.01))
+        with self.assertRaises(ValueError):
+            get_profiler({'mode': 'perf'})
+
+    def test_wrapped_processor(self):
+        """Test the stand in keeps the processor's results and attributes"""
+        processor = ProcessorProfiler(self.temp_dir).wrap('busy', BusyProcessor())
+        self.assertIsInstance(processor, ProfiledProcessor)
+        self.assertEqual(processor.process_data([{}, {}]), 2)
+        self.assertEqual(processor.execution, 'thread')
+        self.assertEqual(processor.summary(), {'busy': True})
+
+    def test_cprofile_files(self):
+        """Test closing writes a loadable pstats file and collapsed stacks"""
+        busy = BusyProcessor()
+        processor = ProcessorProfiler(self.temp_dir).wrap('busy/plugin', busy)
+        processor.process_data([{}])
+        processor.process_data([{}])
+        with redirect_stdout(io.StringIO()):
+            processor.close()
+
+        self.assertTrue(busy.closed)
+        self.assertEqual(sorted(os.listdir(self.temp_dir)),
+                         ['busy_plugin.collapsed', 'busy_plugin.pstats'])
+        stats = pstats.Stats(os.path.join(self.temp_dir, 'busy_plugin.pstats'))
+        calls = dict((func[2], stat[1]) for func, stat in stats.stats.items())
+        self.assertEqual(calls['process_data'], 2)
+        stacks = self.read_collapsed('busy_plugin.collapsed')
+        busy_stacks = [s for s in stacks if s.endswith('test_profiler.py:busy_work')]
+        self.assertEqual(len(busy_stacks), 1)
+        self.assertTrue(busy_stacks[0].startswith('test_profiler.py:process_data;'))
+        # Most of the time is spent spinning
+        spinning = sum(v for s, v in stacks.items() if busy_stacks[0] in s)
+        self.assertTrue(spinning > 0.9 * sum(stacks.values()))
+
+    @patch('twitter_shill_hunter.profiler.SERIALIZE_PROFILES', False)
+    def test_threads_profiled_concurrently(self):
+        """Test each thread profiles on its own without waiting for the others"""
+        processor = ProcessorProfiler(self.temp_dir).wrap('meeting', MeetingProcessor(2))
+
+        self.assertEqual(call_in_threads(processor, 2), [])
+        self.assertEqual(len(processor.profiles), 2)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            processor.close()
+
+        stats = pstats.Stats(os.path.join(self.temp_dir, 'meeting.pstats'))
+        calls = dict((func[2], stat[1]) for func, stat in stats.stats.items())
+        self.assertEqual(calls['process_data'], 2)
+        self.assertNotIn('serialized', output.getvalue())
+
+    @patch('twitter_shill_hunter.profiler.SERIALIZE_PROFILES', True)
+    def test_serialized_calls_reported(self):
+        """Test that calls taking turns are said to be serialized in the output"""
+        processor = ProcessorProfiler(self.temp_dir).wrap('busy', BusyProcessor())
+
+        self.assertEqual(call_in_threads(processor, 2), [])
+        output = io.StringIO()
+        with redirect_stdout(output):
+            processor.close()
+
+        self.assertEqual(list(processor.profiles), [])
+        self.assertIn('Profiled calls of busy were serialized', output.getvalue())
+        self.assertRegex(output.getvalue(), r'[01] of 2 calls waited for another')
+
+    def test_nothing_profiled(self):
+        """Test a processor never called writes no files"""
+        processor = ProcessorProfiler(self.temp_dir).wrap('idle', BusyProcessor())
+        processor.close()
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+    def test_sampled_stacks(self):
+        """Test sampling writes collapsed stacks below process_data"""
+        profiler = ProcessorProfiler(self.temp_dir, mode=SAMPLE, interval=0.001)
+        processor = profiler.wrap('sampled', BusyProcessor())
+        for i in range(3):
+            processor.process_data([{}])
+        with redirect_stdout(io.StringIO()):
+            processor.close()
+
+        self.assertEqual(os.listdir(self.temp_dir), ['sampled.collapsed'])
+        stacks = self.read_collapsed('sampled.collapsed')
+        self.assertTrue(all(s.startswith('test_profiler.py:process_data') for s in stacks))
+        self.assertTrue(any('busy_work' in s for s in stacks))
+
+    def test_collapsed_from_stats(self):
+        """Test time is split between callers by the time each spent in a callee"""
+        main = ('app.py', 1, 'main')
+        left = ('app.py', 5, 'left')
+        right = ('app.py', 9, 'right')
+        shared = ('lib.py', 1, 'shared')
+        stats = {
+            main: (1, 1, 1.0, 10.0, {}),
+            left: (1, 1, 1.0, 4.0, {main: (1, 1, 1.0, 4.0)}),
+            right: (1, 1, 1.0, 5.0, {main: (1, 1, 1.0, 5.0)}),
+            shared: (2, 2, 7.0, 7.0, {left: (1, 1, 3.0, 3.0), right: (1, 1, 4.0, 4.0)}),
+        }
+        self.assertEqual(collapsed_from_stats(stats), {
+            'app.py:main': 1000000,
+            'app.py:main;app.py:left': 1000000,
+            'app.py:main;app.py:left;lib.py:shared': 3000000,
+            'app.py:main;app.py:right': 1000000,
+            'app.py:main;app.py:right;lib.py:shared': 4000000,
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
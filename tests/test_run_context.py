@@ -0,0 +1,79 @@
+"""
+Unit tests for RunContext and processor context fields
+"""
+import unittest
+from twitter_shill_hunter import run_context
+from twitter_shill_hunter.run_context import RunContext, context_fields
+
+
+class DeclaredProcessor():
+    context_fields = ('dialect', 'search_terms')
+
+    def process_data(self, tweets_and_date, *args):
+        return args
+
+
+class UndeclaredProcessor():
+
+    def process_data(self, tweets_and_date, search_terms, page_size):
+        return search_terms, page_size
+
+    def warm_up(self, dialect):
+        pass
+
+
+class UnknownFieldProcessor():
+    context_fields = ('dialect', 'api_key')
+
+
+class Settings():
+    target = 'someone'
+    search_terms = ['foo']
+    search_options = {}
+    sentiment_options = {}
+    spelling_options = {}
+    dialect = 'en-GB'
+    page_size = 20
+    history_limit = 100
+
+
+class TestRunContext(unittest.TestCase):
+    """Test cases for RunContext"""
+
+    def test_from_settings(self):
+        """Test building a context from settings attributes"""
+        context = RunContext.from_settings(Settings())
+        self.assertEqual(context.target, 'someone')
+        self.assertEqual(context.values(('dialect', 'page_size')), ['en-GB', 20])
+
+    def test_unknown_field_rejected(self):
+        """Test an unknown field is a TypeError"""
+        with self.assertRaises(TypeError):
+            RunContext(dialect='en-GB', api_key='secret')
+        self.assertIsNone(RunContext().dialect)
+
+    def test_declared_fields(self):
+        """Test process_data uses the declared fields in order"""
+        self.assertEqual(context_fields(DeclaredProcessor), ('dialect', 'search_terms'))
+
+    def test_signature_read_once(self):
+        """Test plugins without a declaration are read from their signature once"""
+        run_context._declared_fields.pop((UndeclaredProcessor, 'process_data'), None)
+        self.assertEqual(context_fields(UndeclaredProcessor), ('search_terms', 'page_size'))
+        self.assertEqual(context_fields(UndeclaredProcessor, 'warm_up'), ('dialect',))
+
+        original = run_context.inspect.getfullargspec
+        run_context.inspect.getfullargspec = None
+        try:
+            self.assertEqual(context_fields(UndeclaredProcessor), ('search_terms', 'page_size'))
+        finally:
+            run_context.inspect.getfullargspec = original
+
+    def test_unknown_context_field(self):
+        """Test asking for a field the context does not hold"""
+        with self.assertRaises(ValueError):
+            context_fields(UnknownFieldProcessor)
+
+
+if __name__ == '__main__':
+    unittest.main()
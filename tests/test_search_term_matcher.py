@@ -0,0 +1,143 @@
+"""
+Unit tests for the compiled SearchTermMatcher
+"""
+import unittest
+from twitter_shill_hunter.processors.sentiment_analysis.search_term_matcher import SearchTermMatcher
+from twitter_shill_hunter.tokenizer import Tokenizer, vocabulary
+
+
+class TestSearchTermMatcher(unittest.TestCase):
+    """Test cases for SearchTermMatcher"""
+
+    def test_whole_word_matching(self):
+        """Test that terms do not match inside longer words"""
+        matcher = SearchTermMatcher(["Irma"])
+
+        self.assertEqual(matcher.match("Hurricane Irma is coming"), ["Irma"])
+        self.assertEqual(matcher.match("Irmandade do Brasil"), [])
+
+    def test_case_insensitive_by_default(self):
+        """Test that matching folds case unless asked not to"""
+        matcher = SearchTermMatcher(["Hurricane"])
+
+        self.assertEqual(matcher.match("HURRICANE season"), ["Hurricane"])
+        self.assertEqual(matcher.match("hurricane season"), ["Hurricane"])
+
+    def test_case_sensitive(self):
+        """Test case sensitive matching"""
+        matcher = SearchTermMatcher(["Hurricane"], case_sensitive=True)
+
+        self.assertEqual(matcher.match("Hurricane season"), ["Hurricane"])
+        self.assertEqual(matcher.match("hurricane season"), [])
+
+    def test_phrase_matching(self):
+        """Test that multi word terms match as consecutive words"""
+        matcher = SearchTermMatcher(["climate change", "change"])
+
+        self.assertEqual(matcher.match("Climate  change, again"), ["climate change", "change"])
+        self.assertEqual(matcher.match("climate policy will change"), ["change"])
+
+    def test_all_hits_returned_in_config_order(self):
+        """Test that every term found is returned once, in configured order"""
+        matcher = SearchTermMatcher(["storm", "Irma", "Florida"])
+
+        hits = matcher.match("Florida braces for Irma. Irma storm Florida")
+
+        self.assertEqual(hits, ["storm", "Irma", "Florida"])
+
+    def test_substring_mode(self):
+        """Test substring matching including terms sharing a prefix"""
+        matcher = SearchTermMatcher(["Irma", "Irmandade", "and"], whole_word=False)
+
+        self.assertEqual(matcher.match("irmandade"), ["Irma", "Irmandade", "and"])
+        self.assertEqual(matcher.match("IRMA"), ["Irma"])
+
+    def test_terms_without_word_characters(self):
+        """Test that symbol only terms fall back to substring matching"""
+        matcher = SearchTermMatcher(["🌀", "storm"])
+
+        self.assertEqual(matcher.match("Big storm 🌀🌀"), ["🌀", "storm"])
+
+    def test_terms_with_symbols(self):
+        """Test that symbols in a term are kept rather than dropped"""
+        matcher = SearchTermMatcher(["C++", "$TSLA"])
+
+        self.assertEqual(matcher.match("Rewriting it all in C++ again"), ["C++"])
+        self.assertEqual(matcher.match("Plan C or plan c, see section c"), [])
+        self.assertEqual(matcher.match("$tsla to the moon"), ["$TSLA"])
+        self.assertEqual(matcher.match("TSLA earnings today"), [])
+        self.assertEqual(matcher.match("$TSLAQ is a different ticker"), [])
+        self.assertEqual(matcher.match("abc++ and x$TSLA"), ["$TSLA"])
+
+    def test_symbol_terms_sharing_a_start(self):
+        """Test that symbol terms are found in one pass, shorter ones included"""
+        matcher = SearchTermMatcher(["$TSLA", "$TSLA  calls", "C++", "c++ 20"])
+
+        self.assertEqual(matcher.match("Buying $tsla calls"), ["$TSLA", "$TSLA  calls"])
+        self.assertEqual(matcher.match("Buying $TSLA callsign"), ["$TSLA"])
+        self.assertEqual(matcher.match("c++ 20 and C++"), ["C++", "c++ 20"])
+        self.assertEqual(matcher.match("c++ 2000"), ["C++"])
+        self.assertEqual(len(matcher.symbol_terms), 4)
+
+    def test_match_tweet_with_symbols(self):
+        """Test that symbol terms are found through a tweet's shared view"""
+        matcher = SearchTermMatcher(["C++", "rust"])
+        tweet = {'text': 'Rust or C++? Not C.'}
+
+        self.assertEqual(matcher.match_tweet(tweet), ["C++", "rust"])
+        self.assertEqual(matcher.match_tweet({'text': 'Vitamin C'}), [])
+
+    def test_terms_with_numbers(self):
+        """Test that numbers, which tweets are not tokenized into, still match"""
+        matcher = SearchTermMatcher(["2024", "covid 19", "g7"])
+        tweet = {'text': 'The 2024 G7 summit on Covid-19'}
+
+        self.assertEqual(matcher.match_tweet(tweet), ["2024", "covid 19", "g7"])
+        self.assertEqual(matcher.match_tweet({'text': 'In 20245 covid 190'}), [])
+
+    def test_match_tweet_after_vocabulary_cleared(self):
+        """Test that phrases are interned again when the vocabulary is cleared"""
+        matcher = SearchTermMatcher(["climate change", "storm"])
+        vocabulary.clear()
+
+        tweet = {'text': 'Storm warnings and climate change'}
+        self.assertEqual(matcher.match_tweet(tweet), ["climate change", "storm"])
+        self.assertEqual(matcher.generation, vocabulary.generation)
+
+    def test_no_terms(self):
+        """Test a matcher with nothing to find"""
+        matcher = SearchTermMatcher([])
+
+        self.assertEqual(matcher.match("anything at all"), [])
+
+    def test_apostrophes_stay_in_words(self):
+        """Test that terms with apostrophes match whole"""
+        matcher = SearchTermMatcher(["don't", "don"])
+
+        self.assertEqual(matcher.match("Don't panic"), ["don't"])
+
+    def test_normalised_text_matches(self):
+        """Test that curly quotes and styled letters match plain terms"""
+        matcher = SearchTermMatcher(["don't", "free"])
+
+        self.assertEqual(matcher.match("Don’t miss 𝐅𝐑𝐄𝐄 stuff"), ["don't", "free"])
+
+    def test_match_tweet_uses_shared_tokens(self):
+        """Test matching a tweet's shared token ids"""
+        matcher = SearchTermMatcher(["Hurricane", "storm season"])
+        tweet = {'text': 'HURRICANE and Storm Season'}
+        stale = {'text': 'HURRICANE season', 'tokens': Tokenizer().tokenize('nothing here')}
+
+        self.assertEqual(matcher.match_tweet(tweet), ["Hurricane", "storm season"])
+        self.assertIn('tokens', tweet)
+        self.assertEqual(matcher.match_tweet(stale), [])
+
+    def test_match_tweet_case_sensitive(self):
+        """Test that case sensitive matching uses the normalised text"""
+        matcher = SearchTermMatcher(["Hurricane", "ir"], case_sensitive=True, whole_word=False)
+
+        self.assertEqual(matcher.match_tweet({'text': 'Hurricane Irma'}), ["Hurricane"])
+
+
+if __name__ == '__main__':
+    unittest.main()
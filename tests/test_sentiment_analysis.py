@@ -3,20 +3,30 @@ Unit tests for SentimentAnalysis processor
 """
 import unittest
 from unittest.mock import patch, MagicMock
+from twitter_shill_hunter.processors.sentiment_analysis import sentiment_analysis as sentiment_module
 from twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis import SentimentAnalysis
 from mock_data import SAMPLE_PROCESSED_TWEETS
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class TestSentimentAnalysis(unittest.TestCase):
     """Test cases for SentimentAnalysis processor"""
 
     def setUp(self):
         """Set up test fixtures"""
+        # Drop the process wide analyzer and score caches between tests
+        sentiment_module._shared_analyzer = None
+        sentiment_module._batch_scorer = None
+        sentiment_module._polarity_caches.clear()
         self.sentiment_analyzer = SentimentAnalysis()
         self.sample_tweets = SAMPLE_PROCESSED_TWEETS
         self.search_terms = ["color", "Organization", "test"]
 
-    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.SentimentIntensityAnalyzer')
+    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.vader.SentimentIntensityAnalyzer')
     def test_process_data_with_matching_terms(self, mock_sia_class):
         """Test sentiment analysis when search terms are found"""
         # Mock the SentimentIntensityAnalyzer
@@ -31,20 +41,27 @@ class TestSentimentAnalysis(unittest.TestCase):
 
         # Mock the aggregate_search_results method
         with patch.object(self.sentiment_analyzer, 'aggregate_search_results') as mock_aggregate:
-            mock_aggregate.return_value = {'compound': 0.8}
+            mock_aggregate.return_value = {'tweets_analyzed': 1, 'compound_search_results': 0.8}
             
-            self.sentiment_analyzer.process_data(self.sample_tweets, self.search_terms)
+            records = self.sentiment_analyzer.process_data(self.sample_tweets, self.search_terms)
             
             # Verify SentimentIntensityAnalyzer was called
             mock_sia_class.assert_called_once()
             
             # Verify polarity_scores was called for tweets with matching terms
             self.assertTrue(mock_sia.polarity_scores.called)
+
+            # The scored tweets are returned for the page, not kept
+            self.assertEqual(len(records), self.sentiment_analyzer.tweets_matched)
+            self.assertEqual(records[0]['compound'], 0.8)
             
-            # Verify aggregate_search_results was called
+            # Results are aggregated once, for the target's summary
+            mock_aggregate.assert_not_called()
+            self.assertEqual(self.sentiment_analyzer.summary(),
+                             {'tweets_analyzed': 1, 'compound_search_results': 0.8})
             mock_aggregate.assert_called_once_with(self.search_terms)
 
-    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.SentimentIntensityAnalyzer')
+    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.vader.SentimentIntensityAnalyzer')
     def test_process_data_no_matching_terms(self, mock_sia_class):
         """Test sentiment analysis when no search terms are found"""
         mock_sia = MagicMock()
@@ -64,11 +81,12 @@ class TestSentimentAnalysis(unittest.TestCase):
     def test_initialization(self):
         """Test SentimentAnalysis initialization"""
         analyzer = SentimentAnalysis()
-        self.assertEqual(analyzer.aggregated_results, [])
+        self.assertEqual(analyzer.term_totals, {})
+        self.assertEqual(analyzer.tweets_matched, 0)
 
-    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.SentimentIntensityAnalyzer')
-    def test_aggregated_results_populated(self, mock_sia_class):
-        """Test that aggregated_results are populated correctly"""
+    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.vader.SentimentIntensityAnalyzer')
+    def test_returned_results_populated(self, mock_sia_class):
+        """Test that the returned results are populated correctly"""
         mock_sia = MagicMock()
         mock_sia_class.return_value = mock_sia
         mock_sia.polarity_scores.return_value = {
@@ -81,18 +99,18 @@ class TestSentimentAnalysis(unittest.TestCase):
         with patch.object(self.sentiment_analyzer, 'aggregate_search_results') as mock_aggregate:
             mock_aggregate.return_value = {'compound': 0.7}
             
-            self.sentiment_analyzer.process_data(self.sample_tweets, ["color"])
+            results = self.sentiment_analyzer.process_data(self.sample_tweets, ["color"])
             
-            # Check that aggregated_results contains the expected structure
-            self.assertTrue(len(self.sentiment_analyzer.aggregated_results) > 0)
+            # Check that the results contain the expected structure
+            self.assertTrue(len(results) > 0)
             
-            # Verify the structure of aggregated results
-            result = self.sentiment_analyzer.aggregated_results[0]
+            # Verify the structure of the results
+            result = results[0]
             expected_keys = ['date', 'tweet', 'search_terms', 'neg', 'neu', 'pos', 'compound']
             for key in expected_keys:
                 self.assertIn(key, result)
 
-    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.SentimentIntensityAnalyzer')
+    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.vader.SentimentIntensityAnalyzer')
     def test_search_terms_found_tracking(self, mock_sia_class):
         """Test that found search terms are tracked correctly"""
         mock_sia = MagicMock()
@@ -109,28 +127,176 @@ class TestSentimentAnalysis(unittest.TestCase):
             
             # Test with terms that should be found in our sample tweets
             search_terms = ["color", "Organization"]
-            self.sentiment_analyzer.process_data(self.sample_tweets, search_terms)
+            results = self.sentiment_analyzer.process_data(self.sample_tweets, search_terms)
             
-            # Check that at least one result was added
-            self.assertTrue(len(self.sentiment_analyzer.aggregated_results) > 0)
+            # Check that at least one result was returned
+            self.assertTrue(len(results) > 0)
             
             # Check that search terms were properly recorded
-            result = self.sentiment_analyzer.aggregated_results[0]
+            result = results[0]
             self.assertIn('search_terms', result)
             self.assertIsInstance(result['search_terms'], list)
 
+    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.vader.SentimentIntensityAnalyzer')
+    def test_analyzer_reused_and_reset_between_targets(self, mock_sia_class):
+        """Test that the analyzer is built once and results are cleared per target"""
+        mock_sia = MagicMock()
+        mock_sia_class.return_value = mock_sia
+        mock_sia.polarity_scores.return_value = {
+            'neg': 0.0, 'neu': 0.5, 'pos': 0.5, 'compound': 0.5
+        }
+
+        self.sentiment_analyzer.process_data(self.sample_tweets, ["color"])
+        self.assertEqual(self.sentiment_analyzer.tweets_matched, 1)
+
+        self.sentiment_analyzer.reset()
+        self.assertEqual(self.sentiment_analyzer.tweets_matched, 0)
+        self.assertEqual(self.sentiment_analyzer.term_totals, {})
+
+        self.sentiment_analyzer.process_data(self.sample_tweets, ["color"])
+        mock_sia_class.assert_called_once()
+        self.assertEqual(self.sentiment_analyzer.summary()['tweets_analyzed'], 1)
+
+    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.vader.SentimentIntensityAnalyzer')
+    def test_search_terms_match_whole_words(self, mock_sia_class):
+        """Test that search terms match whole words regardless of case"""
+        mock_sia = MagicMock()
+        mock_sia_class.return_value = mock_sia
+        mock_sia.polarity_scores.return_value = {
+            'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': 0.0
+        }
+        tweets = [
+            {'date': 'date1', 'text': 'Hurricane IRMA is close'},
+            {'date': 'date2', 'text': 'Irmandade da Santa Casa'}
+        ]
+
+        with patch.object(self.sentiment_analyzer, 'aggregate_search_results'):
+            results = self.sentiment_analyzer.process_data(tweets, ["Irma"])
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['search_terms'], ["Irma"])
+
+    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.vader.SentimentIntensityAnalyzer')
+    def test_search_options(self, mock_sia_class):
+        """Test case sensitive substring matching through search_options"""
+        mock_sia = MagicMock()
+        mock_sia_class.return_value = mock_sia
+        mock_sia.polarity_scores.return_value = {
+            'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': 0.0
+        }
+        tweets = [
+            {'date': 'date1', 'text': 'Irmandade da Santa Casa'},
+            {'date': 'date2', 'text': 'irma'}
+        ]
+
+        with patch.object(self.sentiment_analyzer, 'aggregate_search_results'):
+            results = self.sentiment_analyzer.process_data(
+                tweets, ["Irma"], {'case_sensitive': True, 'whole_word': False})
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['date'], 'date1')
+
+    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.vader.SentimentIntensityAnalyzer')
+    def test_analyzer_shared_between_instances(self, mock_sia_class):
+        """Test that every instance uses one process wide analyzer"""
+        mock_sia_class.return_value.polarity_scores.return_value = {
+            'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': 0.0
+        }
+
+        SentimentAnalysis().process_data(self.sample_tweets, ["color"])
+        SentimentAnalysis().process_data(self.sample_tweets, ["color"])
+
+        mock_sia_class.assert_called_once()
+
+    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.vader.SentimentIntensityAnalyzer')
+    def test_identical_texts_scored_once(self, mock_sia_class):
+        """Test that repeated texts hit the polarity cache"""
+        mock_sia = MagicMock()
+        mock_sia_class.return_value = mock_sia
+        mock_sia.polarity_scores.return_value = {
+            'neg': 0.0, 'neu': 0.5, 'pos': 0.5, 'compound': 0.6
+        }
+        copypasta = [
+            {'date': 'date%d' % i, 'text': 'Irma  is a hoax, share this!'}
+            for i in range(5)
+        ]
+
+        with patch.object(self.sentiment_analyzer, 'aggregate_search_results'):
+            results = self.sentiment_analyzer.process_data(copypasta, ["Irma"])
+
+        mock_sia.polarity_scores.assert_called_once()
+        self.assertEqual(len(results), 5)
+        self.assertEqual(self.sentiment_analyzer.cache_stats()['hits'], 4)
+        self.assertEqual(self.sentiment_analyzer.cache_stats()['misses'], 1)
+        self.assertEqual(self.sentiment_analyzer.counters(),
+                         {'polarity_cache_hits': 4, 'polarity_cache_misses': 1})
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_numpy_backend_matches_vader(self):
+        """Test that the numpy backend gives the reference scores"""
+        vader = SentimentAnalysis()
+        expected = vader.process_data(self.sample_tweets, self.search_terms)
+        batched = SentimentAnalysis()
+        results = batched.process_data(self.sample_tweets, self.search_terms,
+                                       sentiment_options={'backend': 'numpy'})
+
+        self.assertTrue(len(expected) > 0)
+        self.assertEqual(results, expected)
+        self.assertEqual(batched.summary(), vader.summary())
+        self.assertIsNot(batched.polarity_cache, vader.polarity_cache)
+
+    def test_numpy_backend_without_numpy(self):
+        """Test that a missing NumPy falls back to the vader backend"""
+        with patch.object(sentiment_module, 'get_batch_scorer', return_value=None):
+            backend, score_batch = sentiment_module.get_scorer('numpy')
+
+        self.assertEqual(backend, 'vader')
+        self.assertEqual(score_batch(["good"]), [sentiment_module.get_analyzer().polarity_scores("good")])
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend is rejected"""
+        with self.assertRaises(ValueError):
+            self.sentiment_analyzer.process_data(
+                self.sample_tweets, self.search_terms, sentiment_options={'backend': 'gpu'})
+
     def test_empty_tweets_list(self):
         """Test processing with empty tweets list"""
         with patch.object(self.sentiment_analyzer, 'aggregate_search_results') as mock_aggregate:
-            mock_aggregate.return_value = {'compound': 0.0}
-            
-            self.sentiment_analyzer.process_data([], self.search_terms)
+            self.assertEqual(self.sentiment_analyzer.process_data([], self.search_terms), [])
             
             # Should have no aggregated results
-            self.assertEqual(len(self.sentiment_analyzer.aggregated_results), 0)
-            
-            # aggregate_search_results should still be called
-            mock_aggregate.assert_called_once_with(self.search_terms)
+            self.assertEqual(self.sentiment_analyzer.tweets_matched, 0)
+
+    def test_summary_of_empty_target(self):
+        """Test the summary of a target with no matching tweets"""
+        self.sentiment_analyzer.process_data([], self.search_terms)
+
+        summary = self.sentiment_analyzer.summary()
+
+        self.assertEqual(summary['tweets_analyzed'], 0)
+        self.assertEqual(summary['compound_search_results'], 0)
+        self.assertEqual(summary['search_term_compound'],
+                         dict((st, 0) for st in self.search_terms))
+
+    @patch('twitter_shill_hunter.processors.sentiment_analysis.sentiment_analysis.vader.SentimentIntensityAnalyzer')
+    def test_summary_from_running_totals(self, mock_sia_class):
+        """Test that the summary averages each term over every page"""
+        mock_sia_class.return_value.polarity_scores.side_effect = lambda text: {
+            'neg': 0.0, 'neu': 0.5, 'pos': 0.5,
+            'compound': 0.8 if 'good' in text else -0.4}
+        first = [{'date': 'date1', 'text': 'Irma is good'},
+                 {'date': 'date2', 'text': 'Irma and Maria are bad'}]
+        second = [{'date': 'date3', 'text': 'Maria is good'}]
+
+        self.sentiment_analyzer.process_data(first, ["Irma", "Maria", "Jose"])
+        self.sentiment_analyzer.process_data(second, ["Irma", "Maria", "Jose"])
+        summary = self.sentiment_analyzer.summary()
+
+        self.assertEqual(summary['tweets_analyzed'], 3)
+        self.assertAlmostEqual(summary['search_term_compound']['Irma'], 0.2)
+        self.assertAlmostEqual(summary['search_term_compound']['Maria'], 0.2)
+        self.assertEqual(summary['search_term_compound']['Jose'], 0)
+        self.assertAlmostEqual(summary['compound_search_results'], 0.2)
 
     def test_empty_search_terms(self):
         """Test processing with empty search terms"""
@@ -140,7 +306,7 @@ class TestSentimentAnalysis(unittest.TestCase):
             self.sentiment_analyzer.process_data(self.sample_tweets, [])
             
             # Should have no aggregated results since no search terms provided
-            self.assertEqual(len(self.sentiment_analyzer.aggregated_results), 0)
+            self.assertEqual(self.sentiment_analyzer.tweets_matched, 0)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,117 @@
+"""
+Unit tests for the result sinks
+"""
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from twitter_shill_hunter.sinks import (get_sink, CsvSink, JsonlSink, QuietSink,
+                                        SummarySink, CSV_COLUMNS)
+
+RECORDS = [
+    {'date': 'Wed Oct 11 10:30:00 +0000 2023', 'tweet': 'Great colour',
+     'search_terms': ['colour'], 'neg': 0.0, 'neu': 0.4, 'pos': 0.6, 'compound': 0.6},
+    {'date': 'Thu Oct 12 10:30:00 +0000 2023', 'tweet': 'Bad colour',
+     'search_terms': ['colour'], 'neg': 0.6, 'neu': 0.4, 'pos': 0.0, 'compound': -0.5},
+]
+SUMMARY = {'tweets_analyzed': 2, 'compound_search_results': 0.05,
+           'search_term_compound': {'colour': 0.05}}
+
+
+class TestSinks(unittest.TestCase):
+    """Test cases for the result sinks"""
+
+    def setUp(self):
+        """Set up an output directory"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'results')
+
+    def test_get_sink(self):
+        """Test sinks are chosen by format, with a summary by default"""
+        self.assertIsInstance(get_sink(), SummarySink)
+        self.assertIsInstance(get_sink({'format': 'quiet'}), QuietSink)
+        self.assertIsInstance(get_sink({'format': 'jsonl'}), JsonlSink)
+        self.assertIsInstance(get_sink({'format': 'csv'}), CsvSink)
+        with self.assertRaises(ValueError):
+            get_sink({'format': 'xml'})
+
+    def test_jsonl(self):
+        """Test records and summaries are written one per line"""
+        sink = JsonlSink(self.path)
+        sink.write('someone', 'sentiment_analysis', RECORDS)
+        sink.write_summary('someone', 'sentiment_analysis', SUMMARY)
+        sink.close()
+
+        with open(self.path) as output:
+            lines = [json.loads(line) for line in output]
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(lines[0]['target'], 'someone')
+        self.assertEqual(lines[0]['type'], 'record')
+        self.assertEqual(lines[1]['compound'], -0.5)
+        self.assertEqual(lines[2]['summary'], SUMMARY)
+
+    def test_buffered_until_full(self):
+        """Test records are held until the buffer fills or the target ends"""
+        sink = JsonlSink(self.path, buffer_size=3)
+        sink.write('someone', 'geo_analysis', RECORDS)
+        self.assertFalse(os.path.exists(self.path))
+        sink.write('someone', 'geo_analysis', RECORDS)
+        with open(self.path) as output:
+            self.assertEqual(len(output.readlines()), 4)
+        sink.write('someone', 'geo_analysis', RECORDS[:1])
+        sink.end_target('someone')
+        with open(self.path) as output:
+            self.assertEqual(len(output.readlines()), 5)
+        sink.close()
+
+    def test_csv(self):
+        """Test records are written under fixed columns"""
+        sink = CsvSink(self.path)
+        sink.write('someone', 'sentiment_analysis', RECORDS)
+        sink.write('someone', 'custom', [{'date': 'today', 'score': 3}])
+        sink.write_summary('someone', 'sentiment_analysis', SUMMARY)
+        sink.close()
+
+        with open(self.path, newline='') as output:
+            rows = list(csv.DictReader(output))
+        self.assertEqual(tuple(rows[0]), CSV_COLUMNS)
+        self.assertEqual(rows[0]['compound'], '0.6')
+        self.assertEqual(json.loads(rows[0]['search_terms']), ['colour'])
+        self.assertEqual(rows[0]['coordinates'], '')
+        self.assertEqual(json.loads(rows[2]['extra']), {'score': 3})
+        self.assertEqual(rows[3]['type'], 'summary')
+        self.assertEqual(json.loads(rows[3]['extra']), SUMMARY)
+
+    def test_summary(self):
+        """Test the human readable report printed for each target"""
+        sink = SummarySink()
+        output = io.StringIO()
+        with redirect_stdout(output):
+            sink.write('someone', 'sentiment_analysis', RECORDS)
+            sink.write_summary('someone', 'sentiment_analysis', SUMMARY)
+            self.assertEqual(output.getvalue(), '')
+            sink.end_target('someone')
+        report = output.getvalue()
+        self.assertIn("Results for target someone", report)
+        self.assertIn("sentiment_analysis: 2 records", report)
+        self.assertIn("  compound_search_results: 0.0500", report)
+        self.assertIn("    colour: 0.0500", report)
+
+    def test_quiet(self):
+        """Test the quiet sink writes nothing"""
+        sink = get_sink({'format': 'quiet', 'path': self.path})
+        output = io.StringIO()
+        with redirect_stdout(output):
+            sink.write('someone', 'geo_analysis', RECORDS)
+            sink.end_target('someone')
+            sink.close()
+        self.assertEqual(output.getvalue(), '')
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
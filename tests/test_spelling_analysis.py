@@ -1,9 +1,13 @@
 """
 Unit tests for SpellingAnalysis processor
 """
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from twitter_shill_hunter.processors.spelling_analysis.spelling_analysis import SpellingAnalysis
+from twitter_shill_hunter.processors.spelling_analysis.language_tool_pool import shutdown_pools
 from mock_data import SAMPLE_PROCESSED_TWEETS, UK_ENGLISH_TWEETS, US_ENGLISH_TWEETS
 
 
@@ -12,6 +16,8 @@ class TestSpellingAnalysis(unittest.TestCase):
 
     def setUp(self):
         """Set up test fixtures"""
+        # Start every test without LanguageTool servers from earlier tests
+        shutdown_pools()
         self.spelling_analyzer = SpellingAnalysis()
         self.sample_tweets = SAMPLE_PROCESSED_TWEETS
         self.uk_tweets_processed = [
@@ -27,6 +33,10 @@ class TestSpellingAnalysis(unittest.TestCase):
             }
         ]
 
+    def tearDown(self):
+        """Stop LanguageTool servers started by the test"""
+        shutdown_pools()
+
     @patch('twitter_shill_hunter.processors.spelling_analysis.spelling_analysis.language_tool_python.LanguageTool')
     def test_process_data_with_uk_dialect(self, mock_language_tool_class):
         """Test spelling analysis with UK English dialect"""
@@ -175,9 +185,12 @@ class TestSpellingAnalysis(unittest.TestCase):
         }]
         
         # Should handle Unicode in context and replacements without error
-        self.spelling_analyzer.process_data(tweets, 'en-US')
+        records = self.spelling_analyzer.process_data(tweets, 'en-US')
         
         mock_scanner.check.assert_called_once()
+        issue = records[0]['matches'][0]
+        self.assertEqual(issue['context'], 'Conext with unicode')
+        self.assertEqual(issue['replacements'], ['replacement1', 'replacement2'])
 
     @patch('twitter_shill_hunter.processors.spelling_analysis.spelling_analysis.language_tool_python.LanguageTool')
     def test_process_data_no_replacements(self, mock_language_tool_class):
@@ -219,7 +232,13 @@ class TestSpellingAnalysis(unittest.TestCase):
             
             self.spelling_analyzer.process_data(multiple_tweets, 'en-US')
             
-            # Should call check for each tweet
+            # Should check the tweets together in one request
+            mock_scanner.check.assert_called_once_with(
+                'First tweet text\n\nSecond tweet text\n\nThird tweet text')
+
+            # Or one request per tweet with a batch size of one
+            mock_scanner.check.reset_mock()
+            self.spelling_analyzer.process_data(multiple_tweets, 'en-US', {'batch_size': 1})
             self.assertEqual(mock_scanner.check.call_count, 3)
 
     @patch('twitter_shill_hunter.processors.spelling_analysis.spelling_analysis.language_tool_python.LanguageTool')
@@ -238,6 +257,145 @@ class TestSpellingAnalysis(unittest.TestCase):
         # Verify LanguageTool was attempted to be instantiated
         mock_language_tool_class.assert_called_once_with('en-US')
 
+    @patch('twitter_shill_hunter.processors.spelling_analysis.spelling_analysis.language_tool_python.LanguageTool')
+    def test_scanner_reused_across_pages(self, mock_language_tool_class):
+        """Test that LanguageTool is started once and reused for every page"""
+        mock_scanner = MagicMock()
+        mock_language_tool_class.return_value = mock_scanner
+        mock_scanner.check.return_value = []
+
+        self.spelling_analyzer.process_data(self.uk_tweets_processed, 'en-GB')
+        self.spelling_analyzer.process_data(self.us_tweets_processed, 'en-GB')
+
+        mock_language_tool_class.assert_called_once_with('en-GB')
+        mock_scanner.close.assert_not_called()
+
+        self.spelling_analyzer.close()
+        self.assertIsNone(self.spelling_analyzer.scanner)
+
+    @patch('twitter_shill_hunter.processors.spelling_analysis.spelling_analysis.language_tool_python.LanguageTool')
+    def test_server_kept_for_later_targets(self, mock_language_tool_class):
+        """Test that a closed analyzer leaves the server running for the next one"""
+        mock_scanner = MagicMock()
+        mock_language_tool_class.return_value = mock_scanner
+        mock_scanner.check.return_value = []
+
+        self.spelling_analyzer.process_data(self.uk_tweets_processed, 'en-GB')
+        self.spelling_analyzer.close()
+        other_analyzer = SpellingAnalysis()
+        other_analyzer.process_data(self.us_tweets_processed, 'en-GB')
+        other_analyzer.close()
+
+        mock_language_tool_class.assert_called_once_with('en-GB')
+        mock_scanner.close.assert_not_called()
+
+        shutdown_pools()
+        mock_scanner.close.assert_called_once()
+
+    @patch('twitter_shill_hunter.processors.spelling_analysis.spelling_analysis.language_tool_python.LanguageTool')
+    def test_warm_up_starts_server(self, mock_language_tool_class):
+        """Test that warm up starts the server before the first page"""
+        mock_scanner = MagicMock()
+        mock_language_tool_class.return_value = mock_scanner
+        mock_scanner.check.return_value = []
+
+        self.spelling_analyzer.warm_up('en-US', {'idle_timeout': 60})
+        self.spelling_analyzer.get_pool({'idle_timeout': 60}).start('en-US')[0].result()
+        mock_language_tool_class.assert_called_once_with('en-US')
+
+        self.spelling_analyzer.process_data(self.us_tweets_processed, 'en-US', {'idle_timeout': 60})
+        mock_language_tool_class.assert_called_once_with('en-US')
+        mock_scanner.check.assert_called_once()
+
+    @patch('twitter_shill_hunter.processors.spelling_analysis.spelling_analysis.language_tool_python.LanguageTool')
+    def test_remote_server_option(self, mock_language_tool_class):
+        """Test connecting to an already running LanguageTool server"""
+        mock_language_tool_class.return_value.check.return_value = []
+
+        self.spelling_analyzer.process_data(
+            self.us_tweets_processed, 'en-US', {'server': 'http://localhost:8081'})
+
+        mock_language_tool_class.assert_called_once_with(
+            'en-US', remote_server='http://localhost:8081')
+
+    @patch('twitter_shill_hunter.processors.spelling_analysis.spelling_analysis.language_tool_python.LanguageTool')
+    def test_checks_spread_over_servers(self, mock_language_tool_class):
+        """Test that batches are shared between several servers and workers"""
+        scanners = [MagicMock(), MagicMock()]
+        for scanner in scanners:
+            scanner.check.return_value = []
+        mock_language_tool_class.side_effect = scanners
+        options = {'servers': 2, 'workers': 2, 'batch_size': 1}
+        tweets = self.uk_tweets_processed + self.us_tweets_processed
+
+        self.spelling_analyzer.process_data(tweets, 'en-GB', options)
+
+        self.assertEqual(mock_language_tool_class.call_count, 2)
+        self.assertEqual(sum(s.check.call_count for s in scanners), len(tweets))
+        self.assertTrue(all(s.check.called for s in scanners))
+        self.assertIsNotNone(self.spelling_analyzer.executor)
+
+        self.spelling_analyzer.close()
+        self.assertIsNone(self.spelling_analyzer.executor)
+
+    @patch('twitter_shill_hunter.processors.spelling_analysis.spelling_analysis.language_tool_python.LanguageTool')
+    def test_single_worker_checks_in_calling_thread(self, mock_language_tool_class):
+        """Test that workers set to 1 sends requests one at a time"""
+        mock_language_tool_class.return_value.check.return_value = []
+
+        self.spelling_analyzer.process_data(self.uk_tweets_processed, 'en-GB', {'workers': 1})
+
+        self.assertIsNone(self.spelling_analyzer.executor)
+
+    def spelling_options(self, **options):
+        """Options for spelling only checks against a small dictionary"""
+        handle, path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(handle, 'w') as f:
+            json.dump({'the': 100, 'parcel': 20, 'did': 50, 'not': 80, 'receive': 30}, f)
+        self.addCleanup(os.remove, path)
+        options.update({'mode': 'spelling', 'dictionary': path})
+        return options
+
+    @patch('twitter_shill_hunter.processors.spelling_analysis.spelling_analysis.language_tool_python.LanguageTool')
+    def test_spelling_mode_skips_languagetool(self, mock_language_tool_class):
+        """Test that spelling only checks use the dictionary, not LanguageTool"""
+        options = self.spelling_options()
+        tweets = [{'text': 'Did not recieve teh parcel', 'date': 'Wed Oct 11 10:30:00 +0000 2023'}]
+
+        self.spelling_analyzer.warm_up('en-US', options)
+        records = self.spelling_analyzer.process_data(tweets, 'en-US', options)
+
+        mock_language_tool_class.assert_not_called()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]['date'], tweets[0]['date'])
+        issues = records[0]['matches']
+        self.assertEqual([i['rule_id'] for i in issues], ['UNKNOWN_WORD', 'UNKNOWN_WORD'])
+        self.assertEqual(issues[0]['category'], 'TYPOS')
+        self.assertIn('receive', issues[0]['replacements'])
+        self.assertIn('the', issues[1]['replacements'])
+        self.assertEqual(self.spelling_analyzer.summary(), {
+            'tweets_checked': 1, 'tweets_with_issues': 1, 'issues': 2,
+            'rules': {'UNKNOWN_WORD': 2}})
+
+        self.spelling_analyzer.reset()
+        self.assertEqual(self.spelling_analyzer.summary()['issues'], 0)
+
+    @patch('twitter_shill_hunter.processors.spelling_analysis.spelling_analysis.language_tool_python.LanguageTool')
+    def test_spelling_mode_without_dictionary_uses_languagetool(self, mock_language_tool_class):
+        """Test falling back to LanguageTool for languages pyspellchecker lacks"""
+        mock_language_tool_class.return_value.check.return_value = []
+        options = {'mode': 'spelling'}
+
+        self.spelling_analyzer.warm_up('ja-JP', options)
+        self.spelling_analyzer.process_data(self.uk_tweets_processed, 'ja-JP', options)
+
+        mock_language_tool_class.assert_called_once_with('ja-JP')
+
+    def test_invalid_mode(self):
+        """Test that an unknown mode is rejected"""
+        with self.assertRaises(ValueError):
+            self.spelling_analyzer.process_data(self.uk_tweets_processed, 'en-GB', {'mode': 'fast'})
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
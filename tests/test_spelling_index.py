@@ -0,0 +1,175 @@
+"""
+Unit tests for the symmetric delete SpellingIndex
+"""
+import json
+import os
+import random
+import tempfile
+import unittest
+from spellchecker import SpellChecker
+from twitter_shill_hunter.processors.spelling_analysis.spelling_index import (
+    SpellingIndex, add_dialect_words, dialect_word_list, edit_distance, get_index,
+    index_language, start_index)
+
+
+FREQUENCIES = {
+    'the': 1000, 'ten': 50, 'tea': 80, 'receive': 300, 'relieve': 40,
+    'weird': 120, 'wired': 90, 'parcel': 30, 'i': 900, 'did': 400, 'not': 800,
+    "don't": 200, 'accommodation': 25, 'accommodations': 5, 'is': 700,
+}
+
+
+class TestSpellingIndex(unittest.TestCase):
+    """Test cases for SpellingIndex"""
+
+    def setUp(self):
+        """Set up an index over a small dictionary"""
+        self.index = SpellingIndex(FREQUENCIES)
+
+    def test_suggestions_closest_and_most_frequent_first(self):
+        """Test that the nearest words are suggested, most frequent first"""
+        self.assertEqual(self.index.suggestions('teh'), ['the', 'tea', 'ten'])
+        self.assertEqual(self.index.suggestions('tex'), ['tea', 'ten'])
+        self.assertEqual(self.index.suggestions('recieve'), ['receive', 'relieve'])
+        self.assertEqual(self.index.suggestions('wierd'), ['weird', 'wired'])
+        self.assertEqual(self.index.suggestions('xyzzy'), [])
+
+    def test_words_longer_than_prefix(self):
+        """Test corrections beyond the indexed prefix"""
+        self.assertEqual(self.index.suggestions('acommodation'), ['accommodation'])
+        self.assertEqual(self.index.suggestions('accomodations'), ['accommodations'])
+
+    def test_known_words(self):
+        """Test known words, case and possessives"""
+        self.assertTrue(self.index.known('The'))
+        self.assertTrue(self.index.known("parcel's"))
+        self.assertFalse(self.index.known('teh'))
+        self.assertIsNone(self.index.lookup('Parcel'))
+        self.assertEqual(self.index.lookup('Teh'), ['the', 'tea', 'ten'])
+        self.assertIn('teh', self.index.memo)
+
+    def test_check_finds_unknown_words(self):
+        """Test matches with offsets and context like LanguageTool's"""
+        text = "I did not recieve teh parcel"
+
+        matches = self.index.check(text)
+
+        self.assertEqual([(m.offset, m.error_length, m.replacements) for m in matches],
+                         [(10, 7, ['receive', 'relieve']), (18, 3, ['the', 'tea', 'ten'])])
+        self.assertEqual(matches[0].context, text)
+        self.assertEqual(matches[1].offset_in_context, 18)
+        self.assertEqual(matches[0].rule_id, 'UNKNOWN_WORD')
+        self.assertEqual(matches[0].category, 'TYPOS')
+
+    def test_check_skips_mentions_links_and_acronyms(self):
+        """Test that mentions, hashtags, links, numbers and acronyms are not checked"""
+        text = "@bobx #blessed https://t.co/xyzzy www.xyzzy.com 2024 NASA iPhone don’t teh"
+
+        matches = self.index.check(text)
+
+        self.assertEqual([m.replacements for m in matches], [['the', 'tea', 'ten']])
+        self.assertEqual(matches[0].offset, len(text) - 3)
+
+    def test_check_tweet_uses_shared_tokens(self):
+        """Test checking a tweet's tokens and masked view"""
+        tweet = {'text': "@teh I did not recieve teh #teh parcel https://t.co/teh NASA 2teh"}
+
+        matches = self.index.check_tweet(tweet)
+
+        self.assertEqual([(m.offset, m.error_length) for m in matches], [(15, 7), (23, 3)])
+        self.assertEqual(matches[1].context, tweet['views']['normalized'])
+        self.assertEqual(len(self.index.id_memo), 6)
+
+    def test_edit_distance(self):
+        """Test insertions, deletions, substitutions and transpositions"""
+        self.assertEqual(edit_distance('teh', 'the', 2), 1)
+        self.assertEqual(edit_distance('recieve', 'receive', 2), 1)
+        self.assertEqual(edit_distance('parcel', 'parcels', 2), 1)
+        self.assertEqual(edit_distance('tea', 'ten', 2), 1)
+        self.assertEqual(edit_distance('abc', 'abc', 2), 0)
+        self.assertEqual(edit_distance('kitten', 'sitting', 3), 3)
+        self.assertEqual(edit_distance('kitten', 'sitting', 2), 3)
+        self.assertEqual(edit_distance('a', 'abcd', 2), 3)
+
+    def test_matches_pyspellchecker(self):
+        """Test that suggestions are pyspellchecker's candidates on random typos"""
+        checker = SpellChecker(language=None, distance=2)
+        words = ['receive', 'weird', 'parcel', 'accommodation', 'beautiful', 'government',
+                 'separate', 'definitely', 'tomorrow', 'their', 'which', 'hello', 'spell']
+        checker.word_frequency.load_words(words)
+        index = SpellingIndex(checker.word_frequency.dictionary, max_suggestions=100)
+        rng = random.Random(3)
+        letters = 'abcdefghijklmnopqrstuvwxyz'
+        for _ in range(60):
+            word = rng.choice(words)
+            i = rng.randrange(len(word))
+            for _ in range(rng.randint(1, 2)):
+                word = rng.choice([
+                    word[:i] + rng.choice(letters) + word[i:],
+                    word[:i] + word[i + 1:],
+                    word[:i] + rng.choice(letters) + word[i + 1:],
+                    word[:i] + word[i + 1:i + 2] + word[i:i + 1] + word[i + 2:]])
+            if index.known(word):
+                continue
+            expected = checker.candidates(word) or set()
+
+            self.assertEqual(set(index.suggestions(word)), expected, word)
+
+
+class TestSharedIndexes(unittest.TestCase):
+    """Test cases for the shared index registry"""
+
+    def setUp(self):
+        """Write a small dictionary file"""
+        handle, self.path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(handle, 'w') as f:
+            json.dump(FREQUENCIES, f)
+
+    def tearDown(self):
+        """Remove the dictionary file"""
+        os.remove(self.path)
+
+    def test_index_built_once(self):
+        """Test that callers share the index built in the background"""
+        future = start_index('en-GB', dictionary=self.path)
+        index = get_index('en-GB', dictionary=self.path)
+
+        self.assertIs(future.result(), index)
+        self.assertEqual(index.suggestions('teh'), ['the', 'tea', 'ten'])
+
+    def test_index_language(self):
+        """Test mapping dialects onto pyspellchecker dictionaries"""
+        self.assertEqual(index_language('en-GB'), 'en')
+        self.assertEqual(index_language('de-DE'), 'de')
+        self.assertIsNone(index_language('ja-JP'))
+        with self.assertRaises(ValueError):
+            start_index('ja-JP')
+
+    def test_dialect_word_list(self):
+        """Test choosing the word list added for a regional dialect"""
+        self.assertEqual(dialect_word_list('en-GB'), 'en-UK')
+        self.assertEqual(dialect_word_list('en-uk'), 'en-UK')
+        self.assertIsNone(dialect_word_list('en-US'))
+        self.assertIsNone(dialect_word_list('en'))
+        self.assertIsNone(dialect_word_list('de-DE'))
+        with self.assertRaises(ValueError):
+            dialect_word_list('en-AU')
+        with self.assertRaises(ValueError):
+            start_index('en-AU')
+        # A configured dictionary is used as it is
+        self.assertIsNotNone(start_index('en-AU', dictionary=self.path))
+
+    def test_uk_spellings_known(self):
+        """Test that UK spellings are not flagged for en-GB"""
+        frequencies = {'color': 300, 'organization': 40, 'realize': 20, 'the': 1000}
+        index = SpellingIndex(add_dialect_words(dict(frequencies), 'en', 'en-UK'))
+
+        for word in ('colour', 'organisation', 'realise', 'color'):
+            self.assertTrue(index.known(word), word)
+        self.assertEqual(index.frequencies['colour'], 300)
+        self.assertEqual(index.frequencies['realise'], 20)
+        self.assertIn('colour', index.suggestions('colur'))
+
+
+if __name__ == '__main__':
+    unittest.main()
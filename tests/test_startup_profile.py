@@ -0,0 +1,49 @@
+"""
+Unit tests for the --startup-profile report
+"""
+import io
+import unittest
+from contextlib import redirect_stdout
+from twitter_shill_hunter.startup_profile import StartupProfile, parse_import_times
+
+IMPORTTIME = [
+    "import time: self [us] | cumulative | imported package\n",
+    "import time:       120 |        120 |     yaml.error\n",
+    "import time:      2000 |       2500 |   yaml\n",
+    "import time:       300 |       3000 | twitter_shill_hunter.input\n",
+    "import time:       900 |        900 | tweepy\n",
+]
+
+
+class TestStartupProfile(unittest.TestCase):
+    """Test cases for StartupProfile"""
+
+    def test_parse_import_times(self):
+        """Test -X importtime lines are read with their depth"""
+        timings = parse_import_times(IMPORTTIME)
+        self.assertEqual(len(timings), 4)
+        self.assertEqual(timings[0], ('yaml.error', 120, 120, 2))
+        self.assertEqual(timings[2], ('twitter_shill_hunter.input', 300, 3000, 0))
+
+    def test_report(self):
+        """Test the report totals top level imports and sorts by cumulative time"""
+        profile = StartupProfile(limit=2)
+        profile.timings = parse_import_times(IMPORTTIME)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            profile.report()
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], "Startup profile: 4 modules imported in 3.9 ms")
+        self.assertTrue(lines[2].endswith(' twitter_shill_hunter.input'))
+        self.assertTrue(lines[3].endswith('    yaml'))
+        self.assertEqual(len(lines), 4)
+
+    def test_command(self):
+        """Test the child runs the CLI with import timing"""
+        command = StartupProfile().command(['--list-plugins'])
+        self.assertEqual(command[1:], ['-X', 'importtime', '-m', 'twitter_shill_hunter',
+                                       '--list-plugins'])
+
+
+if __name__ == '__main__':
+    unittest.main()
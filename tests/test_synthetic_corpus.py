@@ -0,0 +1,70 @@
+"""
+Unit tests for the seeded SyntheticCorpus benchmarks run on
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from twitter_shill_hunter.archive_reader import ArchiveReader
+from twitter_shill_hunter.synthetic_corpus import SyntheticCorpus, dialect_pairs
+from twitter_shill_hunter.tweet_text_extractor import TweetTextExtractor
+
+
+class TestSyntheticCorpus(unittest.TestCase):
+    """Test cases for SyntheticCorpus"""
+
+    def test_seeded(self):
+        """Test the same seed gives the same posts and another seed does not"""
+        first = list(SyntheticCorpus(seed=1).tweets(50))
+        self.assertEqual(first, list(SyntheticCorpus(seed=1).tweets(50)))
+        self.assertNotEqual(first, list(SyntheticCorpus(seed=2).tweets(50)))
+
+    def test_timeline_order(self):
+        """Test posts are newest first with unique ids and readable dates"""
+        tweets = TweetTextExtractor(list(SyntheticCorpus().tweets(100))).extract_text()
+        ids = [int(t['id']) for t in tweets]
+        self.assertEqual(ids, sorted(set(ids), reverse=True))
+        timestamps = [t['timestamp'] for t in tweets]
+        self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+
+    def test_dialect_mix(self):
+        """Test uk_share chooses between UK and US spellings"""
+        uk, us = zip(*dialect_pairs())
+        uk, us = set(uk), set(us)
+        for share, words in ((1.0, uk), (0.0, us)):
+            corpus = SyntheticCorpus(uk_share=share, typo_share=0, duplicate_share=0)
+            for tweet in corpus.tweets(20):
+                text = tweet['full_text'].lower()
+                self.assertTrue(any(w in words for w in text.replace('.', ' ').split()))
+
+    def test_shares(self):
+        """Test search terms, coordinates and duplicates appear at about their share"""
+        corpus = SyntheticCorpus(term_density=0.5, geo_share=0.25, duplicate_share=0.1,
+                                 search_terms=['election'])
+        tweets = list(corpus.tweets(2000))
+        terms = sum(1 for t in tweets if 'election' in t['full_text'])
+        located = sum(1 for t in tweets if t['coordinates'])
+        repeats = len(tweets) - len(set(t['full_text'] for t in tweets))
+        self.assertTrue(850 < terms < 1250)
+        self.assertTrue(400 < located < 600)
+        self.assertTrue(120 < repeats < 280)
+        self.assertTrue(len(set(t['source'] for t in tweets)) > 3)
+
+    def test_pages(self):
+        """Test posts are paged with a short last page"""
+        pages = list(SyntheticCorpus().pages(450, page_size=200))
+        self.assertEqual([len(p) for p in pages], [200, 200, 50])
+
+    def test_write_jsonl(self):
+        """Test the written archive reads back as the same posts"""
+        directory = tempfile.mkdtemp()
+        try:
+            path = SyntheticCorpus().write_jsonl(os.path.join(directory, 'timeline.jsonl'), 30)
+            posts = [t for page in ArchiveReader(path, page_size=7).pages() for t in page]
+            self.assertEqual(posts, list(SyntheticCorpus().tweets(30)))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Unit tests for the shared TextNormalizer views
+"""
+import unittest
+from twitter_shill_hunter.text_normalizer import TextNormalizer, fold_ascii, tweet_view
+
+
+class TestTextNormalizer(unittest.TestCase):
+    """Test cases for TextNormalizer"""
+
+    def setUp(self):
+        """Set up a normalizer"""
+        self.normalizer = TextNormalizer()
+
+    def test_unicode_normalisation(self):
+        """Test compatibility forms, curly quotes, dashes and invisible characters"""
+        self.assertEqual(self.normalizer.normalize("𝐅𝐑𝐄𝐄 ＦＵＬＬ ﬁne"), "FREE FULL fine")
+        self.assertEqual(self.normalizer.normalize("“it’s” – ok"), "\"it's\" - ok")
+        self.assertEqual(self.normalizer.normalize("sh​ill"), "shill")
+        self.assertEqual(self.normalizer.normalize("café"), "café")
+
+    def test_ascii_text_unchanged(self):
+        """Test that plain ASCII text is returned as is"""
+        text = "Plain text, nothing to do"
+
+        self.assertIs(self.normalizer.normalize(text), text)
+        self.assertIs(fold_ascii(text), text)
+
+    def test_mask_keeps_length(self):
+        """Test that links, mentions and hashtags are blanked"""
+        text = "Hi @bob see www.x.com and https://t.co/abc #tag, mail me@x.com"
+
+        masked = self.normalizer.mask(text)
+
+        self.assertEqual(len(masked), len(text))
+        self.assertEqual(masked.split(), ["Hi", "see", "and", ",", "mail", "me@x.com"])
+
+    def test_fold_ascii(self):
+        """Test that accents are removed and other characters dropped"""
+        self.assertEqual(fold_ascii("Émojis 😀 and áccents"), "Emojis  and accents")
+
+    def test_views(self):
+        """Test building every view"""
+        views = self.normalizer.views("Straße’s #Tag")
+
+        self.assertEqual(views, {
+            'normalized': "Straße's #Tag",
+            'folded': "strasse's #tag",
+            'masked': "Straße's     ",
+            'ascii': "Strae's #Tag",
+        })
+
+    def test_tweet_view_built_once(self):
+        """Test that tweets without views get them on first use"""
+        tweet = {'text': "Don’t"}
+
+        self.assertEqual(tweet_view(tweet, 'folded'), "don't")
+        views = tweet['views']
+        self.assertEqual(tweet_view(tweet, 'ascii'), "Don't")
+        self.assertIs(tweet['views'], views)
+
+
+if __name__ == '__main__':
+    unittest.main()
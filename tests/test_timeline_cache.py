@@ -0,0 +1,149 @@
+"""
+Unit tests for the on-disk TimelineCache
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from twitter_shill_hunter.timeline_cache import TimelineCache
+from twitter_shill_hunter.timeline_fetcher import TimelineFetcher
+
+
+class MockTweepyStatus:
+    """Mock class to simulate tweepy Status objects"""
+    def __init__(self, tweet_data):
+        self._json = tweet_data
+
+
+class MockTimelineApi:
+    """Mock API serving a timeline with max_id/since_id/count semantics"""
+    def __init__(self, ids):
+        self.ids = sorted(ids, reverse=True)
+        self.calls = []
+
+    def user_timeline(self, **kwargs):
+        self.calls.append(kwargs)
+        ids = [i for i in self.ids
+               if (kwargs.get('max_id') is None or i <= kwargs['max_id'])
+               and (kwargs.get('since_id') is None or i > kwargs['since_id'])]
+        return [MockTweepyStatus({'id': i, 'text': 'post %d' % i})
+                for i in ids[:kwargs['count']]]
+
+
+def post_ids(pages):
+    """Flatten pages to a list of post ids"""
+    return [p['id'] for page in pages for p in page]
+
+
+class TestTimelineCache(unittest.TestCase):
+    """Test cases for TimelineCache"""
+
+    def setUp(self):
+        """Create a cache in a scratch directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, 'cache', 'timelines.db')
+        self.cache = TimelineCache(self.path)
+
+    def tearDown(self):
+        """Remove the scratch directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_first_run_fetches_and_stores_everything(self):
+        """Test that an empty cache fetches the full timeline"""
+        api = MockTimelineApi([1, 2, 3, 4, 5])
+        fetcher = TimelineFetcher(api, 'test_user', page_size=2)
+
+        pages = list(self.cache.pages(fetcher))
+
+        self.assertEqual(post_ids(pages), [5, 4, 3, 2, 1])
+        self.assertEqual(self.cache.since_id('test_user'), 5)
+        self.assertNotIn('since_id', api.calls[0])
+
+    def test_repeat_run_fetches_only_newer_posts(self):
+        """Test that a repeat run asks for posts after since_id and merges"""
+        list(self.cache.pages(TimelineFetcher(MockTimelineApi([1, 2, 3]), 'test_user')))
+
+        api = MockTimelineApi([1, 2, 3, 4, 5])
+        pages = list(self.cache.pages(TimelineFetcher(api, 'test_user', page_size=2)))
+
+        self.assertEqual(post_ids(pages), [5, 4, 3, 2, 1])
+        # Every request is bounded below by the cached since_id
+        self.assertTrue(all(c['since_id'] == 3 for c in api.calls))
+        self.assertEqual(self.cache.since_id('test_user'), 5)
+
+    def test_cache_hits_and_misses_are_counted(self):
+        """Test that cached posts are hits and fetched posts are misses"""
+        list(self.cache.pages(TimelineFetcher(MockTimelineApi([1, 2, 3]), 'test_user')))
+
+        fetcher = TimelineFetcher(MockTimelineApi([1, 2, 3, 4, 5]), 'test_user', page_size=2)
+        list(self.cache.pages(fetcher))
+
+        self.assertEqual(fetcher.metrics.get('timeline_cache_misses'), 2)
+        self.assertEqual(fetcher.metrics.get('timeline_cache_hits'), 3)
+
+    def test_targets_are_kept_apart(self):
+        """Test that cached posts are keyed by target"""
+        list(self.cache.pages(TimelineFetcher(MockTimelineApi([1, 2]), 'first_user')))
+        list(self.cache.pages(TimelineFetcher(MockTimelineApi([7, 8]), 'second_user')))
+
+        self.assertEqual(post_ids(self.cache.cached_pages('first_user', 10)), [2, 1])
+        self.assertEqual(post_ids(self.cache.cached_pages('second_user', 10)), [8, 7])
+
+    def test_refresh_ignores_cache(self):
+        """Test that refresh drops cached posts and fetches from scratch"""
+        list(self.cache.pages(TimelineFetcher(MockTimelineApi([1, 2, 3]), 'test_user')))
+
+        api = MockTimelineApi([2, 3, 4])
+        pages = list(self.cache.pages(TimelineFetcher(api, 'test_user'), refresh=True))
+
+        self.assertEqual(post_ids(pages), [4, 3, 2])
+        self.assertNotIn('since_id', api.calls[0])
+        self.assertEqual(post_ids(self.cache.cached_pages('test_user', 10)), [4, 3, 2])
+
+    def test_interrupted_fetch_does_not_advance_since_id(self):
+        """Test that since_id only moves after a complete fetch"""
+        list(self.cache.pages(TimelineFetcher(MockTimelineApi([1, 2]), 'test_user')))
+
+        pages = self.cache.pages(
+            TimelineFetcher(MockTimelineApi([1, 2, 3, 4, 5]), 'test_user', page_size=1))
+        next(pages)
+        pages.close()
+
+        self.assertEqual(self.cache.since_id('test_user'), 2)
+
+    def test_ttl_eviction(self):
+        """Test that targets not refreshed within the TTL are dropped"""
+        list(self.cache.pages(TimelineFetcher(MockTimelineApi([1, 2]), 'old_user')))
+        with self.cache.transaction() as db:
+            db.execute("UPDATE targets SET fetched_at = ?", (time.time() - 7200,))
+        list(self.cache.pages(TimelineFetcher(MockTimelineApi([3]), 'new_user')))
+
+        cache = TimelineCache(self.path, ttl_seconds=3600)
+        cache.evict()
+
+        self.assertIsNone(cache.since_id('old_user'))
+        self.assertEqual(post_ids(cache.cached_pages('old_user', 10)), [])
+        self.assertEqual(post_ids(cache.cached_pages('new_user', 10)), [3])
+
+    def test_size_eviction_keeps_newest_posts(self):
+        """Test that max_posts trims the oldest posts per target"""
+        list(self.cache.pages(TimelineFetcher(MockTimelineApi(range(1, 11)), 'test_user')))
+
+        cache = TimelineCache(self.path, max_posts=3)
+        cache.evict()
+
+        self.assertEqual(post_ids(cache.cached_pages('test_user', 10)), [10, 9, 8])
+
+    def test_from_config(self):
+        """Test building a cache from the YAML config block"""
+        cache = TimelineCache.from_config(
+            {'path': self.path, 'ttl_days': 2, 'max_posts': 500})
+
+        self.assertEqual(cache.path, self.path)
+        self.assertEqual(cache.ttl_seconds, 2 * 86400)
+        self.assertEqual(cache.max_posts, 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,206 @@
+"""
+Unit tests for TimelineFetcher with a mocked Twitter/X API
+"""
+import io
+import threading
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import MagicMock
+from twitter_shill_hunter.timeline_fetcher import TimelineFetcher, PagePrefetcher
+from twitter_shill_hunter.metrics import Metrics
+from mock_data import UK_ENGLISH_TWEETS, US_ENGLISH_TWEETS
+
+
+class MockTweepyStatus:
+    """Mock class to simulate tweepy Status objects"""
+    def __init__(self, tweet_data):
+        self._json = tweet_data
+
+
+def make_timeline(count, start_id=1000):
+    """Build a newest-first list of statuses with descending ids"""
+    return [
+        MockTweepyStatus({'id': start_id - i, 'text': 'post %d' % i})
+        for i in range(count)
+    ]
+
+
+def make_replies(count, start_id):
+    """Build a newest-first list of reply statuses with descending ids"""
+    return [
+        MockTweepyStatus({'id': start_id - i, 'text': 'reply %d' % i,
+                          'in_reply_to_status_id': 1})
+        for i in range(count)
+    ]
+
+
+class MockTimelineApi:
+    """Mock API serving a fixed timeline with max_id/count semantics,
+    dropping replies after taking count posts as X does"""
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.calls = []
+
+    def user_timeline(self, **kwargs):
+        self.calls.append(kwargs)
+        max_id = kwargs.get('max_id')
+        page = [s for s in self.statuses
+                if max_id is None or s._json['id'] <= max_id]
+        page = page[:kwargs['count']]
+        if kwargs.get('exclude_replies'):
+            page = [s for s in page if 'in_reply_to_status_id' not in s._json]
+        return page
+
+
+class TestTimelineFetcher(unittest.TestCase):
+    """Test cases for TimelineFetcher"""
+
+    def test_pages_walk_back_with_max_id(self):
+        """Test that pages are requested below the oldest id seen"""
+        api = MockTimelineApi(make_timeline(5))
+        fetcher = TimelineFetcher(api, 'test_user', page_size=2)
+
+        pages = list(fetcher.pages())
+
+        self.assertEqual([len(p) for p in pages], [2, 2, 1])
+        self.assertNotIn('max_id', api.calls[0])
+        self.assertEqual(api.calls[1]['max_id'], 998)
+        self.assertEqual(api.calls[2]['max_id'], 996)
+        # The final empty page is asked for again unfiltered, then ends the walk
+        self.assertEqual(len(api.calls), 5)
+        self.assertEqual(api.calls[4]['exclude_replies'], False)
+
+    def test_api_calls_are_counted(self):
+        """Test that each timeline request is counted and timed"""
+        metrics = Metrics()
+        fetcher = TimelineFetcher(MockTimelineApi(make_timeline(5)), 'test_user',
+                                  page_size=2, metrics=metrics)
+
+        list(fetcher.pages())
+
+        self.assertEqual(metrics.get('api_calls'), 5)
+        self.assertEqual(metrics.timings[('fetch', None)][0], 5)
+
+    def test_pages_continue_past_window_of_replies(self):
+        """Test that a window holding only replies does not end the walk"""
+        statuses = (make_timeline(2, start_id=1000) + make_replies(4, start_id=998) +
+                    make_timeline(3, start_id=994))
+        api = MockTimelineApi(statuses)
+        fetcher = TimelineFetcher(api, 'test_user', page_size=2)
+
+        pages = list(fetcher.pages())
+
+        self.assertEqual([t['id'] for page in pages for t in page],
+                         [1000, 999, 994, 993, 992])
+        self.assertFalse(any('in_reply_to_status_id' in t for page in pages for t in page))
+
+    def test_pages_continue_past_many_windows_of_replies(self):
+        """Test that a long run of replies does not cut the walk short"""
+        api = MockTimelineApi(make_replies(20, start_id=1000) + make_timeline(2, start_id=900))
+        fetcher = TimelineFetcher(api, 'test_user', page_size=2)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            pages = list(fetcher.pages())
+
+        self.assertEqual([t['id'] for page in pages for t in page], [900, 899])
+        self.assertEqual(output.getvalue(), '')
+
+    def test_pages_stop_after_empty_windows(self):
+        """Test that paging gives up after max_empty_pages windows of replies"""
+        api = MockTimelineApi(make_replies(20, start_id=1000) + make_timeline(2, start_id=900))
+        fetcher = TimelineFetcher(api, 'test_user', page_size=2, max_empty_pages=3)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            pages = list(fetcher.pages())
+
+        self.assertEqual(pages, [])
+        # Each empty window is asked for filtered, then unfiltered
+        self.assertEqual(len(api.calls), 6)
+        self.assertIn("stopped reading test_user's timeline after 3 windows",
+                      output.getvalue())
+
+    def test_pages_request_parameters(self):
+        """Test the parameters passed to user_timeline"""
+        api = MockTimelineApi(make_timeline(1))
+        fetcher = TimelineFetcher(api, 'test_user', page_size=50)
+        list(fetcher.pages())
+
+        self.assertEqual(api.calls[0], {
+            'screen_name': 'test_user',
+            'exclude_replies': True,
+            'include_rts': False,
+            'count': 50,
+            'tweet_mode': 'extended'
+        })
+
+    def test_pages_stop_at_history_limit(self):
+        """Test that paging stops once the history limit is reached"""
+        api = MockTimelineApi(make_timeline(10))
+        fetcher = TimelineFetcher(api, 'test_user', page_size=2, history_limit=4)
+
+        pages = list(fetcher.pages())
+
+        self.assertEqual(sum(len(p) for p in pages), 4)
+        self.assertEqual(len(api.calls), 2)
+
+    def test_pages_skip_repeated_posts(self):
+        """Test that an API repeating the same page does not loop forever"""
+        api = MagicMock()
+        api.user_timeline.return_value = [MockTweepyStatus(t) for t in UK_ENGLISH_TWEETS]
+        fetcher = TimelineFetcher(api, 'test_user')
+
+        pages = list(fetcher.pages())
+
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(api.user_timeline.call_count, 2)
+
+    def test_prefetch_yields_pages_in_order(self):
+        """Test that prefetching preserves page order"""
+        api = MagicMock()
+        api.user_timeline.side_effect = [
+            [MockTweepyStatus(t) for t in US_ENGLISH_TWEETS],
+            [MockTweepyStatus(t) for t in UK_ENGLISH_TWEETS],
+            [],
+            []
+        ]
+        fetcher = TimelineFetcher(api, 'test_user')
+
+        pages = list(fetcher.prefetch())
+
+        self.assertEqual(len(pages), 2)
+        self.assertIn("color", pages[0][0]['full_text'])
+        self.assertIn("colour", pages[1][0]['full_text'])
+
+    def test_prefetch_fetches_next_page_while_consuming(self):
+        """Test that page N+1 is requested while page N is being processed"""
+        second_page_requested = threading.Event()
+
+        def pages():
+            yield ['page 1']
+            second_page_requested.set()
+            yield ['page 2']
+
+        prefetcher = PagePrefetcher(pages())
+        consumed = []
+        for page in prefetcher:
+            if not consumed:
+                self.assertTrue(second_page_requested.wait(timeout=5))
+            consumed.append(page)
+
+        self.assertEqual(consumed, [['page 1'], ['page 2']])
+
+    def test_prefetch_propagates_errors(self):
+        """Test that API errors are raised in the consumer"""
+        api = MagicMock()
+        api.user_timeline.side_effect = Exception("API Error")
+        fetcher = TimelineFetcher(api, 'test_user')
+
+        with self.assertRaises(Exception) as ctx:
+            list(fetcher.prefetch())
+        self.assertEqual(str(ctx.exception), "API Error")
+
+
+if __name__ == '__main__':
+    unittest.main()
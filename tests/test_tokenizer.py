@@ -0,0 +1,122 @@
+"""
+Unit tests for the shared Tokenizer and Vocabulary
+"""
+import pickle
+import unittest
+from unittest.mock import patch
+from twitter_shill_hunter.tokenizer import (
+    Tokenizer, TokenizedText, Vocabulary, tweet_tokens, vocabulary)
+
+
+class TestTokenizer(unittest.TestCase):
+    """Test cases for Tokenizer"""
+
+    def setUp(self):
+        """Set up a tokenizer"""
+        self.tokenizer = Tokenizer()
+
+    def test_tokens_and_offsets(self):
+        """Test case folded tokens with offsets into the text, skipping numbers"""
+        text = "Don't PANIC, it's 42 o'clock in the 1990s!"
+
+        tokens = self.tokenizer.tokenize(text)
+
+        self.assertEqual(tokens.words(), ["don't", "panic", "it's", "o'clock", "in", "the", "1990s"])
+        self.assertEqual([text[s:e] for _, s, e in tokens][:4],
+                         ["Don't", "PANIC", "it's", "o'clock"])
+        self.assertEqual(tokens.ids.typecode, 'I')
+        self.assertEqual(len(tokens), 7)
+
+    def test_same_word_same_id(self):
+        """Test that tokens are interned whatever their case"""
+        tokens = self.tokenizer.tokenize("Storm storm STORM")
+
+        self.assertEqual(len(set(tokens.ids)), 1)
+        self.assertEqual(vocabulary.word(tokens.ids[0]), "storm")
+        self.assertEqual(vocabulary.get("storm"), tokens.ids[0])
+
+    def test_folding_changing_length(self):
+        """Test offsets when case folding lengthens the text"""
+        text = "Große STRASSE"
+
+        tokens = self.tokenizer.tokenize(text)
+
+        self.assertEqual(tokens.words(), ["grosse", "strasse"])
+        self.assertEqual([text[s:e] for _, s, e in tokens], ["Große", "STRASSE"])
+
+    def test_links_and_mentions_skipped(self):
+        """Test that links and mentions are not tokenized but hashtags are"""
+        text = "@Newsdesk read https://t.co/Ab12Cd34 and www.example.com #Storm"
+
+        tokens = self.tokenizer.tokenize(text)
+
+        self.assertEqual(tokens.words(), ["read", "and", "storm"])
+        self.assertEqual([text[s:e] for _, s, e in tokens], ["read", "and", "Storm"])
+
+    def test_vocabulary_bounded_by_links_and_mentions(self):
+        """Test that pages of new links and mentions add nothing to the vocabulary"""
+        self.tokenizer.tokenize("see you")
+        size = len(vocabulary)
+
+        for page in range(3):
+            for i in range(200):
+                tweet = {'text': "@user%d%d see https://t.co/x%dy%d you" % (page, i, page, i)}
+                self.assertEqual(tweet_tokens(tweet).words(), ["see", "you"])
+
+        self.assertEqual(len(vocabulary), size)
+
+    def test_pickled_tokens_are_reinterned(self):
+        """Test that tokens sent to another process carry their words"""
+        tokens = self.tokenizer.tokenize("shill hunter")
+
+        function, args = tokens.__reduce__()
+        copy = pickle.loads(pickle.dumps(tokens))
+
+        self.assertEqual(args[0], ["shill", "hunter"])
+        self.assertIsInstance(copy, TokenizedText)
+        self.assertEqual(list(copy.ids), list(tokens.ids))
+        self.assertEqual(list(copy.starts), [0, 6])
+
+    def test_tweet_tokens_built_once(self):
+        """Test that tweets without tokens get them on first use"""
+        tweet = {'text': "Don’t stop"}
+
+        tokens = tweet_tokens(tweet)
+
+        self.assertEqual(tokens.words(), ["don't", "stop"])
+        self.assertIs(tweet_tokens(tweet), tokens)
+
+    def test_tokens_rebuilt_after_clear(self):
+        """Test that tokens from a cleared vocabulary are rebuilt"""
+        words = Vocabulary(max_size=2)
+        tweet = {'text': "calm before the storm"}
+
+        with patch('twitter_shill_hunter.tokenizer.vocabulary', words):
+            tokens = tweet_tokens(tweet)
+            self.assertTrue(words.trim())
+            self.assertEqual(len(words), 0)
+            stale = pickle.loads(pickle.dumps(tokens))
+
+            self.assertEqual(len(stale), 0)
+            self.assertIsNot(tweet_tokens(tweet), tokens)
+            self.assertEqual(tweet_tokens(tweet).words(), ["calm", "before", "the", "storm"])
+            self.assertEqual(tweet_tokens(tweet).generation, 1)
+
+    def test_vocabulary(self):
+        """Test interning in a vocabulary of its own"""
+        words = Vocabulary()
+
+        self.assertEqual([words.intern(w) for w in ["a", "b", "a"]], [0, 1, 0])
+        self.assertEqual(words.word(1), "b")
+        self.assertIsNone(words.get("c"))
+        self.assertEqual(len(words), 2)
+        self.assertFalse(words.trim())
+
+        words.clear()
+        self.assertEqual(words.generation, 1)
+        self.assertIsNone(words.get("a"))
+        self.assertEqual(words.intern("b"), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
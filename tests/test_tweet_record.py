@@ -0,0 +1,75 @@
+"""
+Unit tests for the slotted TweetRecord
+"""
+import math
+import pickle
+import unittest
+from twitter_shill_hunter.tweet_record import TweetRecord, parse_timestamp
+from twitter_shill_hunter.text_normalizer import tweet_view
+from twitter_shill_hunter.tokenizer import tweet_tokens
+
+
+class TestTweetRecord(unittest.TestCase):
+    """Test cases for TweetRecord"""
+
+    def setUp(self):
+        """Set up a record"""
+        self.record = TweetRecord(
+            "Don’t panic", "Wed Oct 11 10:30:00 +0000 2023",
+            place={'name': 'London'}, source='Twitter for iPhone')
+
+    def test_dict_access(self):
+        """Test reading a record like the dicts plugins expect"""
+        self.assertEqual(self.record['text'], "Don’t panic")
+        self.assertEqual(self.record['date'], "Wed Oct 11 10:30:00 +0000 2023")
+        self.assertEqual(self.record['created_at'], self.record['date'])
+        self.assertEqual(self.record['place']['name'], 'London')
+        self.assertIsNone(self.record['coordinates'])
+        self.assertIn('source', self.record)
+        self.assertIsNone(self.record.get('missing'))
+        with self.assertRaises(KeyError):
+            self.record['missing']
+
+    def test_no_instance_dict(self):
+        """Test that fields are held in slots"""
+        self.assertFalse(hasattr(self.record, '__dict__'))
+        with self.assertRaises(KeyError):
+            self.record['text'] = "changed"
+
+    def test_views_and_tokens_filled_on_first_use(self):
+        """Test the lazily built normalised views and tokens"""
+        self.assertIsNone(self.record.views)
+
+        self.assertEqual(tweet_view(self.record, 'folded'), "don't panic")
+        self.assertEqual(tweet_tokens(self.record).words(), ["don't", "panic"])
+        self.assertIsNotNone(self.record.views)
+        self.assertIs(tweet_tokens(self.record), self.record.tokens)
+
+    def test_sources_interned(self):
+        """Test that equal sources share one string"""
+        other = TweetRecord("text", "", source=''.join(['Twitter for ', 'iPhone']))
+
+        self.assertIs(other.source, self.record.source)
+
+    def test_timestamps(self):
+        """Test reading API, ISO and missing timestamps"""
+        self.assertIsNone(self.record._timestamp)
+        self.assertEqual(self.record.timestamp, 1697020200.0)
+        self.assertEqual(self.record._timestamp, 1697020200.0)
+        self.assertEqual(self.record['timestamp'], 1697020200.0)
+        self.assertEqual(parse_timestamp("2023-10-11T10:30:00Z"), 1697020200.0)
+        self.assertTrue(math.isnan(parse_timestamp("")))
+        self.assertTrue(math.isnan(parse_timestamp("yesterday")))
+
+    def test_pickle(self):
+        """Test sending a record to a worker process"""
+        tweet_tokens(self.record)
+
+        copy = pickle.loads(pickle.dumps(self.record))
+
+        self.assertEqual(copy.to_dict(), self.record.to_dict())
+        self.assertEqual(copy.tokens.words(), ["don't", "panic"])
+
+
+if __name__ == '__main__':
+    unittest.main()
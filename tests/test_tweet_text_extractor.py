@@ -2,6 +2,7 @@
 Unit tests for TweetTextExtractor class
 """
 import unittest
+from twitter_shill_hunter.text_normalizer import tweet_view
 from twitter_shill_hunter.tweet_text_extractor import TweetTextExtractor
 from mock_data import UK_ENGLISH_TWEETS, US_ENGLISH_TWEETS, MIXED_TWEETS
 
@@ -98,6 +99,62 @@ class TestTweetTextExtractor(unittest.TestCase):
         for field in required_fields:
             self.assertIn(field, tweet)
 
+    def test_normalised_views(self):
+        """Test that each tweet gets its normalised views on first use"""
+        extractor = TweetTextExtractor([{
+            "created_at": "Wed Oct 11 10:30:00 +0000 2023",
+            "text": "Café’s @owner says https://t.co/x",
+        }])
+
+        tweet = extractor.extract_text()[0]
+        self.assertIsNone(tweet['views'])
+        self.assertIsNone(tweet['tokens'])
+        tweet_view(tweet, 'folded')
+        views = tweet['views']
+
+        self.assertEqual(views['normalized'], "Café's @owner says https://t.co/x")
+        self.assertEqual(views['folded'], "café's @owner says https://t.co/x")
+        self.assertEqual(views['masked'], "Café's " + " " * 6 + " says " + " " * 14)
+        self.assertEqual(views['ascii'], "Cafe's @owner says https://t.co/x")
+
+    def test_records_generator(self):
+        """Test extracting records one at a time"""
+        extractor = TweetTextExtractor(self.uk_tweets + self.us_tweets)
+
+        records = extractor.records()
+        first = next(records)
+        second = next(records)
+
+        self.assertEqual(first['text'], self.uk_tweets[0]['text'])
+        self.assertEqual([first['timestamp'], second['timestamp']],
+                         [1697020200.0, 1697120100.0])
+        self.assertEqual(len(list(records)), 2)
+        self.assertEqual(extractor.processed_tweets, [])
+
+    def test_extractors_do_not_share_tweets(self):
+        """Test that tweets from one target never reach another"""
+        first = TweetTextExtractor(self.uk_tweets)
+        first.extract_text()
+        first.extract_text()
+
+        second = TweetTextExtractor(self.us_tweets)
+        result = second.extract_text()
+
+        self.assertEqual(len(first.processed_tweets), 2)
+        self.assertEqual([t['text'] for t in result], [t['text'] for t in self.us_tweets])
+        self.assertEqual(TweetTextExtractor.processed_tweets, [])
+
+    def test_post_ids(self):
+        """Test that post ids are kept as strings, preferring id_str"""
+        tweets = [dict(self.uk_tweets[0]), dict(self.uk_tweets[1], id_str='42'),
+                  {'text': 'no id', 'created_at': ''}]
+
+        result = TweetTextExtractor(tweets).extract_text()
+
+        self.assertEqual(result[0]['id'], '1712345678901234567')
+        self.assertEqual(result[1]['id'], '42')
+        self.assertIsNone(result[2]['id'])
+
     def test_processed_tweets_attribute(self):
         """Test that processed_tweets attribute is properly set"""
         extractor = TweetTextExtractor(self.uk_tweets)
@@ -1,10 +1,20 @@
 """
 Unit tests for TwitterShillHunter main class with mocked Twitter/X API
 """
+import copy
+import json
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock, Mock
 from twitter_shill_hunter.twitter_shill_hunter import TwitterShillHunter
-from mock_data import SAMPLE_CONFIG, UK_ENGLISH_TWEETS, US_ENGLISH_TWEETS, MIXED_TWEETS
+from twitter_shill_hunter.profiler import ProfiledProcessor
+from twitter_shill_hunter.processor_scheduler import RemoteProcessor
+from twitter_shill_hunter.tokenizer import vocabulary
+from twitter_shill_hunter.processors.geo_analysis.geo_analysis import GeoAnalysis
+from twitter_shill_hunter.processors.grammar_analysis.grammar_analysis import GrammarAnalysis
+from mock_data import (SAMPLE_CONFIG, SAMPLE_PROCESSED_TWEETS, UK_ENGLISH_TWEETS,
+                       US_ENGLISH_TWEETS, MIXED_TWEETS)
 
 
 class MockTweepyStatus:
@@ -13,6 +23,36 @@ class MockTweepyStatus:
         self._json = tweet_data
 
 
+class ThreadedProcessor:
+    """Processor declaring it can run in a thread"""
+
+    execution = 'thread'
+
+    def process_data(self, tweets_and_date, dialect):
+        return ('threaded', len(tweets_and_date), dialect)
+
+
+class CpuBoundProcessor:
+    """Processor declaring it should run in a worker process"""
+
+    execution = 'process'
+
+    def process_data(self, tweets_and_date, search_terms):
+        return ('cpu', len(tweets_and_date), search_terms)
+
+
+class WarmingProcessor:
+    """Processor with a slow resource to start ahead of time"""
+
+    warmed = []
+
+    def warm_up(self, dialect):
+        WarmingProcessor.warmed.append(dialect)
+
+    def process_data(self, tweets_and_date):
+        return WarmingProcessor.warmed[:]
+
+
 class TestTwitterShillHunter(unittest.TestCase):
     """Test cases for TwitterShillHunter main class with mocked Twitter API"""
 
@@ -25,7 +65,7 @@ class TestTwitterShillHunter(unittest.TestCase):
 
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
-    @patch('twitter_shill_hunter.twitter_shill_hunter.pkg_resources.load_entry_point')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
     def test_initialization_with_mocked_api(self, mock_load_entry_point, mock_oauth, mock_api):
         """Test TwitterShillHunter initialization with mocked Twitter API"""
         # Mock OAuth handler
@@ -65,7 +105,7 @@ class TestTwitterShillHunter(unittest.TestCase):
 
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
-    @patch('twitter_shill_hunter.twitter_shill_hunter.pkg_resources.load_entry_point')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
     def test_load_plugins(self, mock_load_entry_point, mock_oauth, mock_api):
         """Test plugin loading functionality"""
         # Mock authentication components
@@ -78,7 +118,7 @@ class TestTwitterShillHunter(unittest.TestCase):
         mock_sentiment_processor = MagicMock()
         mock_grammar_processor = MagicMock()
         
-        def mock_load_entry_point_side_effect(package, category, plugin):
+        def mock_load_entry_point_side_effect(plugin):
             if plugin == 'sentiment_analysis':
                 return mock_sentiment_processor
             elif plugin == 'grammar_analysis':
@@ -97,7 +137,7 @@ class TestTwitterShillHunter(unittest.TestCase):
 
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
-    @patch('twitter_shill_hunter.twitter_shill_hunter.pkg_resources.load_entry_point')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
     def test_initiate_api_with_uk_tweets(self, mock_load_entry_point, mock_oauth, mock_api):
         """Test API initialization and tweet fetching with UK English tweets"""
         # Mock authentication
@@ -117,18 +157,25 @@ class TestTwitterShillHunter(unittest.TestCase):
         
         hunter = TwitterShillHunter(self.sample_config, self.sample_plugins)
         
-        # Verify user_timeline was called with correct parameters
-        mock_api_instance.user_timeline.assert_called_once_with(
+        # Verify the first page was requested with correct parameters
+        first_call = mock_api_instance.user_timeline.call_args_list[0]
+        self.assertEqual(first_call, unittest.mock.call(
             screen_name='test_user',
             exclude_replies=True,
             include_rts=False,
             count=200,
             tweet_mode='extended'
-        )
+        ))
+
+        # The next page is requested below the oldest id seen so far
+        second_call = mock_api_instance.user_timeline.call_args_list[1]
+        self.assertEqual(second_call.kwargs['max_id'],
+                         min(t['id'] for t in UK_ENGLISH_TWEETS) - 1)
+        self.assertEqual(mock_api_instance.user_timeline.call_count, 2)
 
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
-    @patch('twitter_shill_hunter.twitter_shill_hunter.pkg_resources.load_entry_point')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
     def test_initiate_api_with_us_tweets(self, mock_load_entry_point, mock_oauth, mock_api):
         """Test API initialization and tweet fetching with US English tweets"""
         # Mock authentication
@@ -151,7 +198,7 @@ class TestTwitterShillHunter(unittest.TestCase):
 
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
-    @patch('twitter_shill_hunter.twitter_shill_hunter.pkg_resources.load_entry_point')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
     def test_initiate_api_with_mixed_tweets(self, mock_load_entry_point, mock_oauth, mock_api):
         """Test API initialization with mixed UK/US English tweets"""
         # Mock authentication
@@ -175,7 +222,7 @@ class TestTwitterShillHunter(unittest.TestCase):
 
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
-    @patch('twitter_shill_hunter.twitter_shill_hunter.pkg_resources.load_entry_point')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
     def test_api_exception_handling(self, mock_load_entry_point, mock_oauth, mock_api):
         """Test handling of API exceptions"""
         # Mock authentication
@@ -200,7 +247,7 @@ class TestTwitterShillHunter(unittest.TestCase):
 
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
-    @patch('twitter_shill_hunter.twitter_shill_hunter.pkg_resources.load_entry_point')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
     def test_load_processors_with_dynamic_args(self, mock_load_entry_point, mock_oauth, mock_api):
         """Test load_processors method with dynamic argument passing"""
         # Mock authentication
@@ -209,29 +256,25 @@ class TestTwitterShillHunter(unittest.TestCase):
         mock_api.return_value = mock_api_instance
         mock_api_instance.user_timeline.return_value = []
         
-        # Mock processor with specific process_data signature
+        # Mock processor declaring the context fields it needs
         mock_processor_class = MagicMock()
+        mock_processor_class.context_fields = ('search_terms', 'dialect')
         mock_processor_instance = MagicMock()
         mock_processor_class.return_value = mock_processor_instance
-        
-        # Mock inspect.getfullargspec to return specific arguments
-        with patch('twitter_shill_hunter.twitter_shill_hunter.inspect.getfullargspec') as mock_getfullargspec:
-            # Mock the function signature inspection
-            mock_argspec = MagicMock()
-            mock_argspec.args = ['self', 'tweets_and_date', 'search_terms', 'dialect']
-            mock_getfullargspec.return_value = mock_argspec
-            
-            mock_load_entry_point.return_value = mock_processor_class
-            
-            hunter = TwitterShillHunter(self.sample_config, self.sample_plugins)
-            
-            # Verify process_data was called on processor instances
-            # (The actual call happens during initialization via load_processors)
-            mock_processor_class.assert_called()
+        mock_load_entry_point.return_value = mock_processor_class
+
+        hunter = TwitterShillHunter(self.sample_config, self.sample_plugins)
+
+        # Each plugin is created once, however many targets and pages
+        self.assertEqual(mock_processor_class.call_count, 2)
+        config = self.sample_config['config']
+        mock_processor_instance.process_data.assert_called_with(
+            [], config['search_terms'], config['dialect'])
+        self.assertEqual(hunter.context.target, hunter.target)
 
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
     @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
-    @patch('twitter_shill_hunter.twitter_shill_hunter.pkg_resources.load_entry_point')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
     def test_empty_tweet_response(self, mock_load_entry_point, mock_oauth, mock_api):
         """Test handling of empty tweet response from API"""
         # Mock authentication
@@ -251,6 +294,386 @@ class TestTwitterShillHunter(unittest.TestCase):
         # Should handle empty response gracefully
         self.assertIsNotNone(hunter.api)
 
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
+    def test_processors_receive_each_page(self, mock_load_entry_point, mock_oauth, mock_api):
+        """Test that each timeline page is passed to the same processor instance"""
+        mock_oauth.return_value = MagicMock()
+        mock_api_instance = MagicMock()
+        mock_api.return_value = mock_api_instance
+        mock_api_instance.user_timeline.side_effect = [
+            [MockTweepyStatus(tweet) for tweet in US_ENGLISH_TWEETS],
+            [MockTweepyStatus(tweet) for tweet in UK_ENGLISH_TWEETS],
+            []
+        ]
+
+        mock_processor_class = MagicMock()
+        mock_processor_instance = MagicMock()
+        mock_processor_class.return_value = mock_processor_instance
+        mock_load_entry_point.return_value = mock_processor_class
+
+        plugins = {'twitter_shill_hunter.processors': ['geo_analysis']}
+        TwitterShillHunter(self.sample_config, plugins)
+
+        mock_processor_class.assert_called_once()
+        calls = mock_processor_instance.process_data.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(calls[0].args[0]), 2)
+        self.assertIn("color", calls[0].args[0][0]['text'])
+        self.assertIn("colour", calls[1].args[0][0]['text'])
+
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
+    def test_batch_reuses_warm_processors(self, mock_load_entry_point, mock_oauth, mock_api):
+        """Test that a batch loads and creates each plugin once for all targets"""
+        mock_oauth.return_value = MagicMock()
+        mock_api_instance = MagicMock()
+        mock_api.return_value = mock_api_instance
+
+        timelines = {
+            'uk_user': [MockTweepyStatus(t) for t in UK_ENGLISH_TWEETS],
+            'us_user': [MockTweepyStatus(t) for t in US_ENGLISH_TWEETS],
+            'quiet_user': []
+        }
+
+        def user_timeline(**kwargs):
+            if 'max_id' in kwargs:
+                return []
+            return timelines[kwargs['screen_name']]
+
+        mock_api_instance.user_timeline.side_effect = user_timeline
+
+        mock_processor_class = MagicMock()
+        mock_processor_instance = MagicMock()
+        mock_processor_class.return_value = mock_processor_instance
+        mock_load_entry_point.return_value = mock_processor_class
+
+        config = copy.deepcopy(self.sample_config)
+        del config['config']['target']
+        config['config']['targets'] = ['uk_user', 'us_user', 'quiet_user']
+        config['config']['max_concurrent_targets'] = 2
+        plugins = {'twitter_shill_hunter.processors': ['geo_analysis']}
+
+        hunter = TwitterShillHunter(config, plugins)
+
+        mock_load_entry_point.assert_called_once()
+        mock_oauth.assert_called_once()
+        mock_processor_class.assert_called_once()
+        self.assertEqual(mock_processor_instance.reset.call_count, 3)
+        mock_processor_instance.close.assert_called_once()
+
+        # Two pages of posts plus one empty report
+        self.assertEqual(mock_processor_instance.process_data.call_count, 3)
+
+        summaries = hunter.target_summaries
+        self.assertEqual([s['target'] for s in summaries],
+                         ['uk_user', 'us_user', 'quiet_user'])
+        self.assertEqual([s['posts'] for s in summaries], [2, 2, 0])
+        self.assertTrue(all(s['error'] is None for s in summaries))
+
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
+    def test_batch_records_target_errors(self, mock_load_entry_point, mock_oauth, mock_api):
+        """Test that one failing target does not stop the batch"""
+        mock_oauth.return_value = MagicMock()
+        mock_api_instance = MagicMock()
+        mock_api.return_value = mock_api_instance
+
+        def user_timeline(**kwargs):
+            if kwargs['screen_name'] == 'missing_user':
+                raise Exception("User not found")
+            return []
+
+        mock_api_instance.user_timeline.side_effect = user_timeline
+        mock_load_entry_point.return_value = MagicMock()
+
+        config = copy.deepcopy(self.sample_config)
+        config['config']['targets'] = ['missing_user']
+        plugins = {'twitter_shill_hunter.processors': ['geo_analysis']}
+
+        hunter = TwitterShillHunter(config, plugins)
+
+        summaries = hunter.target_summaries
+        self.assertEqual(len(summaries), 2)
+        self.assertIsNone(summaries[0]['error'])
+        self.assertEqual(summaries[1]['error'], "User not found")
+
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
+    def test_archive_mode_skips_api(self, mock_load_entry_point, mock_oauth, mock_api):
+        """Test that archives are processed without credentials or API calls"""
+        mock_processor_class = MagicMock()
+        mock_processor_instance = MagicMock()
+        mock_processor_class.return_value = mock_processor_instance
+        mock_load_entry_point.return_value = mock_processor_class
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as temp_file:
+            for tweet in MIXED_TWEETS:
+                temp_file.write(json.dumps(tweet) + "\n")
+            temp_file_path = temp_file.name
+
+        try:
+            config = {'config': {
+                'archive': temp_file_path,
+                'search_terms': ['colour'],
+                'dialect': 'en-GB',
+                'page_size': 3
+            }}
+            plugins = {'twitter_shill_hunter.processors': ['geo_analysis']}
+
+            hunter = TwitterShillHunter(config, plugins)
+        finally:
+            os.unlink(temp_file_path)
+
+        mock_oauth.assert_not_called()
+        mock_api.assert_not_called()
+        calls = mock_processor_instance.process_data.call_args_list
+        self.assertEqual([len(c.args[0]) for c in calls], [3, 1])
+        self.assertEqual(hunter.target_summaries[0]['target'], temp_file_path)
+        self.assertEqual(hunter.target_summaries[0]['posts'], 4)
+
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
+    def test_results_reach_output(self, mock_load_entry_point):
+        """Test that records and summaries are written to the output file"""
+        mock_load_entry_point.side_effect = lambda p: {
+            'geo_analysis': GeoAnalysis, 'grammar_analysis': GrammarAnalysis}[p]
+
+        with tempfile.TemporaryDirectory() as directory:
+            archive = os.path.join(directory, 'archive.jsonl')
+            # Only tweets with coordinates give geo records
+            point = {'type': 'Point', 'coordinates': [-0.1276, 51.5072]}
+            tweets = [dict(tweet, coordinates=point) if i % 2 == 0 else tweet
+                      for i, tweet in enumerate(MIXED_TWEETS)]
+            with open(archive, 'w') as archive_file:
+                for tweet in tweets:
+                    archive_file.write(json.dumps(tweet) + "\n")
+            output = os.path.join(directory, 'results.jsonl')
+            config = {'config': {
+                'archive': archive,
+                'search_terms': ['colour'],
+                'dialect': 'en-GB',
+                'page_size': 3,
+                'processor_execution': 'serial',
+                'output': {'format': 'jsonl', 'path': output}
+            }}
+            plugins = {'twitter_shill_hunter.processors': ['geo_analysis', 'grammar_analysis']}
+
+            TwitterShillHunter(config, plugins)
+
+            with open(output) as output_file:
+                lines = [json.loads(line) for line in output_file]
+
+        geo = [l for l in lines if l['plugin'] == 'geo_analysis']
+        self.assertEqual(len(geo), len(MIXED_TWEETS[::2]))
+        self.assertEqual(geo[0]['target'], archive)
+        self.assertEqual(geo[0]['source'], MIXED_TWEETS[0]['source'])
+        self.assertEqual(geo[0]['coordinates'], point)
+        summaries = [l for l in lines if l['type'] == 'summary']
+        self.assertEqual([l['plugin'] for l in summaries], ['grammar_analysis'])
+        self.assertIn('en-US', summaries[0]['summary']['dialect_hits'])
+
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
+    def test_run_metrics_are_exported(self, mock_load_entry_point):
+        """Test that each stage and plugin is timed and the metrics written out"""
+        mock_load_entry_point.side_effect = lambda p: {
+            'geo_analysis': GeoAnalysis, 'grammar_analysis': GrammarAnalysis}[p]
+
+        with tempfile.TemporaryDirectory() as directory:
+            archive = os.path.join(directory, 'archive.jsonl')
+            with open(archive, 'w') as archive_file:
+                for tweet in MIXED_TWEETS:
+                    archive_file.write(json.dumps(tweet) + "\n")
+            metrics_path = os.path.join(directory, 'metrics.json')
+            prometheus_path = os.path.join(directory, 'run.prom')
+            config = {'config': {
+                'archive': archive,
+                'search_terms': ['colour'],
+                'dialect': 'en-GB',
+                'page_size': 3,
+                'output': {'format': 'quiet'},
+                'metrics': {'json': metrics_path, 'prometheus': prometheus_path}
+            }}
+            plugins = {'twitter_shill_hunter.processors': ['geo_analysis', 'grammar_analysis']}
+
+            TwitterShillHunter(config, plugins)
+
+            with open(metrics_path) as metrics_file:
+                metrics = json.load(metrics_file)
+            with open(prometheus_path) as prometheus_file:
+                prometheus = prometheus_file.read()
+
+        stages = dict(((s['stage'], s['plugin']), s) for s in metrics['stages'])
+        counters = dict(((c['name'], c['plugin']), c['value']) for c in metrics['counters'])
+        for stage in ('load_plugins', 'warm_up', 'run', 'wait', 'extract', 'processors'):
+            self.assertIn((stage, None), stages)
+        self.assertEqual(stages[('extract', None)]['calls'], 2)
+        self.assertEqual(stages[('process', 'geo_analysis')]['calls'], 2)
+        self.assertEqual(stages[('process', 'grammar_analysis')]['calls'], 2)
+        self.assertEqual(counters[('posts', None)], len(MIXED_TWEETS))
+        self.assertEqual(counters[('pages', None)], 2)
+        self.assertEqual(counters[('tweets', 'geo_analysis')], len(MIXED_TWEETS))
+        self.assertIn('twitter_shill_hunter_posts_total 4.0', prometheus)
+
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
+    def test_vocabulary_bounded_per_run(self, mock_load_entry_point):
+        """Test that the vocabulary starts empty and is cleared between pages past its size"""
+        mock_load_entry_point.side_effect = lambda p: {'grammar_analysis': GrammarAnalysis}[p]
+        vocabulary.intern('left over from an earlier run')
+
+        with tempfile.TemporaryDirectory() as directory:
+            archive = os.path.join(directory, 'archive.jsonl')
+            with open(archive, 'w') as archive_file:
+                for tweet in MIXED_TWEETS:
+                    archive_file.write(json.dumps(tweet) + "\n")
+            config = {'config': {
+                'archive': archive,
+                'search_terms': ['colour'],
+                'dialect': 'en-GB',
+                'page_size': 1,
+                'vocabulary_size': 5,
+                'output': {'format': 'quiet'}
+            }}
+
+            shill_hunter = TwitterShillHunter(config, {'twitter_shill_hunter.processors':
+                                                       ['grammar_analysis']})
+
+        self.assertIsNone(vocabulary.get('left over from an earlier run'))
+        self.assertLessEqual(len(vocabulary), 5)
+        self.assertGreater(shill_hunter.metrics.get('vocabulary_resets'), 0)
+        vocabulary.max_size = None
+
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
+    def test_every_plugin_is_profiled(self, mock_load_entry_point):
+        """Test that each plugin, including one in a worker process, gets its own profile"""
+        mock_load_entry_point.side_effect = lambda p: {
+            'geo_analysis': GeoAnalysis, 'grammar_analysis': GrammarAnalysis}[p]
+
+        with tempfile.TemporaryDirectory() as directory:
+            archive = os.path.join(directory, 'archive.jsonl')
+            with open(archive, 'w') as archive_file:
+                for tweet in MIXED_TWEETS:
+                    archive_file.write(json.dumps(tweet) + "\n")
+            profiles = os.path.join(directory, 'profiles')
+            config = {'config': {
+                'archive': archive,
+                'search_terms': ['colour'],
+                'dialect': 'en-GB',
+                'output': {'format': 'quiet'},
+                'processor_execution': 'process',
+                'profile': {'path': profiles}
+            }}
+            plugins = {'twitter_shill_hunter.processors': ['geo_analysis', 'grammar_analysis']}
+
+            shill_hunter = TwitterShillHunter(config, plugins)
+
+            self.assertIsInstance(shill_hunter.processor_instances['geo_analysis'],
+                                  ProfiledProcessor)
+            self.assertEqual(sorted(os.listdir(profiles)), [
+                'geo_analysis.collapsed', 'geo_analysis.pstats',
+                'grammar_analysis.collapsed', 'grammar_analysis.pstats'])
+            with open(os.path.join(profiles, 'grammar_analysis.collapsed')) as collapsed:
+                self.assertIn('dialect_matcher.py:count', collapsed.read())
+
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
+    def test_processors_run_by_declared_execution(self, mock_load_entry_point, mock_oauth, mock_api):
+        """Test that process execution gives CPU bound processors a worker process"""
+        mock_api.return_value.user_timeline.return_value = []
+        mock_load_entry_point.side_effect = [CpuBoundProcessor, ThreadedProcessor]
+        config = copy.deepcopy(self.sample_config)
+        config['config']['processor_execution'] = 'process'
+
+        plugins = {'twitter_shill_hunter.processors': ['cpu', 'threaded']}
+        hunter = TwitterShillHunter(config, plugins)
+        try:
+            self.assertIsInstance(hunter.get_processor('cpu'), RemoteProcessor)
+            self.assertIsInstance(hunter.get_processor('threaded'), ThreadedProcessor)
+
+            results = hunter.load_processors(SAMPLE_PROCESSED_TWEETS)
+        finally:
+            hunter.close_processors()
+
+        self.assertEqual(list(results), ['cpu', 'threaded'])
+        self.assertEqual(results['cpu'], ('cpu', 2, ['test', 'example', 'sample']))
+        self.assertEqual(results['threaded'], ('threaded', 2, 'en-US'))
+
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
+    def test_parallel_processor_execution(self, mock_load_entry_point, mock_oauth, mock_api):
+        """Test that parallel execution runs every processor on threads in process"""
+        mock_api.return_value.user_timeline.return_value = []
+        mock_load_entry_point.side_effect = [CpuBoundProcessor, ThreadedProcessor]
+        config = copy.deepcopy(self.sample_config)
+        config['config']['processor_execution'] = 'parallel'
+
+        plugins = {'twitter_shill_hunter.processors': ['cpu', 'threaded']}
+        hunter = TwitterShillHunter(config, plugins)
+        try:
+            self.assertIsInstance(hunter.get_processor('cpu'), CpuBoundProcessor)
+            results = hunter.load_processors(SAMPLE_PROCESSED_TWEETS)
+        finally:
+            hunter.close_processors()
+
+        self.assertEqual(results['cpu'], ('cpu', 2, ['test', 'example', 'sample']))
+        self.assertEqual(results['threaded'], ('threaded', 2, 'en-US'))
+
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
+    def test_serial_processor_execution(self, mock_load_entry_point, mock_oauth, mock_api):
+        """Test that execution is serial by default, keeping every processor in process"""
+        mock_api.return_value.user_timeline.return_value = []
+        mock_load_entry_point.side_effect = [CpuBoundProcessor, ThreadedProcessor]
+
+        plugins = {'twitter_shill_hunter.processors': ['cpu', 'threaded']}
+        hunter = TwitterShillHunter(self.sample_config, plugins)
+
+        self.assertIsInstance(hunter.get_processor('cpu'), CpuBoundProcessor)
+        self.assertEqual(hunter.load_processors([])['cpu'], ('cpu', 0, ['test', 'example', 'sample']))
+        self.assertIsNone(hunter.scheduler.threads)
+
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.API')
+    @patch('twitter_shill_hunter.twitter_shill_hunter.tweepy.OAuth1UserHandler')
+    @patch('twitter_shill_hunter.plugin_registry.PluginRegistry.load')
+    def test_processors_warmed_up_before_first_page(self, mock_load_entry_point, mock_oauth, mock_api):
+        """Test that warm_up is called once with the settings it names"""
+        mock_api.return_value.user_timeline.return_value = []
+        mock_load_entry_point.return_value = WarmingProcessor
+        WarmingProcessor.warmed = []
+
+        plugins = {'twitter_shill_hunter.processors': ['warming']}
+        hunter = TwitterShillHunter(self.sample_config, plugins)
+
+        self.assertEqual(WarmingProcessor.warmed, ['en-US'])
+        self.assertEqual(hunter.load_processors([]), {'warming': ['en-US']})
+
+    def test_invalid_processor_execution(self):
+        """Test that an unknown execution setting is rejected"""
+        config = copy.deepcopy(self.sample_config)
+        config['config']['processor_execution'] = 'gpu'
+
+        with self.assertRaises(ValueError):
+            TwitterShillHunter(config, {'twitter_shill_hunter.processors': []})
+
+    def test_get_targets_from_target_file(self):
+        """Test reading targets from a file alongside the config"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as temp_file:
+            temp_file.write("# accounts to screen\nfirst_user\n\nsecond_user\ntest_user\n")
+            temp_file_path = temp_file.name
+
+        try:
+            config = {'target': 'test_user', 'target_file': temp_file_path}
+            targets = TwitterShillHunter.get_targets(TwitterShillHunter, config)
+            self.assertEqual(targets, ['test_user', 'first_user', 'second_user'])
+        finally:
+            os.unlink(temp_file_path)
+
     def test_class_attributes(self):
         """Test that class attributes are properly defined"""
         # Test class attributes exist (before instantiation)